@@ -2,10 +2,12 @@ import logging
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.permissions import IsAuthenticated
 from users.models import Users
 from users.serializers import UserSerializer
+from users.authentication import UserRefreshToken, update_user_claims
+from users.hashing import PasswordHashingBusy, check_password, set_password
+from users.utils import hashing_busy_response
 from common.utils.permissions import IsSuperUser
 
 # Getting the logger
@@ -21,7 +23,7 @@ def create_user(request):
         serializer = UserSerializer(data=request.data)
         if serializer.is_valid():
             serializer.save()
-            refresh = RefreshToken.for_user(serializer.instance)
+            refresh = UserRefreshToken.for_user(serializer.instance)
             logger.info("User created successfully")
 
             return Response(
@@ -35,6 +37,8 @@ def create_user(request):
         else:
             logger.error(serializer.errors)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    except PasswordHashingBusy:
+        return hashing_busy_response()
     except Exception as e:
         logger.error(str(e))
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -50,7 +54,7 @@ def create_admin(request):
         serializer = UserSerializer(data=request.data)
         if serializer.is_valid():
             serializer.save(is_staff=True)
-            refresh = RefreshToken.for_user(serializer.instance)
+            refresh = UserRefreshToken.for_user(serializer.instance)
             logger.info("Admin user created successfully")
 
             return Response(
@@ -64,6 +68,8 @@ def create_admin(request):
         else:
             logger.error(serializer.errors)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    except PasswordHashingBusy:
+        return hashing_busy_response()
     except Exception as e:
         logger.error(str(e))
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -102,8 +108,8 @@ def login_user(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if user.check_password(password):
-            refresh = RefreshToken.for_user(user)
+        if check_password(user, password):
+            refresh = UserRefreshToken.for_user(user)
             logger.info("User logged in successfully")
             return Response(
                 {
@@ -122,6 +128,8 @@ def login_user(request):
     except Users.DoesNotExist:
         logger.error("User not found")
         return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+    except PasswordHashingBusy:
+        return hashing_busy_response()
     except Exception as e:
         logger.error(str(e))
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -156,8 +164,8 @@ def change_password(request):
 
         user = Users.objects.get(email=email)
 
-        if user.check_password(old_password):
-            user.set_password(new_password)
+        if check_password(user, old_password):
+            set_password(user, new_password)
             user.save()
             logger.info("Password changed successfully")
             return Response(
@@ -173,6 +181,8 @@ def change_password(request):
     except Users.DoesNotExist:
         logger.error("User not found")
         return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+    except PasswordHashingBusy:
+        return hashing_busy_response()
     except Exception as e:
         logger.error(str(e))
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -209,8 +219,11 @@ def refresh_token(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        token = RefreshToken(refresh_token)
-        access_token = str(token.access_token)
+        token = UserRefreshToken(refresh_token)
+        access_token = token.access_token
+        # Issue the access token with the user's current flags
+        update_user_claims(access_token)
+        access_token = str(access_token)
 
         logger.info("Access token refreshed successfully")
         return Response({"access_token": access_token}, status=status.HTTP_200_OK)
@@ -245,8 +258,8 @@ def logout_user(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Create a RefreshToken object
-        token = RefreshToken(refresh_token)
+        # Create a UserRefreshToken object
+        token = UserRefreshToken(refresh_token)
 
         # Blacklist the refresh token
         token.blacklist()
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from cart.reservations import release_expired_reservations
+
+
+class Command(BaseCommand):
+    help = "Return the stock of expired cart reservations to the catalog."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.CART_RESERVATION_REAPER_BATCH_SIZE,
+            help="The number of cart items released per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        result = release_expired_reservations(batch_size=options["batch_size"])
+        self.stdout.write(
+            f"{result.items} cart items and {result.units} units released "
+            f"in {result.batches} batches"
+        )
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def merge_duplicate_cart_items(apps, schema_editor):
+    """
+    Merge cart lines that hold the same product into the most recently
+    updated line, summing their quantities.
+    """
+    CartItem = apps.get_model("cart", "CartItem")
+    duplicates = (
+        CartItem.objects.values("cart_id", "product_id")
+        .annotate(lines=Count("id"))
+        .filter(lines__gt=1)
+    )
+    for duplicate in duplicates.iterator():
+        items = list(
+            CartItem.objects.filter(
+                cart_id=duplicate["cart_id"], product_id=duplicate["product_id"]
+            ).order_by("-updated_at", "-id")
+        )
+        keep, others = items[0], items[1:]
+        keep.quantity = sum(item.quantity for item in items)
+        keep.save(update_fields=["quantity"])
+        CartItem.objects.filter(id__in=[item.id for item in others]).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cart", "0002_cartitem_price"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_cart_items, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="cartitem",
+            constraint=models.UniqueConstraint(
+                fields=("cart", "product"), name="cart_item_unique_product"
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.19 on 2026-10-18 03:22
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_cart_totals(apps, schema_editor):
+    """
+    Fill in the total and item count of existing carts in one UPDATE.
+    """
+    Cart = apps.get_model("cart", "Cart")
+    CartItem = apps.get_model("cart", "CartItem")
+    items = CartItem.objects.filter(cart=OuterRef("pk")).order_by().values("cart")
+    total = items.annotate(
+        total=Sum(F("price") * F("quantity"), output_field=models.DecimalField())
+    ).values("total")
+    count = items.annotate(count=Sum("quantity")).values("count")
+    Cart.objects.update(
+        total=Coalesce(Subquery(total), Value(Decimal("0.00"))),
+        item_count=Coalesce(Subquery(count), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cart", "0003_cartitem_cart_item_unique_product"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cart",
+            name="item_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="cart",
+            name="total",
+            field=models.DecimalField(
+                decimal_places=2, default=Decimal("0.00"), editable=False, max_digits=12
+            ),
+        ),
+        migrations.RunPython(backfill_cart_totals, migrations.RunPython.noop),
+    ]
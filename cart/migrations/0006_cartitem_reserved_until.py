@@ -0,0 +1,24 @@
+# Generated by Django 4.2.19 on 2026-10-18 04:37
+
+import cart.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cart", "0005_uuid7_primary_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cartitem",
+            name="reserved_until",
+            field=models.DateTimeField(default=cart.models.reservation_deadline),
+        ),
+        migrations.AddIndex(
+            model_name="cartitem",
+            index=models.Index(
+                fields=["reserved_until"], name="cart_item_reserved_until_idx"
+            ),
+        ),
+    ]
@@ -1,6 +1,13 @@
+from datetime import timedelta
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from decimal import Decimal
-from common.models import UUIDModel
+from common.models import LineItemsQuerySet, UUID7Model, UUIDModel, line_total
+
+
+class CartQuerySet(LineItemsQuerySet):
+    line_item_prefix = "cartitem__"
 
 
 class Cart(UUIDModel):
@@ -9,26 +16,37 @@ class Cart(UUIDModel):
     """
 
     user = models.ForeignKey("users.Users", on_delete=models.CASCADE)
+    # Denormalized from the cart items by `refresh_cart_totals`
+    total = models.DecimalField(
+        max_digits=12, decimal_places=2, default=Decimal("0.00"), editable=False
+    )
+    item_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CartQuerySet.as_manager()
+
     @property
     def get_total(self):
         """
         Calculate the total price of all items in the cart
         """
-        total = Decimal("0.00")
-
-        for item in self.cartitem_set.all():
-            total += item.price * item.quantity
-
+        total = self.cartitem_set.aggregate(total=line_total())["total"]
         return total.quantize(Decimal("0.00"))
 
     def __str__(self):
         return f"Cart: {self.user}"
 
 
-class CartItem(UUIDModel):
+def reservation_deadline():
+    """
+    When stock reserved by cart activity now is released, unless the cart
+    is active again first.
+    """
+    return timezone.now() + timedelta(seconds=settings.CART_RESERVATION_TTL)
+
+
+class CartItem(UUID7Model):
     """
     A model that represents a cart item in the system
     """
@@ -39,8 +57,24 @@ class CartItem(UUIDModel):
     price = models.DecimalField(
         max_digits=10, decimal_places=2, default=Decimal("0.00")
     )
+    # The stock taken by this line returns to the product after this time
+    reserved_until = models.DateTimeField(default=reservation_deadline)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Lets the reaper find expired reservations without a scan
+            models.Index(
+                fields=["reserved_until"], name="cart_item_reserved_until_idx"
+            ),
+        ]
+        constraints = [
+            # A cart holds a single line per product
+            models.UniqueConstraint(
+                fields=["cart", "product"], name="cart_item_unique_product"
+            ),
+        ]
+
     def __str__(self):
         return f"CartItem: {self.cart} - {self.product}"
@@ -0,0 +1,116 @@
+import logging
+from dataclasses import dataclass
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from common.utils.scheduling import run_periodically
+from products.models import Products, StockShard
+from .models import Cart, CartItem
+from .utils import refresh_cart_totals
+
+# Getting the logger
+logger = logging.getLogger("django")
+
+# Deletes a batch of expired cart lines and returns their units to stock in
+# one statement. Lines, their carts and products are locked together with
+# SKIP LOCKED, so carts being written and products being reserved by a
+# concurrent request are left for the next run instead of being waited on.
+RELEASE_BATCH = """
+WITH expired AS (
+    SELECT item.id
+    FROM {items} item
+    JOIN {carts} cart ON cart.id = item.cart_id
+    JOIN {products} product ON product.id = item.product_id
+    WHERE item.reserved_until <= %(now)s
+    ORDER BY item.reserved_until
+    LIMIT %(batch_size)s
+    FOR UPDATE OF item, cart, product SKIP LOCKED
+), released AS (
+    DELETE FROM {items} item
+    USING expired
+    WHERE item.id = expired.id
+    RETURNING item.cart_id, item.product_id, item.quantity
+), units AS (
+    SELECT product_id, SUM(quantity) AS quantity
+    FROM released
+    GROUP BY product_id
+), restocked AS (
+    UPDATE {products} product
+    SET stock = product.stock + units.quantity, updated_at = %(now)s
+    FROM units
+    WHERE product.id = units.product_id AND product.shard_count = 0
+), restocked_shards AS (
+    -- Sharded products get their units back on their first shard
+    UPDATE {shards} shard
+    SET stock = shard.stock + units.quantity, updated_at = %(now)s
+    FROM units
+    JOIN {products} product ON product.id = units.product_id
+    WHERE shard.product_id = units.product_id
+        AND shard.shard = 0
+        AND product.shard_count > 0
+)
+SELECT cart_id, COUNT(*), SUM(quantity)
+FROM released
+GROUP BY cart_id
+"""
+
+
+@dataclass
+class ReleaseResult:
+    """
+    The outcome of a run of the reservation reaper.
+    """
+
+    items: int = 0
+    units: int = 0
+    batches: int = 0
+
+
+def release_expired_reservations(batch_size=None):
+    """
+    Delete the cart lines whose reservation has expired and return their
+    units to the products' stock, in batches of at most `batch_size` lines.
+    Each batch is its own short transaction.
+    """
+    batch_size = batch_size or settings.CART_RESERVATION_REAPER_BATCH_SIZE
+    sql = RELEASE_BATCH.format(
+        items=connection.ops.quote_name(CartItem._meta.db_table),
+        carts=connection.ops.quote_name(Cart._meta.db_table),
+        products=connection.ops.quote_name(Products._meta.db_table),
+        shards=connection.ops.quote_name(StockShard._meta.db_table),
+    )
+    result = ReleaseResult()
+    while True:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(sql, {"now": timezone.now(), "batch_size": batch_size})
+                rows = cursor.fetchall()
+            if rows:
+                refresh_cart_totals(*[cart_id for cart_id, _, _ in rows])
+
+        items = sum(count for _, count, _ in rows)
+        result.items += items
+        result.units += sum(units for _, _, units in rows)
+        result.batches += 1
+        # A short batch means the expired lines are used up, or locked
+        if items < batch_size:
+            break
+
+    logger.info(
+        f"Released {result.items} expired cart items and {result.units} units "
+        f"of stock in {result.batches} batches"
+    )
+    return result
+
+
+def schedule_reservation_reaper():
+    """
+    Release expired reservations every CART_RESERVATION_REAPER_INTERVAL
+    seconds in the background of this process, unless the interval is 0.
+    """
+    if settings.CART_RESERVATION_REAPER_INTERVAL:
+        return run_periodically(
+            "release-expired-reservations",
+            settings.CART_RESERVATION_REAPER_INTERVAL,
+            release_expired_reservations,
+        )
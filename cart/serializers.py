@@ -1,12 +1,16 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
+from common.utils.prefetch import PrefetchSerializerMixin
 from .models import Cart, CartItem
 
 
-class CartItemSerializer(serializers.ModelSerializer):
+class CartItemSerializer(PrefetchSerializerMixin, serializers.ModelSerializer):
     """
     A serializer class for the CartItem model.
     """
 
+    select_related_fields = ["product"]
+
     product_name = serializers.CharField(source="product.name")
     product_price = serializers.DecimalField(
         source="price", max_digits=10, decimal_places=2
@@ -18,14 +22,40 @@ class CartItemSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class CartSerializer(serializers.ModelSerializer):
+class CartSerializer(PrefetchSerializerMixin, serializers.ModelSerializer):
     """
     A serializer class for the Cart model, including the CartItemSerializer.
     """
 
+    prefetch_related_fields = [
+        Prefetch(
+            "cartitem_set",
+            queryset=CartItemSerializer.setup_eager_loading(CartItem.objects.all()),
+        )
+    ]
+
     cart_items = CartItemSerializer(source="cartitem_set", many=True)
 
     class Meta:
         model = Cart
-        fields = ["id", "user", "created_at", "updated_at", "cart_items"]
-        read_only_fields = ["id", "created_at", "updated_at"]
+        fields = [
+            "id",
+            "user",
+            "total",
+            "item_count",
+            "created_at",
+            "updated_at",
+            "cart_items",
+        ]
+        read_only_fields = ["id", "total", "item_count", "created_at", "updated_at"]
+
+
+class CartSummarySerializer(serializers.ModelSerializer):
+    """
+    A serializer class for the totals of a Cart, without its items.
+    """
+
+    class Meta:
+        model = Cart
+        fields = ["total", "item_count"]
+        read_only_fields = ["total", "item_count"]
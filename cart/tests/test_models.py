@@ -1,5 +1,7 @@
 import pytest
+from decimal import Decimal
 from cart.models import Cart, CartItem
+from cart.utils import refresh_cart_totals
 from users.models import Users
 from products.models import Products
 
@@ -41,3 +43,45 @@ class TestCartModel:
         assert cart_item.product == self.product
         assert cart_item.price == 100.00
         assert cart_item.quantity == 25
+
+    def test_cart_totals_are_computed_in_the_database(self, django_assert_num_queries):
+        cart = Cart.objects.create(user=self.user1)
+        CartItem.objects.create(
+            cart=cart, product=self.product, price="19.99", quantity=3
+        )
+        other_product = Products.objects.create(
+            name="Other Product", description="Other", price=5.00, stock=10
+        )
+        CartItem.objects.create(
+            cart=cart, product=other_product, price="5.00", quantity=2
+        )
+
+        with django_assert_num_queries(1):
+            assert cart.get_total == Decimal("69.97")
+
+        annotated = Cart.objects.with_totals().get(id=cart.id)
+        assert annotated.items_total == Decimal("69.97")
+        assert annotated.items_count == 5
+
+        empty = Cart.objects.with_totals().get(
+            id=Cart.objects.create(user=self.user2).id
+        )
+        assert empty.items_total == Decimal("0.00")
+        assert empty.items_count == 0
+
+    def test_refresh_cart_totals(self):
+        cart = Cart.objects.create(user=self.user1)
+        CartItem.objects.create(
+            cart=cart, product=self.product, price="100.00", quantity=2
+        )
+
+        refresh_cart_totals(cart.id)
+        cart.refresh_from_db()
+        assert cart.total == Decimal("200.00")
+        assert cart.item_count == 2
+
+        CartItem.objects.filter(cart=cart).delete()
+        refresh_cart_totals(cart.id)
+        cart.refresh_from_db()
+        assert cart.total == Decimal("0.00")
+        assert cart.item_count == 0
@@ -0,0 +1,137 @@
+import threading
+from datetime import timedelta
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from users.models import Users
+from products.inventory import shard_stock
+from products.models import Products
+from cart.models import Cart, CartItem
+from cart.reservations import release_expired_reservations
+
+
+def expire(*items):
+    CartItem.objects.filter(id__in=[item.id for item in items]).update(
+        reserved_until=timezone.now() - timedelta(seconds=1)
+    )
+
+
+@pytest.mark.django_db
+class TestReservationExpiry:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.user = Users.objects.create_user(
+            first_name="some", email="some-email", password="some-password123"
+        )
+        self.products = [
+            Products.objects.create(
+                name=f"Product {index}",
+                description="A product",
+                price=10.00,
+                stock=5,
+                is_published=True,
+            )
+            for index in range(2)
+        ]
+        self.cart = Cart.objects.create(user=self.user)
+        self.client.force_authenticate(user=self.user)
+
+    def add(self, product, quantity):
+        response = self.client.post(
+            reverse("cart-add", args=[product.id]), {"quantity": quantity}
+        )
+        assert response.status_code == status.HTTP_200_OK, response.data
+        return CartItem.objects.get(cart=self.cart, product=product)
+
+    def test_expired_items_return_their_stock(self):
+        expired = self.add(self.products[0], 3)
+        active = self.add(self.products[1], 2)
+        expire(expired)
+
+        result = release_expired_reservations()
+        assert (result.items, result.units) == (1, 3)
+        assert list(CartItem.objects.all()) == [active]
+        self.products[0].refresh_from_db()
+        self.products[1].refresh_from_db()
+        assert (self.products[0].stock, self.products[1].stock) == (5, 3)
+        self.cart.refresh_from_db()
+        assert self.cart.total == 20
+
+    def test_sharded_products_get_their_stock_back(self):
+        shard_stock(self.products[0].id, 2)
+        expire(self.add(self.products[0], 3))
+
+        assert release_expired_reservations().units == 3
+        self.products[0].refresh_from_db()
+        assert self.products[0].available_stock == 5
+
+    def test_releases_in_batches(self):
+        items = [self.add(product, 1) for product in self.products]
+        expire(*items)
+
+        result = release_expired_reservations(batch_size=1)
+        assert (result.items, result.units, result.batches) == (2, 2, 3)
+        assert not CartItem.objects.exists()
+
+    def test_cart_activity_extends_the_reservation(self):
+        item = self.add(self.products[0], 1)
+        expire(item)
+
+        self.add(self.products[1], 1)
+        assert release_expired_reservations().items == 0
+        item.refresh_from_db()
+        assert item.reserved_until > timezone.now()
+
+    def test_release_command(self, capsys):
+        expire(self.add(self.products[0], 2))
+        call_command("release_expired_reservations")
+        assert "1 cart items and 2 units released" in capsys.readouterr().out
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReservationLocking:
+    def test_locked_products_are_skipped(self):
+        user = Users.objects.create_user(
+            first_name="some", email="some-email", password="some-password123"
+        )
+        product = Products.objects.create(
+            name="Product", description="A product", price=10.00, stock=5
+        )
+        item = CartItem.objects.create(
+            cart=Cart.objects.create(user=user),
+            product=product,
+            price=10.00,
+            quantity=1,
+        )
+        expire(item)
+
+        locked = threading.Event()
+        done = threading.Event()
+
+        def hold_lock():
+            # A concurrent request holding the product row
+            try:
+                with transaction.atomic():
+                    Products.objects.select_for_update().get(id=product.id)
+                    locked.set()
+                    done.wait(5)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        try:
+            assert locked.wait(5)
+            assert release_expired_reservations().items == 0
+        finally:
+            done.set()
+            thread.join()
+
+        assert release_expired_reservations().items == 1
+        product.refresh_from_db()
+        assert product.stock == 6
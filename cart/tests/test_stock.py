@@ -0,0 +1,149 @@
+import threading
+import time
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from users.models import Users
+from products.inventory import shard_stock
+from products.models import Products
+from cart.models import Cart, CartItem
+
+THREADS = 16
+ATTEMPTS_PER_THREAD = 10
+INITIAL_STOCK = 50
+
+
+@pytest.mark.django_db(transaction=True)
+class TestStockReservation:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.product = Products.objects.create(
+            name="Hot Product",
+            description="A product everyone wants",
+            price=10.00,
+            stock=INITIAL_STOCK,
+            is_published=True,
+        )
+        self.users = Users.objects.bulk_create(
+            [
+                Users(first_name="buyer", email=f"buyer-{index}@example.com")
+                for index in range(THREADS)
+            ]
+        )
+
+    @pytest.mark.parametrize("shards", [0, 4])
+    def test_concurrent_adds_never_oversell(self, shards):
+        shard_stock(self.product.id, shards)
+        url = reverse("cart-add", args=[self.product.id])
+        results = []
+        barrier = threading.Barrier(THREADS)
+
+        def buy(user):
+            client = APIClient()
+            client.force_authenticate(user=user)
+            try:
+                barrier.wait()
+                for _ in range(ATTEMPTS_PER_THREAD):
+                    response = client.post(url, {"quantity": 1}, format="json")
+                    results.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=buy, args=[user]) for user in self.users]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        attempts = THREADS * ATTEMPTS_PER_THREAD
+        print(
+            f"\n{attempts} concurrent adds on one product with {shards} shards "
+            f"in {elapsed:.2f}s "
+            f"({attempts / elapsed:.0f} requests/s)"
+        )
+
+        self.product.refresh_from_db()
+        reserved = sum(CartItem.objects.values_list("quantity", flat=True))
+        assert len(results) == attempts
+        assert results.count(status.HTTP_200_OK) == INITIAL_STOCK
+        assert results.count(status.HTTP_400_BAD_REQUEST) == attempts - INITIAL_STOCK
+        assert self.product.available_stock == 0
+        assert reserved == INITIAL_STOCK
+
+    def test_concurrent_removes_restock_once(self):
+        client = APIClient()
+        client.force_authenticate(user=self.users[0])
+        response = client.post(
+            reverse("cart-add", args=[self.product.id]), {"quantity": 5}, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        url = reverse("cart-remove", args=[self.product.id])
+        results = []
+        barrier = threading.Barrier(4)
+
+        def remove():
+            client = APIClient()
+            client.force_authenticate(user=self.users[0])
+            try:
+                barrier.wait()
+                results.append(client.delete(url).status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=remove) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.product.refresh_from_db()
+        assert results.count(status.HTTP_200_OK) == 1
+        assert self.product.stock == INITIAL_STOCK
+
+    def test_concurrent_adds_keep_the_cart_totals(self):
+        products = Products.objects.bulk_create(
+            [
+                Products(
+                    name=f"Product {index}",
+                    description="A product in a busy cart",
+                    price=index + 1,
+                    stock=INITIAL_STOCK,
+                    is_published=True,
+                )
+                for index in range(THREADS)
+            ]
+        )
+        cart = Cart.objects.create(user=self.users[0])
+        barrier = threading.Barrier(THREADS)
+
+        def add(product):
+            client = APIClient()
+            client.force_authenticate(user=self.users[0])
+            try:
+                barrier.wait()
+                for _ in range(ATTEMPTS_PER_THREAD):
+                    client.post(
+                        reverse("cart-add", args=[product.id]),
+                        {"quantity": 1},
+                        format="json",
+                    )
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=add, args=[product]) for product in products]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        cart.refresh_from_db()
+        assert cart.item_count == THREADS * ATTEMPTS_PER_THREAD
+        assert cart.total == sum(
+            product.price * ATTEMPTS_PER_THREAD for product in products
+        )
+        assert cart.total == cart.get_total
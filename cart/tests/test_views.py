@@ -1,4 +1,6 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from users.models import Users
@@ -180,3 +182,84 @@ class TestCartViews:
         assert response.status_code == status.HTTP_200_OK
         assert response.data["user"] == self.user.id
         assert len(response.data["cart_items"]) == 1
+
+    def test_adding_same_product_twice_updates_one_line(
+        self, django_assert_num_queries
+    ):
+        url = reverse("cart-add", args=[self.product.id])
+        self.product.is_published = True
+        self.product.save()
+        self.client.force_authenticate(user=self.user)
+        CartItem.objects.all().delete()
+        Products.objects.filter(id=self.product.id).update(price=80.00)
+
+        # The first add inserts the line and the second one updates it, both
+        # with the same number of queries
+        with django_assert_num_queries(8):
+            response = self.client.post(url, {"quantity": 1}, format="json")
+        with django_assert_num_queries(8):
+            response = self.client.post(url, {"quantity": 2}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+
+        cart_item = CartItem.objects.get(cart=self.cart, product=self.product)
+        assert cart_item.quantity == 3
+        assert float(cart_item.price) == 80.00
+
+    def test_cart_summary_follows_adds_and_removes(self, django_assert_num_queries):
+        self.product.is_published = True
+        self.product.save()
+        CartItem.objects.all().delete()
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(
+            reverse("cart-add", args=[self.product.id]), {"quantity": 3}, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        url = reverse("cart-summary")
+        with django_assert_num_queries(1):
+            response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"total": "300.00", "item_count": 3}
+
+        response = self.client.get(reverse("cart-list"))
+        assert response.data["total"] == "300.00"
+        assert response.data["item_count"] == 3
+
+        self.client.delete(reverse("cart-remove", args=[self.product.id]))
+        response = self.client.get(url)
+        assert response.data == {"total": "0.00", "item_count": 0}
+
+    def test_cart_summary_without_cart(self):
+        Cart.objects.all().delete()
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("cart-summary"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"total": "0.00", "item_count": 0}
+
+    def test_get_cart_does_not_query_per_item(self):
+        products = Products.objects.bulk_create(
+            [
+                Products(name=f"Product {index}", description="", price=10, stock=10)
+                for index in range(20)
+            ]
+        )
+        self.client.force_authenticate(user=self.user)
+        url = reverse("cart-list")
+
+        query_counts = []
+        for size in [1, 20]:
+            CartItem.objects.filter(cart=self.cart).delete()
+            CartItem.objects.bulk_create(
+                [
+                    CartItem(cart=self.cart, product=product, price=10, quantity=1)
+                    for product in products[:size]
+                ]
+            )
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.data["cart_items"]) == size
+            query_counts.append(len(context.captured_queries))
+
+        assert query_counts[0] == query_counts[1]
@@ -3,10 +3,17 @@ URL configuration for the cart app.
 """
 
 from django.urls import path
-from .views import get_cart, get_cart_item, add_to_cart, remove_from_cart
+from .views import (
+    get_cart,
+    get_cart_summary,
+    get_cart_item,
+    add_to_cart,
+    remove_from_cart,
+)
 
 urlpatterns = [
     path("", get_cart, name="cart-list"),  # GET /api/cart/
+    path("summary", get_cart_summary, name="cart-summary"),  # GET /api/cart/summary
     path(
         "<uuid:cart_item_id>", get_cart_item, name="cart-item-detail"
     ),  # GET /api/cart/<cart_item_id>
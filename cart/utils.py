@@ -1,14 +1,87 @@
-from .models import Cart, CartItem
+from decimal import Decimal
+from django.db import connection
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from common.models import line_count, line_total
+from .models import Cart, CartItem, reservation_deadline
 from products.models import Products
 
 
-def get_user_cart(user):
-    return Cart.objects.get_or_create(user=user)
+def get_user_cart(user, lock=False):
+    """
+    Get or create the cart of a user, locking its row when `lock` is set so
+    that writes to the cart's lines and totals run one at a time.
+    """
+    carts = Cart.objects.select_for_update() if lock else Cart.objects
+    return carts.get_or_create(user=user)
 
 
 def get_cart_item_by_id(cart_item_id):
-    return CartItem.objects.get(id=cart_item_id)
+    return CartItem.objects.select_related("cart", "product").get(id=cart_item_id)
 
 
 def get_product_by_id(product_id):
     return Products.objects.get(id=product_id)
+
+
+def add_cart_item(cart, product, quantity):
+    """
+    Add `quantity` units of a product to a cart in a single upsert.
+
+    A new line is inserted at the current product price. When the cart
+    already holds the product, the quantity is added to the existing line
+    and its price is moved to the current product price.
+    """
+    table = connection.ops.quote_name(CartItem._meta.db_table)
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table}
+                (id, cart_id, product_id, quantity, price, reserved_until,
+                 created_at, updated_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (cart_id, product_id) DO UPDATE SET
+                quantity = {table}.quantity + EXCLUDED.quantity,
+                price = EXCLUDED.price,
+                reserved_until = EXCLUDED.reserved_until,
+                updated_at = EXCLUDED.updated_at
+            """,
+            [
+                CartItem._meta.pk.get_default(),
+                cart.id,
+                product.id,
+                quantity,
+                product.price,
+                reservation_deadline(),
+                now,
+                now,
+            ],
+        )
+
+
+def extend_reservations(cart_id):
+    """
+    Hold the stock of every line of a cart for another reservation period,
+    after activity on the cart.
+    """
+    CartItem.objects.filter(cart_id=cart_id).update(
+        reserved_until=reservation_deadline()
+    )
+
+
+def refresh_cart_totals(*cart_ids):
+    """
+    Recompute the denormalized total and item count of carts from their
+    items in a single UPDATE statement.
+    """
+    items = CartItem.objects.filter(cart=OuterRef("pk")).order_by().values("cart")
+    total = items.annotate(total=line_total()).values("total")
+    count = items.annotate(count=line_count()).values("count")
+    Cart.objects.filter(id__in=cart_ids).update(
+        # An empty cart has no item rows to group, so default to zero
+        total=Coalesce(Subquery(total), Value(Decimal("0.00"))),
+        item_count=Coalesce(Subquery(count), Value(0)),
+        updated_at=timezone.now(),
+    )
@@ -4,10 +4,19 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django.db import transaction
 from rest_framework.permissions import IsAuthenticated
-from .serializers import CartSerializer, CartItemSerializer
+from common.idempotency import idempotent
+from .serializers import CartSerializer, CartItemSerializer, CartSummarySerializer
 from products.models import Products
+from products.inventory import release_stock, reserve_stock
 from .models import Cart, CartItem
-from .utils import get_user_cart, get_cart_item_by_id, get_product_by_id
+from .utils import (
+    get_user_cart,
+    get_cart_item_by_id,
+    get_product_by_id,
+    add_cart_item,
+    extend_reservations,
+    refresh_cart_totals,
+)
 
 
 # Getting the logger
@@ -34,6 +43,29 @@ def get_cart(request):
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def get_cart_summary(request):
+    """
+    A view that returns the total and item count of the logged-in user's
+    cart, read from the cart row alone.
+    """
+    try:
+        # Only the denormalized totals are read, the cart items are not
+        cart = (
+            Cart.objects.only("id", "total", "item_count")
+            .filter(user=request.user)
+            .first()
+        ) or Cart(user=request.user)
+
+        serializer = CartSummarySerializer(cart)
+        logger.info("Cart summary returned successfully")
+        return Response(serializer.data, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(str(e))
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_cart_item(request, cart_item_id):
@@ -42,7 +74,7 @@ def get_cart_item(request, cart_item_id):
     """
     try:
         cart_item = get_cart_item_by_id(cart_item_id)
-        if cart_item.cart.user != request.user:
+        if cart_item.cart.user_id != request.user.id:
             return Response(
                 {"error": "You are not authorized to view this cart item"},
                 status=status.HTTP_403_FORBIDDEN,
@@ -62,6 +94,7 @@ def get_cart_item(request, cart_item_id):
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
+@idempotent
 def add_to_cart(request, product_id):
     """
     A view that adds a product to the cart for the logged-in user.
@@ -86,30 +119,23 @@ def add_to_cart(request, product_id):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Ensure that the product is available in stock
-        if product.stock < quantity:
-            return Response(
-                {"error": "Not enough stock available."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        # Get or create the cart for the user
-        cart, _ = get_user_cart(request.user)
-
         with transaction.atomic():
-            # Check if the product is already in the cart
-            cart_item, _ = CartItem.objects.get_or_create(
-                cart=cart, product=product, price=product.price
-            )
-
-            # Update the quantity of the product in the cart
-            cart_item.quantity += quantity
-            cart_item.save()
-
-            # Reduce the stock of the product
-            product.stock -= quantity
-
-            product.save()
+            # Get or create the cart for the user and lock it, so concurrent
+            # adds refresh its totals one after the other
+            cart, _ = get_user_cart(request.user, lock=True)
+
+            # Reduce the stock of the product if enough is available
+            if not reserve_stock(product.id, quantity, shards=product.shard_count):
+                return Response(
+                    {"error": "Not enough stock available."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            # Add the product to the cart, or add to its quantity if it is
+            # already in the cart
+            add_cart_item(cart, product, quantity)
+            extend_reservations(cart.id)
+            refresh_cart_totals(cart.id)
 
         logger.info(f"Product {product_id} added to cart successfully")
         return Response(
@@ -132,6 +158,7 @@ def add_to_cart(request, product_id):
 
 @api_view(["DELETE"])
 @permission_classes([IsAuthenticated])
+@idempotent
 def remove_from_cart(request, product_id):
     """
     A view that removes a product from the cart for the logged-in user.
@@ -140,20 +167,25 @@ def remove_from_cart(request, product_id):
         # Get the product by ID
         product = get_product_by_id(product_id)
 
-        # Get the cart for the user
-        cart = Cart.objects.get(user=request.user)
-
-        # Check if the product is in the cart
-        cart_item = CartItem.objects.get(cart=cart, product=product)
-
         with transaction.atomic():
-            # Increase the stock of the product
-            product.stock += cart_item.quantity
-            product.save()
+            # Get the cart for the user and lock it, so concurrent writes
+            # refresh its totals one after the other
+            cart = Cart.objects.select_for_update().get(user=request.user)
+
+            # Lock the cart item so a concurrent add or remove cannot change
+            # the quantity that is returned to stock
+            cart_item = CartItem.objects.select_for_update().get(
+                cart=cart, product=product
+            )
 
             # Delete the product from the cart
             cart_item.delete()
 
+            # Increase the stock of the product
+            release_stock(product.id, cart_item.quantity, shards=product.shard_count)
+            extend_reservations(cart.id)
+            refresh_cart_totals(cart.id)
+
         logger.info(f"Product {product_id} removed from cart successfully")
         return Response(
             {"message": "Product removed from cart successfully"},
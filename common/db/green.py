@@ -0,0 +1,34 @@
+import psycopg2
+from psycopg2 import extensions
+
+
+def gevent_wait_callback(connection, timeout=None):
+    """
+    Wait for a psycopg2 connection by yielding to the gevent hub, so other
+    greenlets run while a query is in flight.
+    """
+    from gevent.socket import wait_read, wait_write
+
+    while True:
+        state = connection.poll()
+        if state == extensions.POLL_OK:
+            break
+        elif state == extensions.POLL_READ:
+            wait_read(connection.fileno(), timeout=timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(connection.fileno(), timeout=timeout)
+        else:
+            raise psycopg2.OperationalError(f"Bad result from poll: {state!r}")
+
+
+def make_psycopg2_green():
+    """
+    Make psycopg2 cooperative with gevent. Connections opened afterwards
+    wait for the database through the gevent hub instead of blocking the
+    whole worker process.
+    """
+    extensions.set_wait_callback(gevent_wait_callback)
+
+
+def is_psycopg2_green():
+    return extensions.get_wait_callback() is gevent_wait_callback
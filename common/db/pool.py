@@ -0,0 +1,114 @@
+import collections
+import os
+import threading
+from django.db import OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
+
+# Pools by database alias and connection parameters, per process
+_pools = {}
+_pools_lock = threading.Lock()
+_pools_pid = None
+
+
+class ConnectionPool:
+    """
+    A bounded pool of open database connections.
+
+    At most `size` connections are handed out at once. Callers beyond that
+    wait up to `timeout` seconds for one to be released. The primitives come
+    from `threading`, so under gevent's monkey patching waiting blocks the
+    current greenlet only.
+    """
+
+    def __init__(self, size, timeout):
+        self.size = size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = collections.deque()
+        self._lock = threading.Lock()
+
+    def acquire(self, connect):
+        """
+        Return an idle connection, or one opened with `connect` when none is
+        idle and the pool is below its size.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise OperationalError(
+                f"Timed out after {self.timeout}s waiting for one of "
+                f"{self.size} pooled database connections"
+            )
+        try:
+            while True:
+                with self._lock:
+                    connection = self._idle.pop() if self._idle else None
+                if connection is None:
+                    return connect()
+                if not connection.closed:
+                    return connection
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection):
+        """
+        Return a connection to the pool, or close it when it is unusable.
+        """
+        try:
+            if self._reset(connection):
+                with self._lock:
+                    self._idle.append(connection)
+            elif not connection.closed:
+                connection.close()
+        finally:
+            self._slots.release()
+
+    def close_idle(self):
+        """
+        Close every connection that is not in use.
+        """
+        with self._lock:
+            idle, self._idle = list(self._idle), collections.deque()
+        for connection in idle:
+            connection.close()
+
+    @staticmethod
+    def _reset(connection):
+        # Roll back anything left open so the next user starts clean
+        try:
+            if connection.closed:
+                return False
+            status = connection.get_transaction_status()
+            if status == TRANSACTION_STATUS_UNKNOWN:
+                return False
+            if status != TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+            return connection.get_transaction_status() == TRANSACTION_STATUS_IDLE
+        except Exception:
+            return False
+
+
+def get_pool(key, size, timeout):
+    """
+    Return the pool for `key` in this process, creating it on first use.
+    Pools inherited from a parent process are dropped after a fork.
+    """
+    global _pools_pid
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            _pools.clear()
+            _pools_pid = os.getpid()
+        if key not in _pools:
+            _pools[key] = ConnectionPool(size, timeout)
+        return _pools[key]
+
+
+def close_pools():
+    """
+    Close the idle connections of every pool in this process and forget the
+    pools, so the next connection starts a new one.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_idle()
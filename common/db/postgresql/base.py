@@ -0,0 +1,39 @@
+from django.db.backends.postgresql.base import (
+    DatabaseWrapper as PostgresDatabaseWrapper,
+)
+from common.db.pool import get_pool
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    """
+    The PostgreSQL backend with an optional bounded, per-process connection
+    pool, enabled by a positive `POOL_SIZE` in the database settings.
+
+    Closing a pooled connection hands it back to the pool, so Django's
+    per-request connection handling reuses open connections and the number
+    of connections a worker opens never exceeds the pool size.
+    """
+
+    def get_pool(self, conn_params):
+        size = self.settings_dict.get("POOL_SIZE") or 0
+        if size <= 0:
+            return None
+        key = (self.alias, tuple(sorted((k, repr(v)) for k, v in conn_params.items())))
+        return get_pool(key, size, self.settings_dict.get("POOL_TIMEOUT", 30))
+
+    def get_new_connection(self, conn_params):
+        pool = self.get_pool(conn_params)
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        self.pool = pool
+        return pool.acquire(
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params)
+        )
+
+    def _close(self):
+        pool = getattr(self, "pool", None)
+        if self.connection is None or pool is None:
+            return super()._close()
+        self.pool = None
+        with self.wrap_database_errors:
+            pool.release(self.connection)
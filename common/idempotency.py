@@ -0,0 +1,166 @@
+import functools
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from common.utils.scheduling import run_periodically
+from .models import IdempotencyKey
+
+# Getting the logger
+logger = logging.getLogger("django")
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def request_fingerprint(request):
+    """
+    Hash the method, path and body of a request.
+    """
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    value = f"{request.method} {request.path}\n{body}"
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def lock_key(user_id, key):
+    """
+    Take a transaction advisory lock on a user's key, waiting for the
+    transaction that holds it to end.
+    """
+    digest = hashlib.blake2b(f"idempotency:{user_id}:{key}".encode(), digest_size=8)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(%s)",
+            [int.from_bytes(digest.digest(), "big", signed=True)],
+        )
+
+
+def find_response(user_id, key):
+    return IdempotencyKey.objects.filter(
+        user_id=user_id, key=key, expires_at__gt=timezone.now()
+    ).first()
+
+
+def replay(stored, fingerprint):
+    if stored.fingerprint != fingerprint:
+        logger.error(f"Idempotency key {stored.key} reused for another request")
+        return Response(
+            {"error": "Idempotency key was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    logger.info(f"Response replayed for idempotency key {stored.key}")
+    return Response(
+        stored.body, status=stored.status_code, headers={REPLAYED_HEADER: "true"}
+    )
+
+
+def idempotent(view):
+    """
+    Decorate a write view so a request retried with the same Idempotency-Key
+    header gets the stored response of the first one instead of running
+    again. Requests without the header run as before.
+
+    A replay reads only the stored response. The first request runs in a
+    transaction holding an advisory lock on the key, and stores its response
+    in that transaction, so concurrent duplicates wait for it and replay
+    what it committed. The view runs in a savepoint of that transaction.
+    Server errors are not stored, their retries run again.
+    """
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view(request, *args, **kwargs)
+        if len(key) > IdempotencyKey._meta.get_field("key").max_length:
+            return Response(
+                {"error": "Idempotency key must be at most 255 characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user_id = request.user.id
+        fingerprint = request_fingerprint(request)
+        stored = find_response(user_id, key)
+        if stored is not None:
+            return replay(stored, fingerprint)
+
+        with transaction.atomic():
+            lock_key(user_id, key)
+            # A duplicate that waited on the lock finds the first response
+            stored = find_response(user_id, key)
+            if stored is not None:
+                return replay(stored, fingerprint)
+
+            # In a savepoint, so a database error the view catches and turns
+            # into a response rolls back its writes but not the lock
+            with transaction.atomic():
+                response = view(request, *args, **kwargs)
+            if response.status_code < 500:
+                # Replaces the response of an expired key, if any
+                IdempotencyKey.objects.bulk_create(
+                    [
+                        IdempotencyKey(
+                            user_id=user_id,
+                            key=key,
+                            fingerprint=fingerprint,
+                            status_code=response.status_code,
+                            body=response.data,
+                            expires_at=timezone.now()
+                            + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+                        )
+                    ],
+                    update_conflicts=True,
+                    unique_fields=["user", "key"],
+                    update_fields=[
+                        "fingerprint",
+                        "status_code",
+                        "body",
+                        "created_at",
+                        "expires_at",
+                    ],
+                )
+        return response
+
+    return wrapper
+
+
+def purge_idempotency_keys(batch_size=None):
+    """
+    Delete expired idempotency keys in batches of `batch_size` rows, each
+    its own transaction. Returns the number deleted.
+    """
+    batch_size = batch_size or settings.IDEMPOTENCY_KEY_PURGE_BATCH_SIZE
+    cutoff = timezone.now()
+    deleted = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects.filter(expires_at__lte=cutoff)
+            .order_by("expires_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        with transaction.atomic():
+            IdempotencyKey.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+
+    logger.info(f"Purged {deleted} expired idempotency keys")
+    return deleted
+
+
+def schedule_idempotency_key_purge():
+    """
+    Purge expired idempotency keys every IDEMPOTENCY_KEY_PURGE_INTERVAL
+    seconds in the background of this process, unless the interval is 0.
+    """
+    if settings.IDEMPOTENCY_KEY_PURGE_INTERVAL:
+        return run_periodically(
+            "purge-idempotency-keys",
+            settings.IDEMPOTENCY_KEY_PURGE_INTERVAL,
+            purge_idempotency_keys,
+        )
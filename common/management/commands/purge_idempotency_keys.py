@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from common.idempotency import purge_idempotency_keys
+
+
+class Command(BaseCommand):
+    help = "Delete expired idempotency keys in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.IDEMPOTENCY_KEY_PURGE_BATCH_SIZE,
+            help="The number of keys deleted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = purge_idempotency_keys(batch_size=options["batch_size"])
+        self.stdout.write(f"{deleted} expired idempotency keys deleted")
@@ -0,0 +1,65 @@
+import os
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Label used for requests that did not match any URL pattern
+UNRESOLVED_VIEW = "<unresolved>"
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling a request, by URL name.",
+    ["method", "view"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter(
+    "http_requests",
+    "Requests handled, by URL name and status code.",
+    ["method", "view", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries run while handling a request, by URL name.",
+    ["view"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250),
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in database queries while handling a request, by URL name.",
+    ["view"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+
+def uses_multiprocess_registry():
+    """
+    Whether metrics are shared between worker processes through the files
+    in PROMETHEUS_MULTIPROC_DIR.
+    """
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render_metrics():
+    """
+    Return the metrics of every worker process in the Prometheus text
+    exposition format, with its content type.
+    """
+    if uses_multiprocess_registry():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
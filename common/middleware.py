@@ -0,0 +1,69 @@
+import time
+from django.db import connection
+from .metrics import (
+    REQUEST_DB_QUERIES,
+    REQUEST_DB_TIME,
+    REQUEST_LATENCY,
+    REQUESTS,
+    REQUESTS_IN_FLIGHT,
+    UNRESOLVED_VIEW,
+)
+
+
+class QueryRecorder:
+    """
+    A database execute wrapper that counts the queries of a request and
+    the time spent running them.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class MetricsMiddleware:
+    """
+    Record the latency, status code, database queries and database time of
+    every request, labelled by URL name so the label set stays bounded.
+
+    Streaming responses are measured until their first byte is ready, not
+    until the whole body has been sent.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        method = request.method
+        queries = QueryRecorder()
+        in_flight = REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(queries):
+                response = self.get_response(request)
+        finally:
+            in_flight.dec()
+
+        duration = time.perf_counter() - started
+        view = self.view_name(request)
+        REQUEST_LATENCY.labels(method, view).observe(duration)
+        REQUESTS.labels(method, view, str(response.status_code)).inc()
+        REQUEST_DB_QUERIES.labels(view).observe(queries.count)
+        REQUEST_DB_TIME.labels(view).observe(queries.duration)
+        return response
+
+    @staticmethod
+    def view_name(request):
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return UNRESOLVED_VIEW
+        return match.view_name or match.route
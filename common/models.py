@@ -1,5 +1,11 @@
 import uuid
+from decimal import Decimal
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Coalesce
+from .utils.uuids import uuid7
 
 
 class UUIDModel(models.Model):
@@ -11,3 +17,82 @@ class UUIDModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class UUID7Model(UUIDModel):
+    """
+    An abstract model with a time-ordered UUID primary key.
+
+    New rows get increasing keys, so inserts append to the right edge of the
+    primary key index instead of landing on random pages. Keys created
+    before a model switched to it stay valid.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+
+    class Meta:
+        abstract = True
+
+
+def line_total(prefix=""):
+    """
+    The sum of price times quantity over line items, computed in the
+    database. `prefix` follows a relation, e.g. "cartitem__" from a cart.
+    """
+    return Coalesce(
+        Sum(F(f"{prefix}price") * F(f"{prefix}quantity")),
+        Value(Decimal("0.00")),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+def line_count(prefix=""):
+    """
+    The sum of quantities over line items, computed in the database.
+    """
+    return Coalesce(Sum(f"{prefix}quantity"), Value(0))
+
+
+class LineItemsQuerySet(models.QuerySet):
+    """
+    A queryset for models with line items that can annotate their totals,
+    so list views get them in the same query as the rows.
+    """
+
+    line_item_prefix = None
+
+    def with_totals(self):
+        return self.annotate(
+            items_total=line_total(self.line_item_prefix),
+            items_count=line_count(self.line_item_prefix),
+        )
+
+
+class IdempotencyKey(models.Model):
+    """
+    The stored response of a request made with an Idempotency-Key header,
+    replayed when the same user retries it with the same key.
+    """
+
+    # Covered by the unique constraint, which leads with the user
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False
+    )
+    key = models.CharField(max_length=255)
+    # Hash of the method, path and body, a key reused for another request
+    # is refused
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField()
+    body = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="common_idempotency_user_key_unique"
+            )
+        ]
+
+    def __str__(self):
+        return f"Idempotency key {self.key} of user {self.user_id}"
@@ -0,0 +1,57 @@
+import hashlib
+from django.db.models import Count, Max
+from django.db.models.functions import Greatest
+from django.views.decorators.http import condition
+
+
+def conditional_queryset(get_queryset, modified_fields=("updated_at",)):
+    """
+    Decorate a read view so it answers If-None-Match and If-Modified-Since
+    with 304 Not Modified.
+
+    `get_queryset` receives the view arguments and returns the queryset the
+    response is built from, or None to skip the check (for example when the
+    user may not see the resource). The validators come from one aggregate
+    over `modified_fields`, so no rows are fetched or serialized to compute
+    them. Fields of related rows that change on their own, like
+    "stock_shards__updated_at", are joined into the aggregate.
+    """
+    if len(modified_fields) == 1:
+        last_modified = Max(modified_fields[0])
+    else:
+        # Greatest skips the NULLs of rows without related rows on PostgreSQL
+        last_modified = Greatest(*[Max(field) for field in modified_fields])
+    # Related rows repeat the rows they belong to
+    count = Count("pk", distinct=len(modified_fields) > 1)
+
+    def get_validators(request, *args, **kwargs):
+        # The ETag and Last-Modified callbacks share a single aggregate query
+        if not hasattr(request, "_conditional_validators"):
+            queryset = get_queryset(request, *args, **kwargs)
+            request._conditional_validators = (
+                None
+                if queryset is None
+                else queryset.aggregate(count=count, last_modified=last_modified)
+            )
+        return request._conditional_validators
+
+    def etag_func(request, *args, **kwargs):
+        validators = get_validators(request, *args, **kwargs)
+        if not validators or validators["last_modified"] is None:
+            return None
+
+        # The count catches deletions and the path distinguishes list pages
+        value = "|".join(
+            [
+                request.get_full_path(),
+                str(validators["count"]),
+                validators["last_modified"].isoformat(),
+            ]
+        )
+        return f'"{hashlib.sha256(value.encode("utf-8")).hexdigest()[:32]}"'
+
+    def last_modified_func(request, *args, **kwargs):
+        validators = get_validators(request, *args, **kwargs)
+        return validators["last_modified"] if validators else None
+
+    return condition(etag_func=etag_func, last_modified_func=last_modified_func)
@@ -0,0 +1,106 @@
+import csv
+import datetime
+import json
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+# Supported export formats and their content types
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class Echo:
+    """
+    A file-like object that hands back whatever is written to it, so the
+    csv writer can produce one line at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+def parse_boundary(value, end=False):
+    """
+    Parse a date or datetime query parameter into an aware datetime. Upper
+    bounds are exclusive, so a plain date used as one covers the whole day.
+    """
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+
+    if day is not None:
+        if end:
+            day += datetime.timedelta(days=1)
+        moment = datetime.datetime.combine(day, datetime.time.min)
+    else:
+        moment = parse_datetime(value)
+        if moment is None:
+            raise ValueError(f"Invalid date: {value}")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def filter_created_between(queryset, request):
+    """
+    Apply the optional `created_from` and `created_to` query parameters.
+    """
+    created_from = request.query_params.get("created_from")
+    created_to = request.query_params.get("created_to")
+    if created_from:
+        queryset = queryset.filter(created_at__gte=parse_boundary(created_from))
+    if created_to:
+        queryset = queryset.filter(created_at__lt=parse_boundary(created_to, end=True))
+    return queryset
+
+
+def export_response(queryset, fields, export_format, filename, columns=None):
+    """
+    Stream a queryset as CSV or NDJSON with constant memory.
+
+    Rows are read with `QuerySet.iterator`, which uses a server-side cursor
+    on PostgreSQL, and are encoded one at a time as the response is sent.
+    `columns` names the exported columns when they differ from `fields`.
+    """
+    columns = columns or fields
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Invalid export format. Choose one of: {', '.join(EXPORT_FORMATS)}"
+        )
+
+    rows = queryset.values_list(*fields).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    if export_format == "csv":
+        content = _stream_csv(rows, columns)
+    else:
+        content = _stream_ndjson(rows, columns)
+
+    response = StreamingHttpResponse(
+        content, content_type=EXPORT_FORMATS[export_format]
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{export_format}"'
+    )
+    return response
+
+
+def _stream_csv(rows, fields):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(
+            [
+                value.isoformat() if isinstance(value, datetime.datetime) else value
+                for value in row
+            ]
+        )
+
+
+def _stream_ndjson(rows, fields):
+    for row in rows:
+        yield json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder) + "\n"
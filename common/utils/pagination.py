@@ -1,7 +1,283 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import hashlib
+import json
+import uuid
+from django.conf import settings
+from django.core.cache import caches
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class CustomPageNumberPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    A paginator that takes the count of an unfiltered queryset from the
+    planner statistics of its table instead of counting every row.
+
+    Tables with fewer than PAGINATION_ESTIMATE_MIN_ROWS rows by the
+    statistics are counted exactly, in the same query. Filtered querysets
+    are always counted exactly.
+    """
+
+    estimated = False
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if query.where or query.distinct or query.combinator:
+            return self.object_list.count()
+
+        table = self.object_list.model._meta.db_table
+        connection = connections[self.object_list.db]
+        with connection.cursor() as cursor:
+            # The exact count in the ELSE branch only runs when it is taken
+            cursor.execute(
+                f"""
+                SELECT reltuples >= %(min_rows)s,
+                    CASE WHEN reltuples >= %(min_rows)s THEN reltuples::bigint
+                    ELSE (SELECT COUNT(*) FROM {connection.ops.quote_name(table)})
+                    END
+                FROM pg_class
+                WHERE oid = %(table)s::regclass
+                """,
+                {"min_rows": settings.PAGINATION_ESTIMATE_MIN_ROWS, "table": table},
+            )
+            self.estimated, count = cursor.fetchone()
+        return count
+
+
+class CachedCountPaginator(Paginator):
+    """
+    A paginator that caches the exact count of a queryset for
+    PAGINATION_COUNT_CACHE_TIMEOUT seconds.
+    """
+
+    @cached_property
+    def count(self):
+        sql, params = self.object_list.query.sql_with_params()
+        digest = hashlib.sha256(f"{sql}|{params!r}".encode("utf-8")).hexdigest()
+        key = f"pagination:count:{digest}"
+        cache = caches[settings.PAGINATION_COUNT_CACHE_ALIAS]
+        count = cache.get(key)
+        if count is None:
+            count = self.object_list.count()
+            cache.set(key, count, timeout=settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+        return count
+
+
+class EstimatedCountPagination(CustomPageNumberPagination):
+    """
+    Page number pagination with an estimated count on large unfiltered
+    listings. `estimated` tells clients whether the count is exact.
+    """
+
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data["estimated"] = self.page.paginator.estimated
+        return response
+
+
+class CachedCountPagination(CustomPageNumberPagination):
+    """
+    Page number pagination with a count that may be a little stale.
+    """
+
+    django_paginator_class = CachedCountPaginator
+
+
+class NoCountPagination(CustomPageNumberPagination):
+    """
+    Page number pagination that never counts the rows. It fetches one extra
+    row to find out whether there is a next page, and the response has no
+    count.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            self.page_number = 0
+        if self.page_number < 1:
+            raise NotFound(self.invalid_page_message.format(page_number=""))
+
+        offset = (self.page_number - 1) * page_size
+        results = list(queryset[offset : offset + page_size + 1])
+        self.has_next = len(results) > page_size
+        return results[:page_size]
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+
+class KeysetPagination(BasePagination):
+    """
+    A cursor paginator that walks a queryset newest first on (created_at, id).
+
+    Pages are located with a range condition on the composite key instead of
+    an OFFSET, so fetching any page costs the same no matter how deep it is.
+    The cursors handed out to clients are opaque base64 tokens.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        reverse = False
+        if cursor is not None:
+            created_at, pk, reverse = cursor
+            queryset = queryset.filter(self.get_boundary(created_at, pk, reverse))
+
+        ordering = ("created_at", "id") if reverse else ("-created_at", "-id")
+
+        # Fetch one extra row to find out whether there is another page
+        results = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_boundary(self, created_at, pk, reverse):
+        """
+        Build the filter selecting rows after (or before, when reversed) the
+        cursor position, written so the (created_at, id) index drives it.
+        """
+        if reverse:
+            return Q(created_at__gte=created_at) & (
+                Q(created_at__gt=created_at) | Q(id__gt=pk)
+            )
+        return Q(created_at__lte=created_at) & (
+            Q(created_at__lt=created_at) | Q(id__lt=pk)
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, instance, reverse):
+        payload = {
+            "c": instance.created_at.isoformat(),
+            "i": str(instance.id),
+            "r": int(reverse),
+        }
+        token = base64.urlsafe_b64encode(json.dumps(payload).encode("ascii"))
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, token.decode("ascii")
+        )
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            created_at = parse_datetime(payload["c"])
+            pk = uuid.UUID(payload["i"])
+            reverse = bool(payload["r"])
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+
+        return created_at, pk, reverse
+
+
+# Pagination modes a client may pick with the `pagination` query parameter
+PAGINATION_CLASSES = {
+    "cursor": KeysetPagination,
+    "page": CustomPageNumberPagination,
+    "estimate": EstimatedCountPagination,
+    "cached": CachedCountPagination,
+    "nocount": NoCountPagination,
+}
+
+
+def get_paginator(request, default="cursor"):
+    """
+    Return the paginator selected by the `pagination` query parameter, or
+    the view's `default` one.
+    """
+    mode = request.query_params.get("pagination", default)
+    if mode not in PAGINATION_CLASSES:
+        raise ValueError(
+            f"Invalid pagination mode. Choose one of: {', '.join(PAGINATION_CLASSES)}"
+        )
+    return PAGINATION_CLASSES[mode]()
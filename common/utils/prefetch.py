@@ -0,0 +1,72 @@
+from django.db.models import QuerySet, prefetch_related_objects
+from django.db.models.manager import BaseManager
+from rest_framework import serializers
+
+
+class PrefetchListSerializer(serializers.ListSerializer):
+    """
+    A list serializer that loads the related objects its child serializer
+    declares before serializing, instead of once per instance.
+    """
+
+    def to_representation(self, data):
+        if isinstance(data, BaseManager):
+            data = data.all()
+
+        if isinstance(data, QuerySet) and data._result_cache is None:
+            # Join and prefetch in the query itself, unless the view already
+            # chose how to load this queryset
+            if not data._prefetch_related_lookups and not data.query.select_related:
+                data = self.child.setup_eager_loading(data)
+        else:
+            # Paginated pages and prefetched relations arrive as lists, only
+            # relations that are not loaded yet are fetched for them
+            data = list(data)
+            self.child.prefetch_instances(data)
+
+        return super().to_representation(data)
+
+
+class PrefetchSerializerMixin:
+    """
+    A serializer mixin for declaring the related objects a serializer reads.
+
+    `select_related_fields` and `prefetch_related_fields` are applied by
+    `setup_eager_loading`, which views call on the querysets they serialize.
+    A view that forgets to is still covered: lists and single instances load
+    any relation that is missing in one query per lookup before serializing.
+    """
+
+    select_related_fields = []
+    prefetch_related_fields = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        meta = getattr(cls, "Meta", None)
+        if meta is not None and not hasattr(meta, "list_serializer_class"):
+            meta.list_serializer_class = PrefetchListSerializer
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Return the queryset with the serializer's related objects loaded.
+        """
+        # select_related() without fields would follow every foreign key
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        return queryset.prefetch_related(*cls.prefetch_related_fields)
+
+    @classmethod
+    def prefetch_instances(cls, instances):
+        """
+        Load the serializer's related objects onto already fetched instances.
+        """
+        lookups = [*cls.select_related_fields, *cls.prefetch_related_fields]
+        if instances and lookups:
+            prefetch_related_objects(instances, *lookups)
+
+    def to_representation(self, instance):
+        # Items of a list are prefetched by the list serializer
+        if not isinstance(self.parent, serializers.ListSerializer):
+            self.prefetch_instances([instance])
+        return super().to_representation(instance)
@@ -0,0 +1,54 @@
+import logging
+import random
+import threading
+import zlib
+from contextlib import contextmanager
+from django.db import connection
+
+# Getting the logger
+logger = logging.getLogger("django")
+
+
+@contextmanager
+def advisory_lock(name):
+    """
+    Try to take a PostgreSQL session advisory lock named `name`, yielding
+    whether it was taken. The lock is released on exit.
+    """
+    key = zlib.crc32(name.encode())
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", [key])
+        acquired = cursor.fetchone()[0]
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [key])
+
+
+def run_periodically(name, interval, func):
+    """
+    Call `func` every `interval` seconds on a daemon thread, a greenlet under
+    gevent, and return an event that stops it when set.
+
+    Every worker process may schedule the same task. An advisory lock named
+    after the task makes only one of them run it at a time, and a random
+    jitter keeps the workers from waking up together.
+    """
+    stopped = threading.Event()
+
+    def loop():
+        while not stopped.wait(interval * random.uniform(0.9, 1.1)):
+            try:
+                with advisory_lock(name) as acquired:
+                    if acquired:
+                        func()
+            except Exception:
+                logger.exception(f"Periodic task {name} failed")
+            finally:
+                # The thread keeps no connection open between runs
+                connection.close()
+
+    threading.Thread(target=loop, name=name, daemon=True).start()
+    return stopped
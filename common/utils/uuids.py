@@ -0,0 +1,46 @@
+import os
+import threading
+import time
+import uuid
+
+# Largest value of the 12 bit counter that follows the timestamp
+MAX_COUNTER = 0xFFF
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7():
+    """
+    Return a time-ordered UUID in the version 7 layout: a 48 bit Unix
+    timestamp in milliseconds, a 12 bit counter and 62 random bits.
+
+    UUIDs from one process are strictly increasing. The counter orders the
+    ones made in the same millisecond and starts at a random point in its
+    lower half, and a clock that steps back keeps the last timestamp.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2), "big") & (MAX_COUNTER >> 1)
+        elif _counter < MAX_COUNTER:
+            _counter += 1
+        else:
+            # The counter is exhausted, borrow the next millisecond
+            _last_ms += 1
+            _counter = 0
+        timestamp, counter = _last_ms, _counter
+
+    random_bits = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (
+        (timestamp << 80)
+        | (0x7 << 76)
+        | (counter << 64)
+        # RFC 4122 variant
+        | (0b10 << 62)
+        | random_bits
+    )
+    return uuid.UUID(int=value)
@@ -1,5 +1,21 @@
 import os
 import django
+import pytest
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "fashionstore.settings")
 django.setup()
+
+from django.core.cache import caches
+from users.authentication import active_users
+from users.blacklist import blacklisted_tokens
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Start every test with empty caches so cached responses never leak between tests.
+    """
+    for cache in caches.all():
+        cache.clear()
+    active_users.clear()
+    blacklisted_tokens.clear()
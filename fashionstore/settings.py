@@ -42,8 +42,10 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_simplejwt.token_blacklist",
+    "common",
     "users",
     "products",
     "cart",
@@ -51,6 +53,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so that the time spent in every other middleware is measured
+    "common.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -86,16 +90,73 @@ WSGI_APPLICATION = "fashionstore.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        # PostgreSQL with an optional per-process connection pool
+        "ENGINE": "common.db.postgresql",
         "NAME": os.getenv("DATABASE_NAME"),
         "USER": os.getenv("DATABASE_USERNAME"),
         "PASSWORD": os.getenv("DATABASE_PASSWORD"),
         "HOST": os.getenv("DATABASE_HOST"),
         "PORT": os.getenv("DATABASE_PORT", "5432"),
+        # Connections a worker may hold at once, 0 disables pooling
+        "POOL_SIZE": int(os.getenv("DATABASE_POOL_SIZE", 0)),
+        # Seconds a request waits for a pooled connection before failing
+        "POOL_TIMEOUT": int(os.getenv("DATABASE_POOL_TIMEOUT", 30)),
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "fashion-store"),
+    }
+}
+
+# Catalog cache settings. Catalog writes invalidate the cached pages by bumping
+# a version kept in this cache. With the default per-process LocMemCache that
+# only reaches the worker that made the write, the others serve stale product
+# details for at most CATALOG_CACHE_TIMEOUT seconds, stock is always read live.
+# Point CACHE_BACKEND at a shared backend such as Redis or Memcached to
+# invalidate every worker at once
+CATALOG_CACHE_ALIAS = "default"
+CATALOG_CACHE_TIMEOUT = int(os.getenv("CATALOG_CACHE_TIMEOUT", "60"))
+CATALOG_CACHE_LOCK_TIMEOUT = 10
+
+# Listing counts. "estimate" pagination reads the row count of unfiltered
+# tables from the planner statistics once they hold this many rows, and
+# "cached" pagination keeps exact counts for PAGINATION_COUNT_CACHE_TIMEOUT
+PAGINATION_ESTIMATE_MIN_ROWS = int(os.getenv("PAGINATION_ESTIMATE_MIN_ROWS", 100000))
+PAGINATION_COUNT_CACHE_ALIAS = "default"
+PAGINATION_COUNT_CACHE_TIMEOUT = int(os.getenv("PAGINATION_COUNT_CACHE_TIMEOUT", 30))
+
+# Product search settings
+# "auto" uses full-text search on PostgreSQL and the in-process index elsewhere
+PRODUCT_SEARCH_BACKEND = os.getenv("PRODUCT_SEARCH_BACKEND", "auto")
+PRODUCT_SEARCH_INDEX_MAX_AGE = 300
+
+# Product import settings
+PRODUCT_IMPORT_BATCH_SIZE = int(os.getenv("PRODUCT_IMPORT_BATCH_SIZE", "1000"))
+PRODUCT_IMPORT_USE_COPY = True
+
+# Cart reservations, the stock held by a cart returns to the catalog once the
+# cart has been inactive for CART_RESERVATION_TTL seconds. The gunicorn
+# workers release expired reservations every CART_RESERVATION_REAPER_INTERVAL
+# seconds, 0 disables it in favour of the release_expired_reservations command
+CART_RESERVATION_TTL = int(os.getenv("CART_RESERVATION_TTL", 1800))
+CART_RESERVATION_REAPER_INTERVAL = int(
+    os.getenv("CART_RESERVATION_REAPER_INTERVAL", 60)
+)
+CART_RESERVATION_REAPER_BATCH_SIZE = 500
+
+# Number of rows fetched per round trip by the streaming exports
+EXPORT_CHUNK_SIZE = 2000
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -115,6 +176,15 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing runs on a bounded pool of native threads, requests that
+# find every thread busy and the queue full get a 503 with Retry-After
+PASSWORD_HASHING_THREADS = int(
+    os.getenv("PASSWORD_HASHING_THREADS", min(4, os.cpu_count() or 1))
+)
+PASSWORD_HASHING_MAX_WAITING = int(os.getenv("PASSWORD_HASHING_MAX_WAITING", 32))
+PASSWORD_HASHING_RETRY_AFTER = 1
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -145,7 +215,7 @@ AUTH_USER_MODEL = "users.Users"
 # REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.StatelessJWTAuthentication",
     ],
 }
 
@@ -156,6 +226,27 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,  # Blacklist old refresh token if rotated
 }
 
+# Seconds a user's active flag is cached by the token authentication, a
+# deactivated user keeps access from other processes for at most this long
+USER_ACTIVE_CACHE_TIMEOUT = int(os.getenv("USER_ACTIVE_CACHE_TIMEOUT", 60))
+
+# Seconds between reads of new blacklisted tokens, a refresh token logged out
+# in another process can still be used for this long
+TOKEN_BLACKLIST_SYNC_INTERVAL = int(os.getenv("TOKEN_BLACKLIST_SYNC_INTERVAL", 5))
+
+# Expired tokens are purged every TOKEN_PURGE_INTERVAL seconds by the gunicorn
+# workers, 0 disables it in favour of the purge_expired_tokens command
+TOKEN_PURGE_INTERVAL = int(os.getenv("TOKEN_PURGE_INTERVAL", 3600))
+TOKEN_PURGE_BATCH_SIZE = 1000
+
+# Responses of requests made with an Idempotency-Key header are replayed to
+# retries for IDEMPOTENCY_KEY_TTL seconds. The gunicorn workers purge expired
+# keys every IDEMPOTENCY_KEY_PURGE_INTERVAL seconds, 0 disables it in favour
+# of the purge_idempotency_keys command
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", 86400))
+IDEMPOTENCY_KEY_PURGE_INTERVAL = int(os.getenv("IDEMPOTENCY_KEY_PURGE_INTERVAL", 3600))
+IDEMPOTENCY_KEY_PURGE_BATCH_SIZE = 1000
+
 # Logging settings
 LOGGING = {
     "version": 1,
@@ -0,0 +1,113 @@
+import time
+import gevent
+import pytest
+from django.db import OperationalError, connection
+from psycopg2 import extensions
+from common.db.green import is_psycopg2_green, make_psycopg2_green
+from common.db.pool import ConnectionPool, close_pools
+
+
+class FakeConnection:
+    def __init__(self, status=extensions.TRANSACTION_STATUS_IDLE):
+        self.closed = 0
+        self.status = status
+        self.rolled_back = False
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rolled_back = True
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class TestConnectionPool:
+    def test_connections_are_reused(self):
+        pool = ConnectionPool(size=2, timeout=1)
+        first = pool.acquire(FakeConnection)
+        pool.release(first)
+        assert pool.acquire(FakeConnection) is first
+
+    def test_pool_is_bounded(self):
+        pool = ConnectionPool(size=2, timeout=0.05)
+        pool.acquire(FakeConnection)
+        second = pool.acquire(FakeConnection)
+        with pytest.raises(OperationalError):
+            pool.acquire(FakeConnection)
+
+        pool.release(second)
+        assert pool.acquire(FakeConnection) is second
+
+    def test_released_connections_are_reset_or_discarded(self):
+        pool = ConnectionPool(size=1, timeout=1)
+        in_transaction = pool.acquire(
+            lambda: FakeConnection(extensions.TRANSACTION_STATUS_INTRANS)
+        )
+        pool.release(in_transaction)
+        assert in_transaction.rolled_back
+        assert pool.acquire(FakeConnection) is in_transaction
+        pool.release(in_transaction)
+
+        in_transaction.status = extensions.TRANSACTION_STATUS_UNKNOWN
+        assert pool.acquire(FakeConnection) is in_transaction
+        pool.release(in_transaction)
+        assert in_transaction.closed
+        assert pool.acquire(FakeConnection) is not in_transaction
+
+    def test_failed_connect_frees_its_slot(self):
+        pool = ConnectionPool(size=1, timeout=0.05)
+
+        def connect():
+            raise OperationalError("Database is down")
+
+        with pytest.raises(OperationalError):
+            pool.acquire(connect)
+        assert isinstance(pool.acquire(FakeConnection), FakeConnection)
+
+
+@pytest.mark.django_db
+class TestPooledBackend:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.wrappers = []
+        yield
+        for wrapper in self.wrappers:
+            wrapper.close()
+        close_pools()
+        extensions.set_wait_callback(None)
+
+    def pooled_connection(self, size=2):
+        wrapper = connection.copy()
+        wrapper.settings_dict["POOL_SIZE"] = size
+        self.wrappers.append(wrapper)
+        return wrapper
+
+    def test_closing_returns_the_connection_to_the_pool(self):
+        wrapper = self.pooled_connection()
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close()
+        assert not raw.closed
+
+        wrapper.ensure_connection()
+        assert wrapper.connection is raw
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            assert cursor.fetchone() == (1,)
+
+    def test_concurrent_slow_queries_overlap_under_gevent(self):
+        make_psycopg2_green()
+        assert is_psycopg2_green()
+
+        def slow_query():
+            wrapper = self.pooled_connection(size=4)
+            with wrapper.cursor() as cursor:
+                cursor.execute("SELECT pg_sleep(0.3)")
+            wrapper.close()
+
+        started = time.perf_counter()
+        gevent.joinall([gevent.spawn(slow_query) for _ in range(4)], raise_error=True)
+        assert time.perf_counter() - started < 0.9
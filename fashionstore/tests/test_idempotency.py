@@ -0,0 +1,168 @@
+import threading
+from datetime import timedelta
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from cart.models import Cart, CartItem
+from common.idempotency import purge_idempotency_keys
+from common.models import IdempotencyKey
+from orders.models import Orders
+from products.models import Products
+from users.models import Users
+
+
+def make_product(stock=10):
+    return Products.objects.create(
+        name="Shirt",
+        description="A shirt",
+        price=10.00,
+        stock=stock,
+        is_published=True,
+    )
+
+
+@pytest.mark.django_db
+class TestIdempotencyKeys:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.user = Users.objects.create_user(
+            first_name="some", email="some-email", password="some-password123"
+        )
+        self.product = make_product()
+        self.client.force_authenticate(user=self.user)
+
+    def add(self, key, quantity=2):
+        return self.client.post(
+            reverse("cart-add", args=[self.product.id]),
+            {"quantity": quantity},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_replays_without_running_again(self, django_assert_num_queries):
+        first = self.add("add-1")
+        assert first.status_code == status.HTTP_200_OK
+
+        # A replay only reads the stored response
+        with django_assert_num_queries(1):
+            retry = self.add("add-1")
+        assert retry.status_code == status.HTTP_200_OK
+        assert retry.data == first.data
+        assert retry["Idempotent-Replayed"] == "true"
+        self.product.refresh_from_db()
+        assert self.product.stock == 8
+        assert CartItem.objects.get().quantity == 2
+
+    def test_new_key_runs_again(self):
+        self.add("add-1")
+        self.add("add-2")
+        self.product.refresh_from_db()
+        assert self.product.stock == 6
+
+    def test_requests_without_a_key_are_not_stored(self):
+        self.add("")
+        self.add("")
+        self.product.refresh_from_db()
+        assert self.product.stock == 6
+        assert not IdempotencyKey.objects.exists()
+
+    def test_error_responses_are_replayed(self):
+        assert self.add("add-1", quantity=50).status_code == 400
+        self.product.stock = 100
+        self.product.save()
+        retry = self.add("add-1", quantity=50)
+        assert retry.status_code == status.HTTP_400_BAD_REQUEST
+        assert retry.data["error"] == "Not enough stock available."
+
+    def test_database_errors_caught_by_the_view_are_stored(self, monkeypatch):
+        def get_product(product_id):
+            # A failed write breaks the transaction the key is stored in
+            return Products.objects.create(id=product_id, name="Copy", price=10.00)
+
+        monkeypatch.setattr("cart.views.get_product_by_id", get_product)
+        response = self.add("add-1")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert IdempotencyKey.objects.get().status_code == 400
+        assert self.add("add-1")["Idempotent-Replayed"] == "true"
+
+    def test_key_reused_for_another_request_is_refused(self):
+        self.add("add-1", quantity=2)
+        response = self.add("add-1", quantity=3)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_keys_belong_to_one_user(self):
+        self.add("add-1")
+        other = Users.objects.create_user(
+            first_name="other", email="other-email", password="other-password123"
+        )
+        self.client.force_authenticate(user=other)
+        assert "Idempotent-Replayed" not in self.add("add-1")
+        self.product.refresh_from_db()
+        assert self.product.stock == 6
+
+    def test_expired_key_runs_again(self):
+        self.add("add-1")
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        assert "Idempotent-Replayed" not in self.add("add-1")
+        self.product.refresh_from_db()
+        assert self.product.stock == 6
+        assert IdempotencyKey.objects.count() == 1
+
+    def test_purge_deletes_expired_keys(self, capsys):
+        self.add("add-1")
+        self.add("add-2")
+        IdempotencyKey.objects.filter(key="add-1").update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        assert purge_idempotency_keys(batch_size=1) == 1
+        assert list(IdempotencyKey.objects.values_list("key", flat=True)) == ["add-2"]
+
+        IdempotencyKey.objects.update(expires_at=timezone.now())
+        call_command("purge_idempotency_keys")
+        assert "1 expired idempotency keys deleted" in capsys.readouterr().out
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentIdempotencyKeys:
+    def test_concurrent_checkouts_create_one_order(self):
+        user = Users.objects.create_user(
+            first_name="some", email="some-email", password="some-password123"
+        )
+        product = make_product()
+        CartItem.objects.create(
+            cart=Cart.objects.create(user=user),
+            product=product,
+            price=product.price,
+            quantity=1,
+        )
+
+        responses = []
+        barrier = threading.Barrier(4)
+
+        def checkout():
+            client = APIClient()
+            client.force_authenticate(user=user)
+            try:
+                barrier.wait()
+                responses.append(
+                    client.post(
+                        reverse("orders-create"), HTTP_IDEMPOTENCY_KEY="checkout-1"
+                    )
+                )
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=checkout) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [response.status_code for response in responses] == [201] * 4
+        assert sum("Idempotent-Replayed" in response for response in responses) == 3
+        assert Orders.objects.count() == 1
@@ -0,0 +1,89 @@
+import pytest
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework.test import APIClient
+from users.models import Users
+from products.models import Products
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+class TestMetrics:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.user = Users.objects.create_user(
+            first_name="some",
+            last_name="testuser",
+            email="some-email",
+            password="some-password123",
+        )
+        self.admin_user = Users.objects.create_admin_user(
+            first_name="some",
+            last_name="adminuser",
+            email="some-admin-email",
+            password="some-admin-password123",
+        )
+        self.url = reverse("metrics")
+
+    def test_non_admin_cannot_read_metrics(self):
+        response = self.client.get(self.url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_requests_are_recorded_by_url_name(self):
+        Products.objects.create(
+            name="Test Product",
+            description="Test Product Description",
+            price=100.00,
+            stock=10,
+            is_published=True,
+        )
+        requests = sample(
+            "http_requests_total", method="GET", view="products-list", status="200"
+        )
+        queries = sample("http_request_db_queries_sum", view="products-list")
+        latency = sample(
+            "http_request_duration_seconds_count", method="GET", view="products-list"
+        )
+
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(reverse("products-list"))
+        assert response.status_code == status.HTTP_200_OK
+
+        assert (
+            sample(
+                "http_requests_total",
+                method="GET",
+                view="products-list",
+                status="200",
+            )
+            == requests + 1
+        )
+        assert sample("http_request_db_queries_sum", view="products-list") > queries
+        assert (
+            sample(
+                "http_request_duration_seconds_count",
+                method="GET",
+                view="products-list",
+            )
+            == latency + 1
+        )
+        assert sample("http_requests_in_flight", method="GET") == 0
+
+    def test_admin_can_read_metrics(self):
+        self.client.get("/no-such-page")
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain")
+        body = response.content.decode()
+        assert "# TYPE http_request_duration_seconds histogram" in body
+        assert 'view="<unresolved>"' in body
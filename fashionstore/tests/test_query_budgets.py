@@ -0,0 +1,372 @@
+"""
+Query budgets for every endpoint in `fashionstore.urls`.
+
+Each endpoint is called against seeded data at two sizes. Its query count
+must be the same at both sizes, or stay within the budget declared for it,
+so a change that adds queries per row fails here with the SQL that grew.
+"""
+
+import re
+import uuid
+from collections import Counter
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework.test import APIClient
+from users.authentication import UserRefreshToken, active_users
+from users.blacklist import blacklisted_tokens
+from users.models import Users
+from products.models import Products
+from cart.models import Cart, CartItem
+from orders.models import Orders, OrderItem
+
+SIZES = (10, 1000)
+MAX_PAGE_SIZE = 100
+
+# URL namespaces that are not part of the API
+SKIPPED_NAMESPACES = {"admin"}
+
+PASSWORD = "some-password123"
+
+IMPORT_BODY = (
+    "name,description,price,stock,is_published\n"
+    "Linen Shirt,A light linen shirt,45.00,12,true\n"
+    "Wool Coat,A warm coat,180.50,4,true\n"
+)
+
+
+class Endpoint:
+    """
+    How to call one URL and what its query count may be.
+
+    `kwargs` and `data` are callables that receive the test context, so
+    endpoints that change data can create a fresh target for each call.
+    Without a `budget` the query count must not change with the data size.
+    """
+
+    def __init__(
+        self,
+        method="get",
+        user="user",
+        kwargs=None,
+        data=None,
+        headers=None,
+        content_type=None,
+        status=200,
+        budget=None,
+    ):
+        self.method = method
+        self.user = user
+        self.kwargs = kwargs
+        self.data = data
+        self.headers = headers
+        self.content_type = content_type
+        self.status = status
+        self.budget = budget
+
+
+def new_product(context):
+    return {"product_id": Products.objects.create(**product_fields()).id}
+
+
+def new_email(context):
+    return f"budget-{uuid.uuid4().hex}@example.com"
+
+
+def product_fields(**fields):
+    return {
+        "name": "Budget Product",
+        "description": "A product for query budgets",
+        "price": 25.00,
+        "stock": 100,
+        "is_published": True,
+        **fields,
+    }
+
+
+def cart_line(context):
+    product = Products.objects.create(**product_fields())
+    CartItem.objects.create(
+        cart=context.cart, product=product, price=product.price, quantity=1
+    )
+    return {"product_id": product.id}
+
+
+def refresh_header(context):
+    refresh = UserRefreshToken.for_user(context.user)
+    return {"Refresh-Authorization": f"Bearer {refresh}"}
+
+
+ENDPOINTS = {
+    "welcome": Endpoint(user=None),
+    "metrics": Endpoint(user="admin"),
+    # Auth
+    "auth-login": Endpoint(
+        method="post",
+        user=None,
+        data=lambda context: {"email": context.user.email, "password": PASSWORD},
+    ),
+    "auth-create-user": Endpoint(
+        method="post",
+        user=None,
+        data=lambda context: {
+            "first_name": "new",
+            "email": new_email(context),
+            "password": PASSWORD,
+        },
+        status=201,
+    ),
+    "auth-create-admin": Endpoint(
+        method="post",
+        user="superuser",
+        data=lambda context: {
+            "first_name": "new",
+            "email": new_email(context),
+            "password": PASSWORD,
+        },
+        status=201,
+    ),
+    "auth-logout": Endpoint(method="post", headers=refresh_header, status=205),
+    "auth-refresh-token": Endpoint(method="post", user=None, headers=refresh_header),
+    "auth-change-password": Endpoint(
+        method="post",
+        user=None,
+        data=lambda context: {
+            "email": context.user.email,
+            "old-password": PASSWORD,
+            "new-password": PASSWORD,
+        },
+    ),
+    # Users
+    "users-list": Endpoint(user="admin"),
+    "user-detail": Endpoint(kwargs=lambda context: {"user_id": context.user.id}),
+    "update-user": Endpoint(
+        method="put",
+        kwargs=lambda context: {"user_id": context.user.id},
+        data=lambda context: {"first_name": "updated"},
+    ),
+    "delete-user": Endpoint(
+        method="delete",
+        user="admin",
+        kwargs=lambda context: {
+            "user_id": Users.objects.create_user(
+                first_name="doomed", email=new_email(context), password=PASSWORD
+            ).id
+        },
+        status=204,
+    ),
+    # Products
+    "products-list": Endpoint(user="admin"),
+    "products-active": Endpoint(),
+    "products-export": Endpoint(user="admin"),
+    "products-search": Endpoint(data=lambda context: {"q": "budget"}),
+    "products-create": Endpoint(
+        method="post",
+        user="admin",
+        data=lambda context: {**product_fields(), "price": "25.00"},
+        status=201,
+    ),
+    "products-import": Endpoint(
+        method="post",
+        user="admin",
+        data=lambda context: IMPORT_BODY,
+        content_type="text/csv",
+    ),
+    "product-detail": Endpoint(
+        kwargs=lambda context: {"product_id": context.product.id}
+    ),
+    "product-status": Endpoint(
+        method="patch",
+        user="admin",
+        kwargs=new_product,
+        status=202,
+    ),
+    "update-product": Endpoint(
+        method="put",
+        user="admin",
+        kwargs=lambda context: {"product_id": context.product.id},
+        data=lambda context: {**product_fields(), "price": "25.00", "stock": 50},
+    ),
+    "delete-product": Endpoint(
+        method="delete", user="admin", kwargs=new_product, status=204
+    ),
+    # Cart
+    "cart-list": Endpoint(),
+    "cart-summary": Endpoint(),
+    "cart-item-detail": Endpoint(
+        kwargs=lambda context: {"cart_item_id": context.cart_item.id}
+    ),
+    "cart-add": Endpoint(
+        method="post",
+        kwargs=new_product,
+        data=lambda context: {"quantity": 1},
+    ),
+    "cart-remove": Endpoint(method="delete", kwargs=cart_line),
+    # Orders
+    "orders-list": Endpoint(user="admin"),
+    "orders-user": Endpoint(kwargs=lambda context: {"user_id": context.user.id}),
+    "orders-all": Endpoint(kwargs=lambda context: {"user_id": context.user.id}),
+    "orders-export": Endpoint(user="admin"),
+    "orders-create": Endpoint(method="post", status=201),
+    "order-detail": Endpoint(kwargs=lambda context: {"order_id": context.order.id}),
+    "order-item-detail": Endpoint(
+        kwargs=lambda context: {"order_item_id": context.order_item.id}
+    ),
+}
+
+
+def url_names(patterns=None, namespace=None):
+    """
+    Yield the name of every URL pattern reachable from the root URLconf.
+    """
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace in SKIPPED_NAMESPACES:
+                continue
+            yield from url_names(pattern.url_patterns, pattern.namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield f"{namespace}:{pattern.name}" if namespace else pattern.name
+
+
+def normalize(sql):
+    """
+    Replace the literals in a statement so repeated queries group together.
+    """
+    sql = re.sub(r"'(?:[^']|'')*'(::\w+)?", "?", sql)
+    sql = re.sub(r"\b\d+(\.\d+)?\b", "?", sql)
+    # IN lists grow with the page, not with the number of statements
+    return re.sub(r"\(\?(, \?)*\)", "(...)", sql)
+
+
+def budget_report(name, counts, captured):
+    """
+    Describe a budget failure, listing the statements that grew with the
+    data first.
+    """
+    small, large = (
+        Counter(normalize(query["sql"]) for query in queries) for queries in captured
+    )
+    lines = [
+        f"{name} ran {counts[0]} queries at {SIZES[0]} rows and {counts[1]} at {SIZES[1]} rows"
+    ]
+    for sql, count in large.most_common():
+        grew = " (grew)" if count > small.get(sql, 0) else ""
+        lines.append(f"  {count} x{grew} {sql}")
+    return "\n".join(lines)
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.user = Users.objects.create_user(
+            first_name="some", email="budget-user@example.com", password=PASSWORD
+        )
+        self.users = {
+            None: None,
+            "user": self.user,
+            "admin": Users.objects.create_admin_user(
+                first_name="some", email="budget-admin@example.com", password=PASSWORD
+            ),
+            "superuser": Users.objects.create_super_user(
+                first_name="some",
+                email="budget-superuser@example.com",
+                password=PASSWORD,
+            ),
+        }
+        self.product = Products.objects.create(**product_fields())
+        self.cart = Cart.objects.create(user=self.user)
+        self.cart_item = CartItem.objects.create(
+            cart=self.cart, product=self.product, price=25.00, quantity=1
+        )
+        self.order = Orders.objects.create(user=self.user, total=25.00)
+        self.order_item = OrderItem.objects.create(
+            order=self.order, product=self.product, price=25.00, quantity=1
+        )
+        self.seeded = 0
+
+    def seed(self, size):
+        """
+        Grow the users, products, orders and the user's cart to `size` rows.
+        """
+        count = size - self.seeded
+        self.seeded = size
+        Users.objects.bulk_create(
+            [
+                Users(
+                    first_name="seeded", email=f"seeded-{uuid.uuid4().hex}@example.com"
+                )
+                for _ in range(count)
+            ]
+        )
+        products = Products.objects.bulk_create(
+            [
+                Products(**product_fields(name=f"Seeded {index}"))
+                for index in range(count)
+            ]
+        )
+        CartItem.objects.bulk_create(
+            [
+                CartItem(cart=self.cart, product=product, price=25.00, quantity=1)
+                for product in products
+            ]
+        )
+        orders = Orders.objects.bulk_create(
+            [Orders(user=self.user, total=25.00) for _ in range(count)]
+        )
+        OrderItem.objects.bulk_create(
+            [
+                OrderItem(order=order, product=product, price=25.00, quantity=1)
+                for order, product in zip(orders, products)
+            ]
+        )
+
+    def call(self, name, endpoint):
+        kwargs = endpoint.kwargs(self) if endpoint.kwargs else None
+        data = endpoint.data(self) if endpoint.data else None
+        if endpoint.method == "get":
+            # Ask for the largest page, so a page holds more rows at the
+            # larger size and per row queries show up in paginated lists
+            data = {"page_size": MAX_PAGE_SIZE, **(data or {})}
+        headers = endpoint.headers(self) if endpoint.headers else {}
+        self.client.force_authenticate(user=self.users[endpoint.user])
+        for cache in caches.all():
+            cache.clear()
+        active_users.clear()
+        blacklisted_tokens.clear()
+
+        request = getattr(self.client, endpoint.method)
+        options = {"format": "json"}
+        if endpoint.content_type:
+            options = {"content_type": endpoint.content_type}
+        with CaptureQueriesContext(connection) as context:
+            response = request(
+                reverse(name, kwargs=kwargs), data, **options, headers=headers
+            )
+            if response.streaming:
+                b"".join(response.streaming_content)
+
+        assert response.status_code == endpoint.status, (name, response.content)
+        return context.captured_queries
+
+    def test_every_url_declares_a_budget(self):
+        assert sorted(set(url_names()) - set(ENDPOINTS)) == []
+
+    @pytest.mark.parametrize("name", sorted(ENDPOINTS))
+    def test_query_budget(self, name):
+        endpoint = ENDPOINTS[name]
+        captured = []
+        for size in SIZES:
+            self.seed(size)
+            captured.append(self.call(name, endpoint))
+        counts = [len(queries) for queries in captured]
+
+        if endpoint.budget is None:
+            assert counts[0] == counts[1], budget_report(name, counts, captured)
+        else:
+            assert max(counts) <= endpoint.budget, budget_report(name, counts, captured)
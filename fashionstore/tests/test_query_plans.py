@@ -0,0 +1,84 @@
+"""
+Query plans of the listing endpoints.
+
+Each endpoint is called and the query that reads its page is run again
+under EXPLAIN. The plan must walk the expected index in the requested order,
+so a change to a query or an index that brings back a sort fails here.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from orders.models import Orders
+from products.models import Products
+from users.models import Users
+
+# URL name, URL kwargs, table read by the page query, index it must use
+PLANS = [
+    ("products-active", None, "products_products", "products_published_created_idx"),
+    ("products-list", None, "products_products", "products_created_at_id_idx"),
+    ("orders-list", None, "orders_orders", "orders_created_at_id_idx"),
+    ("orders-user", "user", "orders_orders", "orders_user_created_at_id_idx"),
+    ("users-list", None, "users_users", "users_created_at_id_idx"),
+]
+
+
+def page_query(queries, table):
+    """
+    Return the SQL of the ordered query reading `table`.
+    """
+    for query in queries:
+        sql = query["sql"]
+        if sql.startswith("SELECT") and f'FROM "{table}"' in sql and "ORDER BY" in sql:
+            return sql
+    raise AssertionError(f"No ordered query on {table}")
+
+
+@pytest.mark.django_db
+class TestQueryPlans:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.admin_user = Users.objects.create_admin_user(
+            first_name="Admin", email="admin@example.com", password="admin-password123"
+        )
+        for index in range(3):
+            Products.objects.create(
+                name=f"Shirt {index}",
+                description="A shirt",
+                price=10,
+                stock=1,
+                is_published=index % 2 == 0,
+            )
+            Orders.objects.create(user=self.admin_user, total=10)
+        # Another customer with many orders, so filtering by user is selective
+        customer = Users.objects.create_user(
+            first_name="Customer", email="customer@example.com", password="password123"
+        )
+        Orders.objects.bulk_create(
+            [Orders(user=customer, total=10) for _ in range(200)]
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    @pytest.mark.parametrize("name, kwargs, table, index", PLANS)
+    def test_listing_reads_its_index_in_order(self, name, kwargs, table, index):
+        kwargs = {"user_id": self.admin_user.id} if kwargs == "user" else None
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse(name, kwargs=kwargs))
+        assert response.status_code == 200, response.data
+
+        with connection.cursor() as cursor:
+            # Plan with statistics of the rows made by this test
+            cursor.execute(f'ANALYZE "{table}"')
+            # The tables are tiny, make the planner show the plan it would
+            # pick for large ones. Disabled nodes are still used when there
+            # is no alternative, so a missing index shows up as a Sort
+            for node in ("seqscan", "bitmapscan", "sort"):
+                cursor.execute(f"SET LOCAL enable_{node} = off")
+            cursor.execute(f"EXPLAIN {page_query(context.captured_queries, table)}")
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+
+        assert f"Index Scan Backward using {index}" in plan, plan
+        assert "Sort" not in plan, plan
@@ -0,0 +1,46 @@
+import time
+import uuid
+import pytest
+from common.utils.uuids import uuid7
+from products.models import Products
+from users.models import Users
+
+
+class TestUUID7:
+    def test_layout(self):
+        value = uuid7()
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+        timestamp_ms = value.int >> 80
+        assert abs(timestamp_ms - time.time() * 1000) < 1000
+
+    def test_values_are_strictly_increasing(self):
+        values = [uuid7() for _ in range(20000)]
+        assert values == sorted(values)
+        assert len(set(values)) == len(values)
+
+    def test_counter_overflow_borrows_the_next_millisecond(self, monkeypatch):
+        monkeypatch.setattr(time, "time_ns", lambda: 1_700_000_000_000_000_000)
+        values = [uuid7() for _ in range(5000)]
+        assert values == sorted(values)
+        assert values[-1].int >> 80 > values[0].int >> 80
+
+
+@pytest.mark.django_db
+class TestUUID7Model:
+    def test_models_choose_their_key_generator(self):
+        product = Products.objects.create(
+            name="Shirt", description="A shirt", price=10, stock=1
+        )
+        user = Users.objects.create_user(
+            first_name="some", email="some-email", password="some-password123"
+        )
+        assert product.id.version == 7
+        assert user.id.version == 4
+
+    def test_existing_uuid4_keys_stay_valid(self):
+        legacy_id = uuid.uuid4()
+        Products.objects.create(
+            id=legacy_id, name="Shirt", description="A shirt", price=10, stock=1
+        )
+        assert Products.objects.get(id=legacy_id).id == legacy_id
@@ -17,11 +17,12 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path, include
-from .views import welcome
+from .views import metrics, welcome
 from error_handler import views
 
 urlpatterns = [
     path("", welcome, name="welcome"),
+    path("metrics", metrics, name="metrics"),
     path("admin/", admin.site.urls),
     path("api/auth/", include("auth.urls")),
     path("api/users/", include("users.urls")),
@@ -1,7 +1,10 @@
 import logging
+from django.http import HttpResponse
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
+from common.metrics import render_metrics
 
 # Getting the logger
 logger = logging.getLogger("django")
@@ -20,3 +23,18 @@ def welcome(request):
     except Exception as e:
         logger.error(str(e))
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def metrics(request):
+    """
+    A view that returns the request metrics of all workers in the
+    Prometheus text format.
+    """
+    try:
+        body, content_type = render_metrics()
+        return HttpResponse(body, content_type=content_type)
+    except Exception as e:
+        logger.error(str(e))
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
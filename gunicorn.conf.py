@@ -0,0 +1,55 @@
+"""
+Gunicorn settings, loaded automatically from the working directory.
+
+Request metrics are written to PROMETHEUS_MULTIPROC_DIR by every worker so
+that /metrics reports the totals of all of them. Under the gevent worker
+class psycopg2 is made cooperative and connections come from a bounded pool.
+Every worker schedules the purges of expired tokens and idempotency keys and
+the release of expired cart reservations, each of which one worker runs at a
+time.
+"""
+
+import os
+import shutil
+
+# Must be set before the workers import prometheus_client
+if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = "/tmp/fashionstore-metrics"
+
+# Each worker keeps a bounded pool of database connections, which its
+# greenlets share under the gevent worker class
+if not os.environ.get("DATABASE_POOL_SIZE"):
+    os.environ["DATABASE_POOL_SIZE"] = "20"
+
+
+def on_starting(server):
+    # Start from empty metrics, the files of a previous run are stale
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    # Drop the live gauges of a worker that has exited
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_worker_init(worker):
+    # gevent workers have patched the standard library by now, psycopg2
+    # needs its own hook to wait for queries through the gevent hub
+    if "gevent" in worker.cfg.worker_class_str:
+        from common.db.green import make_psycopg2_green
+
+        make_psycopg2_green()
+
+    # Purge expired tokens and idempotency keys and release expired cart
+    # reservations in the background, one worker at a time
+    from cart.reservations import schedule_reservation_reaper
+    from common.idempotency import schedule_idempotency_key_purge
+    from users.blacklist import schedule_token_purge
+
+    schedule_token_purge()
+    schedule_reservation_reaper()
+    schedule_idempotency_key_purge()
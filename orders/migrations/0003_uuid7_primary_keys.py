@@ -0,0 +1,33 @@
+# Generated by Django 4.2.19 on 2026-10-18 04:20
+
+import common.utils.uuids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("orders", "0002_orderitem_price"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="orderitem",
+            name="id",
+            field=models.UUIDField(
+                default=common.utils.uuids.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="orders",
+            name="id",
+            field=models.UUIDField(
+                default=common.utils.uuids.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.19 on 2026-10-18 04:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("orders", "0003_uuid7_primary_keys"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="orders",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="orders",
+            index=models.Index(
+                fields=["user", "created_at", "id"],
+                name="orders_user_created_at_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="orders",
+            index=models.Index(
+                fields=["created_at", "id"], name="orders_created_at_id_idx"
+            ),
+        ),
+    ]
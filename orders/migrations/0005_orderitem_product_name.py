@@ -0,0 +1,57 @@
+from django.db import migrations, models
+
+BATCH_SIZE = 5000
+
+
+def backfill_product_names(apps, schema_editor, batch_size=BATCH_SIZE):
+    """
+    Copy the current product names onto the existing order items, walking
+    them in primary key order in batches that each commit on their own.
+    """
+    OrderItem = apps.get_model("orders", "OrderItem")
+    Products = apps.get_model("products", "Products")
+    quote_name = schema_editor.connection.ops.quote_name
+    items = quote_name(OrderItem._meta.db_table)
+    products = quote_name(Products._meta.db_table)
+
+    last_id = None
+    while True:
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH batch AS (
+                    SELECT id FROM {items}
+                    WHERE %(last_id)s::uuid IS NULL OR id > %(last_id)s::uuid
+                    ORDER BY id
+                    LIMIT %(batch_size)s
+                ), updated AS (
+                    UPDATE {items} item
+                    SET product_name = product.name
+                    FROM batch, {products} product
+                    WHERE item.id = batch.id AND product.id = item.product_id
+                )
+                SELECT MAX(id::text)::uuid, COUNT(*) FROM batch
+                """,
+                {"last_id": last_id, "batch_size": batch_size},
+            )
+            last_id, count = cursor.fetchone()
+        if count < batch_size:
+            break
+
+
+class Migration(migrations.Migration):
+    # Each backfill batch is its own transaction
+    atomic = False
+
+    dependencies = [
+        ("orders", "0004_query_pattern_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="orderitem",
+            name="product_name",
+            field=models.CharField(default="", max_length=100),
+        ),
+        migrations.RunPython(backfill_product_names, migrations.RunPython.noop),
+    ]
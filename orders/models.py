@@ -1,41 +1,58 @@
 from django.db import models
 from decimal import Decimal
-from common.models import UUIDModel
+from common.models import LineItemsQuerySet, UUID7Model, line_total
 
 
-class Orders(UUIDModel):
+class OrdersQuerySet(LineItemsQuerySet):
+    line_item_prefix = "orderitem__"
+
+
+class Orders(UUID7Model):
     """
     A model that represents an order in the system
     """
 
-    user = models.ForeignKey("users.Users", on_delete=models.CASCADE)
+    # Indexed by orders_user_created_at_id_idx, which leads with the user
+    user = models.ForeignKey("users.Users", on_delete=models.CASCADE, db_index=False)
     total = models.DecimalField(max_digits=10, decimal_places=2)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OrdersQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # A user's orders newest first, without sorting them
+            models.Index(
+                fields=["user", "created_at", "id"],
+                name="orders_user_created_at_id_idx",
+            ),
+            # Every order newest first, and the exports oldest first
+            models.Index(fields=["created_at", "id"], name="orders_created_at_id_idx"),
+        ]
+
     @property
     def get_total(self):
         """
         Calculate the total price of all items in the order
         """
-        total = Decimal("0.00")
-
-        for item in self.orderitem_set.all():
-            total += item.price * item.quantity
-
+        total = self.orderitem_set.aggregate(total=line_total())["total"]
         return total.quantize(Decimal("0.00"))
 
     def __str__(self):
         return f"Order: {self.user}"
 
 
-class OrderItem(UUIDModel):
+class OrderItem(UUID7Model):
     """
     A model that represents an order item in the system
     """
 
     order = models.ForeignKey(Orders, on_delete=models.CASCADE)
     product = models.ForeignKey("products.Products", on_delete=models.CASCADE)
+    # Copied from the product at checkout, so order history is read without
+    # joining the products and keeps the name the customer saw
+    product_name = models.CharField(max_length=100, default="")
     quantity = models.PositiveIntegerField(default=0)
     price = models.DecimalField(
         max_digits=10, decimal_places=2, default=Decimal("0.00")
@@ -1,13 +1,15 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
+from common.utils.prefetch import PrefetchSerializerMixin
 from .models import Orders, OrderItem
 
 
-class OrderItemSerializer(serializers.ModelSerializer):
+class OrderItemSerializer(PrefetchSerializerMixin, serializers.ModelSerializer):
     """
-    A serializer class for the OrderItem model.
+    A serializer class for the OrderItem model. Every field is read from
+    the order item itself.
     """
 
-    product_name = serializers.CharField(source="product.name")
     product_price = serializers.DecimalField(
         source="price", max_digits=10, decimal_places=2
     )
@@ -18,11 +20,18 @@ class OrderItemSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(PrefetchSerializerMixin, serializers.ModelSerializer):
     """
     A serializer class for the Orders model, including the OrderItemSerializer.
     """
 
+    prefetch_related_fields = [
+        Prefetch(
+            "orderitem_set",
+            queryset=OrderItemSerializer.setup_eager_loading(OrderItem.objects.all()),
+        )
+    ]
+
     order_items = OrderItemSerializer(source="orderitem_set", many=True)
 
     class Meta:
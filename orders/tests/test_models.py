@@ -1,4 +1,5 @@
 import pytest
+from decimal import Decimal
 from cart.models import Cart, CartItem
 from users.models import Users
 from products.models import Products
@@ -49,3 +50,14 @@ class TestOrderModel:
         assert order_item.product == self.product
         assert order_item.price == 100.00
         assert order_item.quantity == 25
+
+    def test_order_totals_are_computed_in_the_database(self):
+        order = Orders.objects.create(user=self.user1, total=0)
+        OrderItem.objects.create(
+            order=order, product=self.product, price="12.50", quantity=4
+        )
+        assert order.get_total == Decimal("50.00")
+
+        annotated = Orders.objects.with_totals().get(id=order.id)
+        assert annotated.items_total == Decimal("50.00")
+        assert annotated.items_count == 4
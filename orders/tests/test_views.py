@@ -1,4 +1,10 @@
+import importlib
+import json
+from types import SimpleNamespace
 import pytest
+from django.apps import apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -6,6 +12,7 @@ from users.models import Users
 from products.models import Products
 from cart.models import Cart, CartItem
 from orders.models import Orders, OrderItem
+from orders.serializers import OrderSerializer
 
 
 @pytest.mark.django_db
@@ -54,6 +61,7 @@ class TestOrderViews:
         self.order_item = OrderItem.objects.create(
             order=self.order,
             product=self.product,
+            product_name=self.product.name,
             price=100.00,
             quantity=5,
         )
@@ -207,3 +215,252 @@ class TestOrderViews:
 
         # check if the order items are created
         assert OrderItem.objects.filter(order__user=self.user2).count() == 2
+
+        # check that the order total matches its items and the cart is reset
+        order = Orders.objects.get(user=self.user2)
+        assert order.total == order.get_total
+        cart.refresh_from_db()
+        assert cart.total == 0
+        assert cart.item_count == 0
+
+    def test_create_order_runs_a_constant_number_of_queries(self):
+        url = reverse("orders-create")
+        self.client.force_authenticate(user=self.user2)
+        cart = Cart.objects.create(user=self.user2)
+        products = Products.objects.bulk_create(
+            [
+                Products(name=f"Product {index}", description="", price=10, stock=10)
+                for index in range(25)
+            ]
+        )
+
+        query_counts = []
+        for size in [1, 25]:
+            CartItem.objects.bulk_create(
+                [
+                    CartItem(cart=cart, product=product, price=10, quantity=2)
+                    for product in products[:size]
+                ]
+            )
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(url, {}, format="json")
+            assert response.status_code == status.HTTP_201_CREATED
+            query_counts.append(len(context.captured_queries))
+
+        assert query_counts[0] == query_counts[1]
+        order = Orders.objects.filter(user=self.user2).latest("created_at")
+        assert order.orderitem_set.count() == 25
+        assert order.total == 500
+        assert not CartItem.objects.filter(cart=cart).exists()
+
+    def test_order_lists_do_not_query_per_order(self):
+        products = Products.objects.bulk_create(
+            [
+                Products(name=f"Product {index}", description="", price=10, stock=10)
+                for index in range(3)
+            ]
+        )
+
+        def add_orders(count):
+            orders = Orders.objects.bulk_create(
+                [Orders(user=self.user, total=30) for _ in range(count)]
+            )
+            OrderItem.objects.bulk_create(
+                [
+                    OrderItem(order=order, product=product, price=10, quantity=1)
+                    for order in orders
+                    for product in products
+                ]
+            )
+
+        self.client.force_authenticate(user=self.admin_user)
+        query_counts = []
+        for count in [2, 20]:
+            add_orders(count)
+            for url in [
+                reverse("orders-list"),
+                reverse("orders-user", args=[self.user.id]),
+            ]:
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.get(url)
+                assert response.status_code == status.HTTP_200_OK
+                query_counts.append(len(context.captured_queries))
+
+        assert query_counts[:2] == query_counts[2:]
+
+    def test_order_serializer_prefetches_when_the_view_does_not(
+        self, django_assert_num_queries
+    ):
+        orders = list(Orders.objects.all())
+        # One query for the order items
+        with django_assert_num_queries(1):
+            data = OrderSerializer(orders, many=True).data
+        assert data[0]["order_items"][0]["product_name"] == "Test Product"
+
+        order = Orders.objects.get(id=self.order.id)
+        with django_assert_num_queries(1):
+            OrderSerializer(order).data
+
+    def test_order_history_keeps_the_name_at_checkout(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse("orders-create"), {}, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        Products.objects.filter(id=self.product.id).update(name="Renamed Product")
+
+        self.client.force_authenticate(user=self.admin_user)
+        for url in [
+            reverse("orders-list"),
+            reverse("orders-user", args=[self.user.id]),
+        ]:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            names = {
+                item["product_name"]
+                for order in response.data["results"]
+                for item in order["order_items"]
+            }
+            assert names == {"Test Product"}
+            # Served from the orders and order items alone
+            for query in context.captured_queries:
+                assert "products_products" not in query["sql"]
+
+    def test_backfill_copies_product_names(self):
+        migration = importlib.import_module(
+            "orders.migrations.0005_orderitem_product_name"
+        )
+        for _ in range(4):
+            OrderItem.objects.create(order=self.order, product=self.product2)
+
+        migration.backfill_product_names(
+            apps, SimpleNamespace(connection=connection), batch_size=2
+        )
+        assert set(OrderItem.objects.values_list("product_name", flat=True)) == {
+            "Test Product",
+            "Test Product 2",
+        }
+
+    def test_order_detail_supports_conditional_get(self):
+        url = reverse("order-detail", args=[self.order.id])
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response.headers["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        # Users who may not see the order never get a validator match
+        self.client.force_authenticate(user=self.user2)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_user_orders_support_conditional_get(self):
+        url = reverse("orders-user", args=[self.user.id])
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url)
+        etag = response.headers["ETag"]
+        last_modified = response.headers["Last-Modified"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        Orders.objects.create(user=self.user, total=100.00)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 2
+
+    def test_non_admin_cannot_export_orders(self):
+        url = reverse("orders-export")
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_admin_can_export_orders(self):
+        url = reverse("orders-export")
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(url, {"output": "ndjson"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert len(lines) == 1
+        order = json.loads(lines[0])
+        assert order["id"] == str(self.order.id)
+        assert order["user_id"] == str(self.user.id)
+        assert order["total"] == "200.00"
+
+        response = self.client.get(url, {"output": "xml"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestOrderPagination:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.admin_user = Users.objects.create_admin_user(
+            first_name="some", email="some-admin-email", password="admin-password123"
+        )
+        self.orders = Orders.objects.bulk_create(
+            [Orders(user=self.admin_user, total=10) for _ in range(25)]
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        self.url = reverse("orders-list")
+
+    def test_small_tables_are_counted_exactly(self):
+        response = self.client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+        assert (response.data["count"], response.data["estimated"]) == (25, False)
+
+    def test_large_tables_are_counted_from_statistics(self, settings):
+        settings.PAGINATION_ESTIMATE_MIN_ROWS = 20
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE orders_orders")
+        Orders.objects.bulk_create(
+            [Orders(user=self.admin_user, total=10) for _ in range(5)]
+        )
+
+        # The statistics have not seen the new orders yet
+        response = self.client.get(self.url)
+        assert (response.data["count"], response.data["estimated"]) == (25, True)
+
+    def test_cached_counts_are_reused(self):
+        response = self.client.get(self.url, {"pagination": "cached"})
+        assert response.data["count"] == 25
+        Orders.objects.create(user=self.admin_user, total=10)
+        response = self.client.get(self.url, {"pagination": "cached"})
+        assert response.data["count"] == 25
+
+    def test_pages_without_a_count(self, django_assert_num_queries):
+        with django_assert_num_queries(2):
+            response = self.client.get(
+                self.url, {"pagination": "nocount", "page": 2}, format="json"
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        assert len(response.data["results"]) == 10
+        assert "page=3" in response.data["next"]
+        assert "page=" not in response.data["previous"]
+
+        response = self.client.get(self.url, {"pagination": "nocount", "page": 3})
+        assert len(response.data["results"]) == 5
+        assert response.data["next"] is None
+
+        response = self.client.get(self.url, {"pagination": "nocount", "page": 0})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_orders_are_walked_with_cursors(self):
+        seen = []
+        url = f"{self.url}?pagination=cursor"
+        while url:
+            response = self.client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            seen.extend(order["id"] for order in response.data["results"])
+            url = response.data["next"]
+        assert seen == [str(order.id) for order in reversed(self.orders)]
+
+    def test_invalid_pagination_mode_is_rejected(self):
+        response = self.client.get(self.url, {"pagination": "everything"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -3,7 +3,14 @@ URL configuration for the orders app.
 """
 
 from django.urls import path
-from .views import get_all_orders, get_orders, create_order, get_order, get_order_item
+from .views import (
+    get_all_orders,
+    get_orders,
+    create_order,
+    get_order,
+    get_order_item,
+    export_orders,
+)
 
 urlpatterns = [
     path("all", get_all_orders, name="orders-list"),  # GET /api/orders/all
@@ -13,6 +20,7 @@ urlpatterns = [
     path(
         "all/<uuid:user_id>", get_orders, name="orders-all"
     ),  # GET /api/orders/all/<user_id>
+    path("export", export_orders, name="orders-export"),  # GET /api/orders/export
     path("new", create_order, name="orders-create"),  # POST /api/orders/new
     path(
         "<uuid:order_id>", get_order, name="order-detail"
@@ -5,51 +5,91 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.db import transaction
 from cart.models import Cart, CartItem
+from cart.utils import refresh_cart_totals
 from .models import Orders, OrderItem
 from .serializers import OrderSerializer, OrderItemSerializer
-from common.utils.pagination import CustomPageNumberPagination
+from common.idempotency import idempotent
+from common.utils.pagination import get_paginator
+from common.utils.conditional import conditional_queryset
+from common.utils.export import export_response, filter_created_between
 
 
 # Getting the logger
 logger = logging.getLogger("django")
 
 
+def user_orders(request, user_id):
+    """
+    Return the queryset behind a user's order listing, or None when the
+    requesting user may not see it.
+    """
+    if user_id != request.user.id and not request.user.is_staff:
+        return None
+    return Orders.objects.filter(user=user_id)
+
+
+def single_order(request, order_id):
+    """
+    Return the queryset behind a single order, restricted to the orders the
+    requesting user may see.
+    """
+    orders = Orders.objects.filter(id=order_id)
+    if not request.user.is_staff:
+        orders = orders.filter(user=request.user.id)
+    return orders
+
+
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
+@idempotent
 def create_order(request):
     """
     A view that creates an order for the logged-in user.
     """
 
     try:
-        # Get the cart for the user
-        cart = Cart.objects.get(user=request.user)
+        with transaction.atomic():
+            # Lock the cart so that concurrent checkouts of it run one at a time
+            cart = Cart.objects.select_for_update().get(user=request.user)
+
+            # Fetch and lock the cart items with their products in one query
+            cart_items = list(
+                CartItem.objects.select_for_update(of=("self",))
+                .filter(cart=cart)
+                .select_related("product")
+            )
 
-        # Create the order items
-        cart_items = CartItem.objects.filter(cart=cart).all()
+            # check if the cart is empty
+            if not cart_items:
+                logger.error(f"Cart {cart.id} is empty")
+                return Response(
+                    {"error": "Cart is empty"}, status=status.HTTP_400_BAD_REQUEST
+                )
 
-        # check if the cart is empty
-        if not cart_items:
-            logger.error(f"Cart {cart.id} is empty")
-            return Response(
-                {"error": "Cart is empty"}, status=status.HTTP_400_BAD_REQUEST
+            # Create the order, its total comes from the cart items already
+            # fetched above
+            order = Orders.objects.create(
+                user=request.user,
+                total=sum(item.price * item.quantity for item in cart_items),
             )
 
-        with transaction.atomic():
-            # Create the order
-            order = Orders.objects.create(user=request.user, total=cart.get_total)
-            for cart_item in cart_items:
-                product = cart_item.product
-
-                OrderItem.objects.create(
-                    order=order,
-                    product=product,
-                    quantity=cart_item.quantity,
-                    price=cart_item.price,
-                )
+            # Create the order items in a single insert
+            OrderItem.objects.bulk_create(
+                [
+                    OrderItem(
+                        order=order,
+                        product=cart_item.product,
+                        product_name=cart_item.product.name,
+                        quantity=cart_item.quantity,
+                        price=cart_item.price,
+                    )
+                    for cart_item in cart_items
+                ]
+            )
 
-            # Clear the cart items after creating the order successfully
-            cart_items.delete()
+            # Clear the ordered cart items after creating the order successfully
+            CartItem.objects.filter(id__in=[item.id for item in cart_items]).delete()
+            refresh_cart_totals(cart.id)
 
         logger.info("Order created successfully")
         return Response(
@@ -67,12 +107,15 @@ def create_order(request):
 @permission_classes([IsAuthenticated, IsAdminUser])
 def get_all_orders(request):
     """
-    A view that returns a list of all orders created by all users.
+    A view that returns a list of all orders created by all users. The
+    count of the whole table is estimated.
     """
 
     try:
-        paginator = CustomPageNumberPagination()
-        orders = Orders.objects.all().order_by("-created_at")
+        paginator = get_paginator(request, default="estimate")
+        orders = OrderSerializer.setup_eager_loading(
+            Orders.objects.all().order_by("-created_at", "-id")
+        )
         result_page = paginator.paginate_queryset(orders, request)
         serializer = OrderSerializer(result_page, many=True)
         logger.info("All orders returned successfully")
@@ -82,8 +125,31 @@ def get_all_orders(request):
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def export_orders(request):
+    """
+    A view that streams every order as CSV or NDJSON, optionally limited to
+    a creation date range.
+    """
+    try:
+        orders = filter_created_between(Orders.objects.all(), request)
+        response = export_response(
+            orders.order_by("created_at", "id"),
+            ["id", "user_id", "total", "created_at", "updated_at"],
+            request.query_params.get("output", "csv"),
+            "orders",
+        )
+        logger.info(f"Orders export started by user: {request.user.id}")
+        return response
+    except Exception as e:
+        logger.error(str(e))
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@conditional_queryset(user_orders)
 def get_orders(request, user_id):
     """
     A view that returns a list of all orders for a user.
@@ -95,8 +161,10 @@ def get_orders(request, user_id):
                 {"error": "You are not authorized to view these orders"},
                 status=status.HTTP_403_FORBIDDEN,
             )
-        paginator = CustomPageNumberPagination()
-        orders = Orders.objects.filter(user=user_id).order_by("-created_at")
+        paginator = get_paginator(request, default="page")
+        orders = OrderSerializer.setup_eager_loading(
+            Orders.objects.filter(user=user_id).order_by("-created_at", "-id")
+        )
 
         result_page = paginator.paginate_queryset(orders, request)
         serializer = OrderSerializer(result_page, many=True)
@@ -109,13 +177,16 @@ def get_orders(request, user_id):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@conditional_queryset(single_order)
 def get_order(request, order_id):
     """
     A view that returns a single order by ID.
     """
     try:
-        order = Orders.objects.get(id=order_id)
-        if order.user != request.user and not request.user.is_staff:
+        order = OrderSerializer.setup_eager_loading(Orders.objects.all()).get(
+            id=order_id
+        )
+        if order.user_id != request.user.id and not request.user.is_staff:
             return Response(
                 {"error": "You are not authorized to view this order"},
                 status=status.HTTP_403_FORBIDDEN,
@@ -138,8 +209,10 @@ def get_order_item(request, order_item_id):
     A view that returns a single order item by ID.
     """
     try:
-        order_item = OrderItem.objects.get(id=order_item_id)
-        if order_item.order.user != request.user and not request.user.is_staff:
+        order_item = OrderItemSerializer.setup_eager_loading(
+            OrderItem.objects.select_related("order")
+        ).get(id=order_item_id)
+        if order_item.order.user_id != request.user.id and not request.user.is_staff:
             return Response(
                 {"error": "You are not authorized to view this order item"},
                 status=status.HTTP_403_FORBIDDEN,
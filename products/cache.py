@@ -0,0 +1,133 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+
+# Getting the logger
+logger = logging.getLogger("django")
+
+VERSION_KEY = "catalog:version"
+
+# Striped locks so that only one thread per process rebuilds a given entry
+_build_locks = [threading.Lock() for _ in range(64)]
+
+
+def get_catalog_cache():
+    """
+    Return the cache backend configured for the catalog.
+    """
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def get_catalog_version():
+    """
+    Return the current catalog version, initialising it if it is missing.
+    """
+    cache = get_catalog_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Seed from the clock so a counter lost to eviction or a restart
+        # never lines up with entries written under an older version
+        cache.add(VERSION_KEY, time.time_ns() // 1000, timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """
+    Invalidate every cached catalog entry by moving to a new version.
+
+    The version lives in the catalog cache, so with a per-process backend
+    only this process moves to it. Other processes keep serving their
+    entries until they expire, after CATALOG_CACHE_TIMEOUT seconds.
+    """
+    cache = get_catalog_cache()
+    try:
+        version = cache.incr(VERSION_KEY)
+    except ValueError:
+        get_catalog_version()
+        version = cache.incr(VERSION_KEY)
+    logger.info(f"Catalog cache version bumped to {version}")
+    return version
+
+
+def get_catalog_cache_key(request):
+    """
+    Build the cache key for a catalog request under the current version.
+    """
+    digest = hashlib.sha256(request.build_absolute_uri().encode("utf-8")).hexdigest()
+    return f"catalog:v{get_catalog_version()}:{digest}"
+
+
+def get_or_build(key, build):
+    """
+    Return the cached value for a key, building it on a miss.
+
+    Concurrent misses for the same key are collapsed into a single build: one
+    caller per process takes a local lock, and across processes the caller
+    holding the cache lock builds while the others wait for its result.
+    """
+    cache = get_catalog_cache()
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    with _build_locks[hash(key) % len(_build_locks)]:
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+        lock_key = f"{key}:lock"
+        if cache.add(lock_key, 1, timeout=settings.CATALOG_CACHE_LOCK_TIMEOUT):
+            try:
+                value = build()
+                cache.set(key, value, timeout=settings.CATALOG_CACHE_TIMEOUT)
+            finally:
+                cache.delete(lock_key)
+            return value
+
+        value = _wait_for(cache, key, lock_key)
+        if value is None:
+            # The other builder failed or timed out, so build it ourselves
+            logger.error(f"Timed out waiting for catalog cache entry {key}")
+            value = build()
+        return value
+
+
+def get_or_build_page(key, build):
+    """
+    Return the cached page for a key, building it on a miss like
+    `get_or_build`.
+
+    The entry holds the page data with its ETag and Last-Modified, computed
+    once when the page is built, so conditional requests for a cached page
+    are answered without a query.
+    """
+
+    def build_entry():
+        data = build()
+        body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+        digest = hashlib.sha256(f"{key}|{body}".encode("utf-8")).hexdigest()
+        return {
+            "data": data,
+            "etag": f'"{digest[:32]}"',
+            "last_modified": int(time.time()),
+        }
+
+    return get_or_build(key, build_entry)
+
+
+def _wait_for(cache, key, lock_key):
+    deadline = time.monotonic() + settings.CATALOG_CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        value = cache.get(key)
+        if value is not None:
+            return value
+        if cache.get(lock_key) is None:
+            return cache.get(key)
+        time.sleep(0.05)
+    return None
@@ -0,0 +1,229 @@
+import codecs
+import csv
+import io
+import json
+import logging
+import time
+from django.conf import settings
+from django.db import connection, transaction
+from rest_framework.exceptions import ValidationError
+from .cache import bump_catalog_version
+from .inventory import shard_stock
+from .models import Products
+from .search import search_index
+from .serializers import ProductSerializer
+
+# Getting the logger
+logger = logging.getLogger("django")
+
+# Supported import formats by content type and file extension
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/x-jsonlines": "jsonl",
+}
+EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# Columns that are generated in the database and never copied
+SKIPPED_COLUMNS = {"search_vector"}
+
+
+class ImportResult:
+    """
+    Counters and per-row errors collected while importing products.
+    """
+
+    def __init__(self, max_errors):
+        self.max_errors = max_errors
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+        self.started_at = time.monotonic()
+
+    def add_error(self, row, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "errors": errors})
+
+    @property
+    def duration(self):
+        return time.monotonic() - self.started_at
+
+    @property
+    def rows_per_second(self):
+        duration = self.duration
+        return (self.created + self.failed) / duration if duration else 0.0
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "duration_seconds": round(self.duration, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def detect_format(content_type=None, filename=None):
+    """
+    Work out the import format from a content type or a file name.
+    """
+    if content_type:
+        file_format = CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+        if file_format:
+            return file_format
+    if filename:
+        for extension, file_format in EXTENSIONS.items():
+            if filename.lower().endswith(extension):
+                return file_format
+    raise ValueError("Unsupported import format. Upload a CSV or JSON Lines file.")
+
+
+def read_rows(lines, file_format):
+    """
+    Yield (row number, row) pairs from an iterable of encoded lines without
+    reading the whole stream into memory. Rows that cannot be parsed are
+    yielded as exceptions so they can be reported like validation errors.
+    """
+    text = codecs.iterdecode(lines, "utf-8-sig")
+
+    if file_format == "csv":
+        for number, row in enumerate(csv.DictReader(text), start=1):
+            # Empty cells count as missing so that field defaults apply
+            yield number, {key: value for key, value in row.items() if value != ""}
+        return
+
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, ValueError(f"Invalid JSON: {e}")
+            continue
+        if not isinstance(row, dict):
+            row = ValueError("Each line must be a JSON object")
+        yield number, row
+
+
+def import_products(
+    lines,
+    file_format,
+    batch_size=None,
+    use_copy=None,
+    max_errors=100,
+    on_batch=None,
+):
+    """
+    Validate and insert products from a stream of CSV or JSON Lines rows.
+
+    Rows are validated with the ProductSerializer rules and inserted in
+    batches, with PostgreSQL COPY when available and `bulk_create`
+    otherwise. Invalid rows are reported in the result and skipped, they
+    never abort the rest of the file.
+    """
+    batch_size = batch_size or settings.PRODUCT_IMPORT_BATCH_SIZE
+    if use_copy is None:
+        use_copy = settings.PRODUCT_IMPORT_USE_COPY
+    use_copy = use_copy and connection.vendor == "postgresql"
+
+    result = ImportResult(max_errors)
+    validator = ProductSerializer()
+    batch = []
+
+    for number, row in read_rows(lines, file_format):
+        if isinstance(row, Exception):
+            result.add_error(number, [str(row)])
+            continue
+
+        try:
+            fields = validator.run_validation(row)
+            # Sharded products are inserted unsharded and sharded once the
+            # row exists, see _insert_batch
+            shards = fields.pop("shard_count", 0)
+            batch.append((number, Products(**fields), shards))
+        except ValidationError as e:
+            result.add_error(number, e.detail)
+
+        if len(batch) >= batch_size:
+            _insert_batch(batch, use_copy, result)
+            if on_batch:
+                on_batch(result)
+            batch = []
+
+    if batch:
+        _insert_batch(batch, use_copy, result)
+        if on_batch:
+            on_batch(result)
+
+    if result.created:
+        # Bulk inserts skip the model signals, so refresh the caches here
+        bump_catalog_version()
+        search_index.reset()
+
+    logger.info(
+        f"Imported {result.created} products, {result.failed} rows failed "
+        f"({result.rows_per_second:.0f} rows/s)"
+    )
+    return result
+
+
+def _insert_batch(batch, use_copy, result):
+    products = [product for _, product, _ in batch]
+    try:
+        with transaction.atomic():
+            if use_copy:
+                _copy_products(products)
+            else:
+                Products.objects.bulk_create(products)
+            # Move the stock of the products asking for shards into them
+            for _, product, shards in batch:
+                if shards:
+                    shard_stock(product.id, shards)
+        result.created += len(products)
+    except Exception as e:
+        logger.error(f"Unable to insert product batch: {e}")
+        for number, _, _ in batch:
+            result.add_error(number, [str(e)])
+
+
+def _copy_products(products):
+    fields = [
+        field
+        for field in Products._meta.concrete_fields
+        if field.column not in SKIPPED_COLUMNS
+    ]
+
+    buffer = io.StringIO()
+    for product in products:
+        values = [
+            field.get_db_prep_save(field.pre_save(product, add=True), connection)
+            for field in fields
+        ]
+        buffer.write("\t".join(_copy_value(value) for value in values))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    table = connection.ops.quote_name(Products._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN", buffer)
+
+
+def _copy_value(value):
+    """
+    Encode a value for the PostgreSQL COPY text format.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
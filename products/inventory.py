@@ -0,0 +1,146 @@
+import random
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import Products, StockShard
+
+# Takes the units from one shard that can cover them, starting from a random
+# shard. With SKIP LOCKED, shards locked by other reservations are passed
+# over rather than waited on, which spreads concurrent adds over the shards.
+RESERVE_FROM_SHARD = """
+UPDATE {shards} SET stock = stock - %(quantity)s, updated_at = %(now)s
+WHERE id = (
+    SELECT shard.id
+    FROM {shards} shard
+    JOIN {products} product ON product.id = shard.product_id
+    WHERE shard.product_id = %(product_id)s
+        AND shard.stock >= %(quantity)s
+        AND product.is_published
+    ORDER BY (shard.shard + %(shard_count)s - %(start)s) %% %(shard_count)s
+    LIMIT 1
+    FOR UPDATE OF shard {skip_locked}
+)
+"""
+
+
+def reserve_stock(product_id, quantity, shards=0):
+    """
+    Take `quantity` units from the stock of a published product.
+
+    The check and the decrement run as one conditional UPDATE, so concurrent
+    reservations can never oversell. Returns False when there is not enough
+    stock left. `shards` is the shard count of a sharded product.
+    """
+    if shards:
+        return reserve_sharded_stock(product_id, quantity, shards)
+
+    updated = Products.objects.filter(
+        id=product_id, is_published=True, stock__gte=quantity
+    ).update(stock=F("stock") - quantity, updated_at=timezone.now())
+    return updated == 1
+
+
+def reserve_sharded_stock(product_id, quantity, shards):
+    """
+    Take `quantity` units from the stock shards of a published product.
+
+    The units come from a single random shard when one can cover them,
+    preferring a shard no other reservation holds. Otherwise every shard is
+    locked and the units are taken from as many shards as needed, which
+    only happens when stock runs low.
+    """
+    table = connection.ops.quote_name
+    params = {
+        "product_id": product_id,
+        "quantity": quantity,
+        "shard_count": shards,
+        "start": random.randrange(shards),
+        "now": timezone.now(),
+    }
+    with connection.cursor() as cursor:
+        # When every shard is busy, queue on one of them
+        for skip_locked in ("SKIP LOCKED", ""):
+            cursor.execute(
+                RESERVE_FROM_SHARD.format(
+                    shards=table(StockShard._meta.db_table),
+                    products=table(Products._meta.db_table),
+                    skip_locked=skip_locked,
+                ),
+                params,
+            )
+            if cursor.rowcount == 1:
+                return True
+
+    with transaction.atomic():
+        # Locked in shard order, so two fallbacks never deadlock
+        stock_shards = list(
+            StockShard.objects.select_for_update(of=("self",))
+            .filter(product_id=product_id, product__is_published=True)
+            .order_by("shard")
+        )
+        if sum(shard.stock for shard in stock_shards) < quantity:
+            return False
+
+        remaining = quantity
+        for shard in stock_shards:
+            taken = min(shard.stock, remaining)
+            shard.stock -= taken
+            shard.updated_at = params["now"]
+            remaining -= taken
+            if not remaining:
+                break
+        StockShard.objects.bulk_update(stock_shards, ["stock", "updated_at"])
+    return True
+
+
+def release_stock(product_id, quantity, shards=0):
+    """
+    Return `quantity` units to the stock of a product, to a random shard
+    when the product is sharded.
+    """
+    if shards:
+        StockShard.objects.filter(
+            product_id=product_id, shard=random.randrange(shards)
+        ).update(stock=F("stock") + quantity, updated_at=timezone.now())
+        return
+
+    Products.objects.filter(id=product_id).update(
+        stock=F("stock") + quantity, updated_at=timezone.now()
+    )
+
+
+def shard_stock(product_id, shards, stock=None):
+    """
+    Spread the stock of a product evenly over `shards` stock shards, or
+    gather it back on the product row when `shards` is 0. `stock` replaces
+    the total when given. Returns the total stock.
+
+    Running it again for a sharded product rebalances its shards.
+    """
+    with transaction.atomic():
+        product = Products.objects.select_for_update().get(id=product_id)
+        stock_shards = list(
+            StockShard.objects.select_for_update().filter(product=product)
+        )
+        if stock is None:
+            stock = product.stock + sum(shard.stock for shard in stock_shards)
+        StockShard.objects.filter(product=product).delete()
+
+        if shards:
+            share, extra = divmod(stock, shards)
+            StockShard.objects.bulk_create(
+                [
+                    StockShard(
+                        product=product,
+                        shard=shard,
+                        stock=share + (1 if shard < extra else 0),
+                    )
+                    for shard in range(shards)
+                ]
+            )
+        Products.objects.filter(id=product_id).update(
+            stock=0 if shards else stock,
+            shard_count=shards,
+            updated_at=timezone.now(),
+        )
+    return stock
@@ -0,0 +1,72 @@
+import sys
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from products.importers import detect_format, import_products
+
+
+class Command(BaseCommand):
+    help = "Import products in bulk from a CSV or JSON Lines file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The file to import, or - for stdin.")
+        parser.add_argument(
+            "--format",
+            dest="file_format",
+            choices=["csv", "jsonl"],
+            help="The file format. Detected from the file extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.PRODUCT_IMPORT_BATCH_SIZE,
+            help="The number of rows inserted per batch.",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Insert with bulk_create instead of PostgreSQL COPY.",
+        )
+        parser.add_argument(
+            "--max-errors",
+            type=int,
+            default=100,
+            help="The number of row errors to report.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            file_format = options["file_format"] or detect_format(filename=path)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        def report_progress(result):
+            self.stdout.write(
+                f"{result.created} created, {result.failed} failed "
+                f"({result.rows_per_second:.0f} rows/s)"
+            )
+
+        try:
+            stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+        except OSError as e:
+            raise CommandError(str(e))
+
+        with stream:
+            result = import_products(
+                stream,
+                file_format,
+                batch_size=options["batch_size"],
+                use_copy=not options["no_copy"],
+                max_errors=options["max_errors"],
+                on_batch=report_progress,
+            )
+
+        for error in result.errors:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.created} products in {result.duration:.2f}s "
+                f"({result.rows_per_second:.0f} rows/s), {result.failed} rows failed"
+            )
+        )
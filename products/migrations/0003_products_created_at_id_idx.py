@@ -0,0 +1,18 @@
+# Generated by Django 4.2.19 on 2026-10-18 03:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0002_alter_products_stock"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="products",
+            index=models.Index(
+                fields=["created_at", "id"], name="products_created_at_id_idx"
+            ),
+        ),
+    ]
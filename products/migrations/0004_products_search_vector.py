@@ -0,0 +1,74 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION products_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER products_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description, search_vector
+    ON products_products
+    FOR EACH ROW EXECUTE FUNCTION products_search_vector_update();
+
+UPDATE products_products SET search_vector =
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B');
+
+CREATE INDEX products_search_vector_idx
+    ON products_products USING gin (search_vector);
+"""
+
+DROP_TRIGGER = """
+DROP INDEX IF EXISTS products_search_vector_idx;
+DROP TRIGGER IF EXISTS products_search_vector_trigger ON products_products;
+DROP FUNCTION IF EXISTS products_search_vector_update();
+"""
+
+
+def create_search_trigger(apps, schema_editor):
+    # The trigger and GIN index only exist on PostgreSQL, other databases
+    # fall back to the in-process search index
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_TRIGGER)
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_TRIGGER)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0003_products_created_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="products",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="products",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        fields=["search_vector"], name="products_search_vector_idx"
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_trigger, drop_search_trigger),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.19 on 2026-10-18 04:21
+
+import common.utils.uuids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0004_products_search_vector"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="products",
+            name="id",
+            field=models.UUIDField(
+                default=common.utils.uuids.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.19 on 2026-10-18 04:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0005_uuid7_primary_keys"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="products",
+            index=models.Index(
+                condition=models.Q(("is_published", True)),
+                fields=["created_at", "id"],
+                name="products_published_created_idx",
+            ),
+        ),
+    ]
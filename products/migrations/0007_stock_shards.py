@@ -0,0 +1,49 @@
+# Generated by Django 4.2.19 on 2026-10-18 04:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0006_query_pattern_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="products",
+            name="shard_count",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name="StockShard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("shard", models.PositiveSmallIntegerField()),
+                ("stock", models.PositiveIntegerField(default=0)),
+                (
+                    "product",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stock_shards",
+                        to="products.products",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="stockshard",
+            constraint=models.UniqueConstraint(
+                fields=("product", "shard"), name="products_stock_shard_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0007_stock_shards"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stockshard",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
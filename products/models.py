@@ -1,8 +1,28 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from common.models import UUIDModel
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from common.models import UUID7Model
 
 
-class Products(UUIDModel):
+class ProductsQuerySet(models.QuerySet):
+    def with_stock(self):
+        """
+        Annotate the units held in the stock shards of each product, so the
+        total stock of sharded products is read in the same query.
+        """
+        shards = (
+            StockShard.objects.filter(product=OuterRef("pk"))
+            .order_by()
+            .values("product")
+            .annotate(stock=Sum("stock"))
+            .values("stock")
+        )
+        return self.annotate(sharded_stock=Coalesce(Subquery(shards), Value(0)))
+
+
+class Products(UUID7Model):
     """
     A model that represents a product in the system.
     """
@@ -12,8 +32,74 @@ class Products(UUIDModel):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     stock = models.PositiveIntegerField()
     is_published = models.BooleanField(default=False)
+    # Number of StockShard rows the stock is spread across, 0 keeps it on
+    # this row. Meant for the few products that sell too fast for one row
+    shard_count = models.PositiveSmallIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by a database trigger on PostgreSQL
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = ProductsQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Backs the keyset pagination of the catalog listings
+            models.Index(
+                fields=["created_at", "id"], name="products_created_at_id_idx"
+            ),
+            # The published catalog only, read newest first
+            models.Index(
+                fields=["created_at", "id"],
+                condition=models.Q(is_published=True),
+                name="products_published_created_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="products_search_vector_idx"),
+        ]
 
     def __str__(self):
         return f"Product: {self.name}"
+
+    @property
+    def available_stock(self):
+        """
+        The units on this row plus the units in its stock shards.
+        """
+        if not self.shard_count:
+            return self.stock
+        sharded = getattr(self, "sharded_stock", None)
+        if sharded is None:
+            sharded = self.stock_shards.aggregate(total=Sum("stock"))["total"] or 0
+        return self.stock + sharded
+
+
+class StockShard(models.Model):
+    """
+    One of the counter rows holding the stock of a sharded product.
+
+    Reservations take units from a single shard, so concurrent adds of the
+    same product lock different rows instead of queueing on the product.
+    """
+
+    # Covered by the unique constraint, which leads with the product
+    product = models.ForeignKey(
+        Products,
+        on_delete=models.CASCADE,
+        related_name="stock_shards",
+        db_index=False,
+    )
+    shard = models.PositiveSmallIntegerField()
+    stock = models.PositiveIntegerField(default=0)
+    # Moved with every change of the stock, the product's own updated_at is
+    # left alone so reservations never lock the product row
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "shard"], name="products_stock_shard_unique"
+            )
+        ]
+
+    def __str__(self):
+        return f"Stock shard {self.shard} of product {self.product_id}"
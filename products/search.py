@@ -0,0 +1,183 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F
+from .models import Products
+
+# Getting the logger
+logger = logging.getLogger("django")
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Matches in the name count for more than matches in the description
+NAME_WEIGHT = 2
+
+
+def tokenize(text):
+    """
+    Split a piece of text into lowercase word tokens.
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    An in-process inverted index over the names and descriptions of
+    published products, used when full-text search is not available.
+
+    The index is built lazily on the first search, kept up to date by the
+    product save/delete signals of this process and rebuilt once it is older
+    than PRODUCT_SEARCH_INDEX_MAX_AGE to pick up writes from other processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}
+        self._documents = {}
+        self._built_at = None
+
+    @property
+    def is_built(self):
+        return self._built_at is not None
+
+    def build(self):
+        with self._lock:
+            self._postings = {}
+            self._documents = {}
+            products = (
+                Products.objects.filter(is_published=True)
+                .values_list("id", "name", "description")
+                .iterator(chunk_size=2000)
+            )
+            for product_id, name, description in products:
+                self._add(product_id, name, description)
+            self._built_at = time.monotonic()
+            logger.info(f"Search index built with {len(self._documents)} products")
+
+    def reset(self):
+        with self._lock:
+            self._postings = {}
+            self._documents = {}
+            self._built_at = None
+
+    def update(self, product):
+        """
+        Re-index a single product after it has been saved.
+        """
+        with self._lock:
+            if not self.is_built:
+                return
+            self._remove(product.id)
+            if product.is_published:
+                self._add(product.id, product.name, product.description)
+
+    def remove(self, product_id):
+        with self._lock:
+            if self.is_built:
+                self._remove(product_id)
+
+    def search(self, query):
+        """
+        Return the ids of the products matching every query token, best first.
+        """
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+
+        with self._lock:
+            if (
+                not self.is_built
+                or time.monotonic() - self._built_at
+                > settings.PRODUCT_SEARCH_INDEX_MAX_AGE
+            ):
+                self.build()
+
+            # Intersect the smallest posting lists first
+            postings = sorted(
+                (self._postings.get(token, {}) for token in tokens), key=len
+            )
+            matches = set(postings[0])
+            for posting in postings[1:]:
+                matches.intersection_update(posting)
+                if not matches:
+                    return []
+
+            scores = {
+                product_id: sum(posting[product_id] for posting in postings)
+                for product_id in matches
+            }
+
+        return sorted(scores, key=scores.get, reverse=True)
+
+    def _add(self, product_id, name, description):
+        terms = Counter(tokenize(description))
+        for token in tokenize(name):
+            terms[token] += NAME_WEIGHT
+        for token, frequency in terms.items():
+            self._postings.setdefault(token, {})[product_id] = frequency
+        self._documents[product_id] = list(terms)
+
+    def _remove(self, product_id):
+        for token in self._documents.pop(product_id, []):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.pop(product_id, None)
+            if not posting:
+                del self._postings[token]
+
+
+class RankedProducts:
+    """
+    A lazily loaded, ranked list of products that fetches only the slice
+    that is actually paginated.
+    """
+
+    def __init__(self, product_ids):
+        self.product_ids = product_ids
+
+    def __len__(self):
+        return len(self.product_ids)
+
+    def count(self):
+        return len(self.product_ids)
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key : key + 1][0]
+        page_ids = self.product_ids[key]
+        products = Products.objects.with_stock().in_bulk(page_ids)
+        return [
+            products[product_id] for product_id in page_ids if product_id in products
+        ]
+
+
+search_index = InvertedIndex()
+
+
+def uses_full_text_search():
+    backend = settings.PRODUCT_SEARCH_BACKEND
+    if backend == "auto":
+        return connection.vendor == "postgresql"
+    return backend == "postgres"
+
+
+def search_catalog(query):
+    """
+    Return the published products matching a query, ordered by relevance.
+    """
+    if uses_full_text_search():
+        search_query = SearchQuery(query, search_type="websearch", config="english")
+        return (
+            Products.objects.filter(is_published=True, search_vector=search_query)
+            .with_stock()
+            .annotate(rank=SearchRank(F("search_vector"), search_query))
+            .order_by("-rank", "-created_at", "-id")
+        )
+
+    return RankedProducts(search_index.search(query))
@@ -1,11 +1,16 @@
+from django.db import transaction
 from rest_framework import serializers
 from decimal import Decimal
+from .inventory import shard_stock
 from .models import Products
 
 
 class ProductSerializer(serializers.ModelSerializer):
     """
     A serializer class for the Products model.
+
+    The stock of a sharded product is read from and written to its stock
+    shards.
     """
 
     price = serializers.DecimalField(
@@ -14,5 +19,31 @@ class ProductSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Products
-        fields = "__all__"
+        exclude = ["search_vector"]
         read_only_fields = ["id", "created_at", "updated_at"]
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data["stock"] = instance.available_stock
+        return data
+
+    def create(self, validated_data):
+        shards = validated_data.pop("shard_count", 0)
+        with transaction.atomic():
+            instance = super().create(validated_data)
+            if shards:
+                shard_stock(instance.id, shards)
+                instance.refresh_from_db(fields=["stock", "shard_count"])
+        return instance
+
+    def update(self, instance, validated_data):
+        shards = validated_data.pop("shard_count", instance.shard_count)
+        if not shards and not instance.shard_count:
+            return super().update(instance, validated_data)
+
+        stock = validated_data.pop("stock", None)
+        with transaction.atomic():
+            instance = super().update(instance, validated_data)
+            shard_stock(instance.id, shards, stock=stock)
+            instance.refresh_from_db(fields=["stock", "shard_count"])
+        return instance
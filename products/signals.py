@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Products
+from .search import search_index
+
+
+@receiver(post_save, sender=Products)
+def update_search_index(sender, instance, **kwargs):
+    """
+    Keep the in-process search index in step with product writes.
+    """
+    search_index.update(instance)
+
+
+@receiver(post_delete, sender=Products)
+def remove_from_search_index(sender, instance, **kwargs):
+    """
+    Drop deleted products from the in-process search index.
+    """
+    search_index.remove(instance.id)
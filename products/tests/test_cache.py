@@ -0,0 +1,130 @@
+import threading
+import time
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from users.models import Users
+from products.inventory import shard_stock
+from products.models import Products
+from products.cache import (
+    bump_catalog_version,
+    get_catalog_version,
+    get_or_build,
+)
+
+
+@pytest.mark.django_db
+class TestCatalogCache:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.user = Users.objects.create_user(
+            first_name="some",
+            last_name="testuser",
+            email="some-email",
+            password="some-password123",
+        )
+        self.admin_user = Users.objects.create_admin_user(
+            first_name="some",
+            last_name="adminuser",
+            email="some-admin-email",
+            password="some-admin-password123",
+        )
+        self.product = Products.objects.create(
+            name="Test Product",
+            description="Test Product Description",
+            price=100.00,
+            stock=10,
+            is_published=True,
+        )
+
+    def test_active_products_are_served_from_cache(self, django_assert_num_queries):
+        url = reverse("products-active")
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 1
+
+        # Only the stock of the page's products is read again
+        with django_assert_num_queries(1):
+            cached = self.client.get(url)
+        assert cached.status_code == status.HTTP_200_OK
+        assert cached.data == response.data
+
+        with django_assert_num_queries(1):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+
+    @pytest.mark.parametrize("shards", [0, 4])
+    def test_cached_pages_show_the_live_stock(self, shards):
+        shard_stock(self.product.id, shards)
+        url = reverse("products-active")
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url)
+        assert response.data["results"][0]["stock"] == 10
+
+        added = self.client.post(
+            reverse("cart-add", args=[self.product.id]), {"quantity": 3}, format="json"
+        )
+        assert added.status_code == status.HTTP_200_OK
+
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert cached.status_code == status.HTTP_200_OK
+        assert cached.data["results"][0]["stock"] == 7
+        assert cached["ETag"] != response["ETag"]
+
+    def test_product_writes_invalidate_the_cache(self):
+        url = reverse("products-active")
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url)
+        assert len(response.data["results"]) == 1
+
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(
+            reverse("products-create"),
+            {
+                "name": "New Product",
+                "description": "New Product Description",
+                "price": 10.00,
+                "stock": 3,
+                "is_published": True,
+            },
+            format="json",
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = self.client.get(url)
+        assert len(response.data["results"]) == 2
+
+        response = self.client.patch(reverse("product-status", args=[self.product.id]))
+        assert response.status_code == status.HTTP_202_ACCEPTED
+
+        response = self.client.get(url)
+        assert len(response.data["results"]) == 1
+
+    def test_bump_moves_to_a_new_version(self):
+        version = get_catalog_version()
+        assert bump_catalog_version() == version + 1
+        assert get_catalog_version() == version + 1
+
+    def test_concurrent_misses_build_once(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"results": []}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_build("k", build)))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{"results": []}] * 10
@@ -0,0 +1,135 @@
+import json
+import pytest
+from io import StringIO
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from users.models import Users
+from products.importers import import_products
+from products.inventory import reserve_stock
+from products.models import Products
+from products.search import search_catalog
+
+CSV_BODY = (
+    "name,description,price,stock,is_published\n"
+    "Linen Shirt,A light linen shirt,45.00,12,true\n"
+    'Wool Coat,"A warm coat, lined",180.50,4,\n'
+    "Broken Row,Missing a price,,3,true\n"
+    "Silk Scarf,A printed silk scarf,-5,2,false\n"
+)
+
+
+@pytest.mark.django_db
+class TestProductImport:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.user = Users.objects.create_user(
+            first_name="some",
+            last_name="testuser",
+            email="some-email",
+            password="some-password123",
+        )
+        self.admin_user = Users.objects.create_admin_user(
+            first_name="some",
+            last_name="adminuser",
+            email="some-admin-email",
+            password="some-admin-password123",
+        )
+        self.url = reverse("products-import")
+
+    def test_non_admin_cannot_import_products(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, CSV_BODY, content_type="text/csv")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_admin_can_stream_csv_import(self):
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(self.url, CSV_BODY, content_type="text/csv")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["created"] == 2
+        assert response.data["failed"] == 2
+        assert [error["row"] for error in response.data["errors"]] == [3, 4]
+        assert "price" in response.data["errors"][0]["errors"]
+
+        coat = Products.objects.get(name="Wool Coat")
+        assert coat.description == "A warm coat, lined"
+        assert str(coat.price) == "180.50"
+        assert coat.is_published is False
+
+        # Rows inserted with COPY still get their search vector
+        assert [product.name for product in search_catalog("linen")] == ["Linen Shirt"]
+
+    def test_admin_can_upload_json_lines_in_small_batches(self):
+        lines = [
+            json.dumps(
+                {
+                    "name": f"Product {index}",
+                    "description": "Imported product",
+                    "price": "10.00",
+                    "stock": index,
+                }
+            )
+            for index in range(5)
+        ]
+        lines.insert(2, "{not json")
+        upload = SimpleUploadedFile(
+            "products.jsonl", "\n".join(lines).encode("utf-8"), "application/jsonl"
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(
+            f"{self.url}?batch_size=2", {"file": upload}, format="multipart"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["created"] == 5
+        assert response.data["failed"] == 1
+        assert response.data["errors"][0]["row"] == 3
+        assert Products.objects.count() == 5
+
+    @pytest.mark.parametrize("use_copy", [True, False])
+    def test_imported_products_can_be_sharded(self, use_copy):
+        rows = [
+            {
+                "name": name,
+                "description": "Imported product",
+                "price": "10.00",
+                "stock": 10,
+                "is_published": True,
+                "shard_count": shards,
+            }
+            for name, shards in [("Hot Product", 4), ("Plain Product", 0)]
+        ]
+        lines = [(json.dumps(row) + "\n").encode("utf-8") for row in rows]
+        result = import_products(lines, "jsonl", use_copy=use_copy)
+        assert result.created == 2
+
+        hot = Products.objects.get(name="Hot Product")
+        assert (hot.stock, hot.shard_count, hot.available_stock) == (0, 4, 10)
+        assert hot.stock_shards.count() == 4
+        assert reserve_stock(hot.id, 1, shards=hot.shard_count)
+        plain = Products.objects.get(name="Plain Product")
+        assert (plain.stock, plain.shard_count) == (10, 0)
+
+    def test_import_rejects_unknown_format(self):
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(self.url, "<xml/>", content_type="text/xml")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_import_products_command(self, tmp_path):
+        path = tmp_path / "products.csv"
+        path.write_text(CSV_BODY)
+        stdout = StringIO()
+        call_command(
+            "import_products",
+            str(path),
+            "--batch-size",
+            "1",
+            "--no-copy",
+            stdout=stdout,
+            stderr=StringIO(),
+        )
+        assert "Imported 2 products" in stdout.getvalue()
+        assert "rows/s" in stdout.getvalue()
+        assert Products.objects.count() == 2
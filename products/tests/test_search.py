@@ -0,0 +1,91 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from users.models import Users
+from products.models import Products
+from products.search import InvertedIndex, search_index
+
+
+@pytest.mark.django_db
+class TestProductSearch:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.user = Users.objects.create_user(
+            first_name="some",
+            last_name="testuser",
+            email="some-email",
+            password="some-password123",
+        )
+        self.jacket = Products.objects.create(
+            name="Leather Jacket",
+            description="A black leather jacket with a warm lining",
+            price=150.00,
+            stock=10,
+            is_published=True,
+        )
+        self.boots = Products.objects.create(
+            name="Winter Boots",
+            description="Leather boots for cold and wet weather",
+            price=90.00,
+            stock=10,
+            is_published=True,
+        )
+        self.hidden = Products.objects.create(
+            name="Leather Belt",
+            description="An unpublished leather belt",
+            price=20.00,
+            stock=10,
+        )
+        self.client.force_authenticate(user=self.user)
+        yield
+        search_index.reset()
+
+    def search(self, query):
+        return self.client.get(reverse("products-search"), {"q": query})
+
+    def test_search_requires_a_query(self):
+        response = self.client.get(reverse("products-search"))
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["error"] == "Search query is required"
+
+    def test_full_text_search_ranks_name_matches_first(self):
+        response = self.search("leather")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 2
+        names = [product["name"] for product in response.data["results"]]
+        assert names == ["Leather Jacket", "Winter Boots"]
+        assert "search_vector" not in response.data["results"][0]
+
+    def test_full_text_search_follows_product_updates(self):
+        self.boots.name = "Snow Boots"
+        self.boots.save()
+        response = self.search("snow")
+        assert response.data["count"] == 1
+        assert response.data["results"][0]["id"] == str(self.boots.id)
+
+    def test_in_process_search_fallback(self, settings):
+        settings.PRODUCT_SEARCH_BACKEND = "memory"
+        response = self.search("leather jacket")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 1
+        assert response.data["results"][0]["id"] == str(self.jacket.id)
+
+        # Writes are applied to the built index incrementally
+        self.hidden.is_published = True
+        self.hidden.save()
+        response = self.search("leather")
+        assert response.data["count"] == 3
+        assert response.data["results"][0]["name"] in ["Leather Jacket", "Leather Belt"]
+
+        self.jacket.delete()
+        response = self.search("jacket")
+        assert response.data["count"] == 0
+
+    def test_inverted_index_requires_every_token(self):
+        index = InvertedIndex()
+        assert index.search("leather boots") == [self.boots.id]
+        assert index.search("leather") == [self.jacket.id, self.boots.id]
+        assert index.search("sandals") == []
+        assert index.search("   ") == []
@@ -0,0 +1,127 @@
+import json
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from products.inventory import release_stock, reserve_stock, shard_stock
+from products.models import Products, StockShard
+from users.models import Users
+
+
+def shard_stocks(product):
+    return list(
+        StockShard.objects.filter(product=product)
+        .order_by("shard")
+        .values_list("stock", flat=True)
+    )
+
+
+@pytest.mark.django_db
+class TestStockShards:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.admin_user = Users.objects.create_admin_user(
+            first_name="some", email="some-admin-email", password="admin-password123"
+        )
+        self.product = Products.objects.create(
+            name="Hot Product",
+            description="A product everyone wants",
+            price=10.00,
+            stock=10,
+            is_published=True,
+        )
+
+    def test_sharding_spreads_the_stock(self):
+        assert shard_stock(self.product.id, 4) == 10
+        self.product.refresh_from_db()
+        assert (self.product.stock, self.product.shard_count) == (0, 4)
+        assert shard_stocks(self.product) == [3, 3, 2, 2]
+        assert self.product.available_stock == 10
+
+    def test_unsharding_gathers_the_stock(self):
+        shard_stock(self.product.id, 4)
+        shard_stock(self.product.id, 0)
+        self.product.refresh_from_db()
+        assert (self.product.stock, self.product.shard_count) == (10, 0)
+        assert not StockShard.objects.exists()
+
+    def test_reservation_takes_from_one_shard(self):
+        shard_stock(self.product.id, 4)
+        assert reserve_stock(self.product.id, 2, shards=4)
+        changed = [
+            before - after
+            for before, after in zip([3, 3, 2, 2], shard_stocks(self.product))
+            if before != after
+        ]
+        assert changed == [2]
+
+    def test_reservation_falls_back_to_several_shards(self):
+        shard_stock(self.product.id, 4)
+        assert reserve_stock(self.product.id, 9, shards=4)
+        assert sum(shard_stocks(self.product)) == 1
+        assert not reserve_stock(self.product.id, 2, shards=4)
+        assert sum(shard_stocks(self.product)) == 1
+
+    def test_unpublished_product_is_not_reserved(self):
+        shard_stock(self.product.id, 4)
+        Products.objects.filter(id=self.product.id).update(is_published=False)
+        assert not reserve_stock(self.product.id, 1, shards=4)
+
+    def test_release_returns_units_to_a_shard(self):
+        shard_stock(self.product.id, 4)
+        release_stock(self.product.id, 5, shards=4)
+        self.product.refresh_from_db()
+        assert self.product.available_stock == 15
+
+    def test_listing_reports_the_total_stock(self):
+        shard_stock(self.product.id, 4)
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(reverse("products-list"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"][0]["stock"] == 10
+
+    def test_export_reports_the_total_stock(self):
+        shard_stock(self.product.id, 4)
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(reverse("products-export"), {"output": "ndjson"})
+        assert response.status_code == status.HTTP_200_OK
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert json.loads(lines[0])["stock"] == 10
+
+    def test_sharded_reservations_change_the_product_etag(self):
+        shard_stock(self.product.id, 4)
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse("product-detail", args=[self.product.id])
+        etag = self.client.get(url).headers["ETag"]
+
+        response = self.client.post(
+            reverse("cart-add", args=[self.product.id]), {"quantity": 1}
+        )
+        assert response.status_code == status.HTTP_200_OK, response.data
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+        assert response.data["stock"] == 9
+
+    def test_admin_can_shard_and_restock_a_product(self):
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse("update-product", args=[self.product.id])
+        data = {
+            "name": "Hot Product",
+            "description": "A product everyone wants",
+            "price": "10.00",
+            "stock": 20,
+            "shard_count": 2,
+            "is_published": True,
+        }
+        response = self.client.put(url, data, format="json")
+        assert response.status_code == status.HTTP_200_OK, response.data
+        assert (response.data["stock"], response.data["shard_count"]) == (20, 2)
+        assert shard_stocks(self.product) == [10, 10]
+
+        data["stock"] = 7
+        response = self.client.put(url, data, format="json")
+        assert response.data["stock"] == 7
+        assert shard_stocks(self.product) == [4, 3]
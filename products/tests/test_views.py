@@ -1,3 +1,4 @@
+import json
 import pytest
 import uuid
 from django.urls import reverse
@@ -182,7 +183,7 @@ class TestProductViews:
         self.client.force_authenticate(user=self.admin_user)
         response = self.client.get(url)
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
+        assert len(response.data["results"]) == 1
 
     def test_non_admin_can_view_active_products_list(self):
         url = reverse("product-status", args=[self.product.id])
@@ -195,7 +196,7 @@ class TestProductViews:
         self.client.force_authenticate(user=self.user)
         response = self.client.get(url)
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
+        assert len(response.data["results"]) == 1
 
         url = reverse("product-status", args=[self.product.id])
         self.client.force_authenticate(user=self.admin_user)
@@ -214,7 +215,7 @@ class TestProductViews:
         self.client.force_authenticate(user=self.admin_user)
         response = self.client.get(url)
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
+        assert len(response.data["results"]) == 1
 
         url = reverse("product-status", args=[self.product.id])
         self.client.force_authenticate(user=self.admin_user)
@@ -235,3 +236,155 @@ class TestProductViews:
         response = self.client.get(url)
         assert response.status_code == status.HTTP_200_OK
         assert response.data["name"] == self.product.name
+
+    def test_active_products_are_paginated_with_cursors(self):
+        Products.objects.bulk_create(
+            [
+                Products(
+                    name=f"Product {index}",
+                    description="Product Description",
+                    price=10.00,
+                    stock=5,
+                    is_published=True,
+                )
+                for index in range(25)
+            ]
+        )
+        self.client.force_authenticate(user=self.user)
+
+        url = reverse("products-active")
+        response = self.client.get(url, {"page_size": 10})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["previous"] is None
+
+        # Walk forward through every page using the opaque next cursor
+        seen = []
+        pages = [response.data]
+        while response.data["next"]:
+            seen.extend(product["id"] for product in response.data["results"])
+            response = self.client.get(response.data["next"])
+            assert response.status_code == status.HTTP_200_OK
+            pages.append(response.data)
+        seen.extend(product["id"] for product in response.data["results"])
+
+        assert len(pages) == 3
+        assert len(seen) == len(set(seen)) == 25
+        assert [len(page["results"]) for page in pages] == [10, 10, 5]
+
+        # Walking backwards returns the previous page unchanged
+        response = self.client.get(pages[-1]["previous"])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"] == pages[1]["results"]
+
+    def test_all_products_support_page_number_pagination(self):
+        url = reverse("products-list")
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(url, {"pagination": "page"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 1
+        assert len(response.data["results"]) == 1
+
+    def test_products_list_rejects_invalid_cursor(self):
+        url = reverse("products-list")
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(url, {"cursor": "not-a-cursor"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["error"] == "Invalid cursor"
+
+    def test_products_list_rejects_invalid_pagination_mode(self):
+        url = reverse("products-list")
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(url, {"pagination": "offset"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_single_product_supports_conditional_get(self):
+        url = reverse("product-detail", args=[self.product.id])
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response.headers["ETag"]
+        last_modified = response.headers["Last-Modified"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        self.product.name = "Renamed Product"
+        self.product.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+
+    def test_active_products_support_conditional_get(self):
+        self.product.is_published = True
+        self.product.save()
+        url = reverse("products-active")
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url)
+        etag = response.headers["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        # Each page has its own validator
+        response = self.client.get(url, {"page_size": 5}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+        # The validators change with the cached catalog
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(
+            reverse("products-create"),
+            {
+                "name": "Another Product",
+                "description": "Another Product Description",
+                "price": "10.00",
+                "stock": 1,
+                "is_published": True,
+            },
+            format="json",
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_non_admin_cannot_export_products(self):
+        url = reverse("products-export")
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_admin_can_export_products_as_csv(self):
+        url = reverse("products-export")
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"] == "text/csv"
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert lines[0].startswith("id,name,description,price,stock")
+        assert len(lines) == 2
+        assert "Test Product" in lines[1]
+
+    def test_admin_can_export_products_in_a_date_range(self):
+        url = reverse("products-export")
+        self.client.force_authenticate(user=self.admin_user)
+        today = self.product.created_at.date()
+
+        response = self.client.get(
+            url, {"output": "ndjson", "created_from": today, "created_to": today}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["id"] == str(self.product.id)
+
+        response = self.client.get(
+            url, {"output": "ndjson", "created_to": "2000-01-01"}
+        )
+        assert b"".join(response.streaming_content) == b""
+
+        response = self.client.get(url, {"created_from": "yesterday"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
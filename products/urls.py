@@ -6,7 +6,10 @@ from django.urls import path
 from .views import (
     get_all_products,
     get_products,
+    export_products,
+    search_products,
     create_product,
+    bulk_import_products,
     get_product,
     change_product_status,
     update_product,
@@ -16,7 +19,14 @@ from .views import (
 urlpatterns = [
     path("", get_all_products, name="products-list"),  # GET /api/products/
     path("active", get_products, name="products-active"),  # GET /api/products/active
+    path("export", export_products, name="products-export"),  # GET /api/products/export
+    path(
+        "search", search_products, name="products-search"
+    ),  # GET /api/products/search?q=<query>
     path("new", create_product, name="products-create"),  # POST /api/products/new
+    path(
+        "import", bulk_import_products, name="products-import"
+    ),  # POST /api/products/import
     path(
         "<uuid:product_id>", get_product, name="product-detail"
     ),  # GET /api/products/<product_id>
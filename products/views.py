@@ -1,27 +1,112 @@
+import hashlib
 import logging
+from django.db.models import F, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from .models import Products
 from .serializers import ProductSerializer
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from common.utils.conditional import conditional_queryset
+from common.utils.export import export_response, filter_created_between
+from common.utils.pagination import CustomPageNumberPagination, get_paginator
+from .cache import bump_catalog_version, get_catalog_cache_key, get_or_build_page
+from .importers import detect_format, import_products
+from .search import search_catalog
 
 
 # Getting the logger
 logger = logging.getLogger("django")
 
 
+def published_products(request):
+    """
+    Return the queryset behind the published products listing.
+    """
+    return Products.objects.filter(is_published=True)
+
+
+def single_product(request, product_id):
+    """
+    Return the queryset behind a single product.
+    """
+    return Products.objects.filter(id=product_id)
+
+
+def with_live_stock(page):
+    """
+    Return the data and validators of a cached catalog page with the current
+    stock of its products, read in one query. Stock moves with every cart
+    change, so it is kept out of the cached page.
+    """
+    results = page["data"]["results"]
+    etag, last_modified = page["etag"], page["last_modified"]
+    if not results:
+        return page["data"], etag, last_modified
+
+    products = (
+        Products.objects.filter(id__in=[item["id"] for item in results])
+        .with_stock()
+        .annotate(
+            total_stock=F("stock") + F("sharded_stock"),
+            shards_updated_at=Max("stock_shards__updated_at"),
+        )
+        .values_list("id", "total_stock", "updated_at", "shards_updated_at")
+    )
+    stock = {}
+    for product_id, total_stock, *changes in products:
+        stock[str(product_id)] = total_stock
+        for changed_at in changes:
+            if changed_at:
+                last_modified = max(last_modified, int(changed_at.timestamp()))
+
+    data = {
+        **page["data"],
+        "results": [{**item, "stock": stock.get(item["id"], 0)} for item in results],
+    }
+    digest = hashlib.sha256(
+        f"{etag}|{[item['stock'] for item in data['results']]}".encode("utf-8")
+    ).hexdigest()
+    return data, f'"{digest[:32]}"', last_modified
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_products(request):
     """
-    A view that returns a list of all published products.
+    A view that returns a paginated list of all published products.
+    The rendered pages are cached until the catalog changes, and served
+    with the live stock of their products.
     """
     try:
-        products = Products.objects.filter(is_published=True).order_by("-created_at")
-        serializer = ProductSerializer(products, many=True)
+
+        def build_page():
+            paginator = get_paginator(request)
+            products = (
+                published_products(request).with_stock().order_by("-created_at", "-id")
+            )
+            result_page = paginator.paginate_queryset(products, request)
+            serializer = ProductSerializer(result_page, many=True)
+            data = paginator.get_paginated_response(serializer.data).data
+            for item in data["results"]:
+                item["stock"] = None
+            return data
+
+        page = get_or_build_page(get_catalog_cache_key(request), build_page)
+        data, etag, last_modified = with_live_stock(page)
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            return not_modified
+
         logger.info("Products returned successfully")
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        response = Response(data, status=status.HTTP_200_OK)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return response
     except Exception as e:
         logger.error(str(e))
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -31,13 +116,77 @@ def get_products(request):
 @permission_classes([IsAuthenticated, IsAdminUser])
 def get_all_products(request):
     """
-    A view that returns a list of all products.
+    A view that returns a paginated list of all products.
     """
     try:
-        products = Products.objects.order_by("-created_at").all()
-        serializer = ProductSerializer(products, many=True)
+        paginator = get_paginator(request)
+        products = Products.objects.with_stock().order_by("-created_at", "-id")
+        result_page = paginator.paginate_queryset(products, request)
+        serializer = ProductSerializer(result_page, many=True)
         logger.info(f"Products returned successfully for user: {request.user.id}")
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginator.get_paginated_response(serializer.data)
+    except Exception as e:
+        logger.error(str(e))
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def export_products(request):
+    """
+    A view that streams every product as CSV or NDJSON, optionally limited to
+    a creation date range.
+    """
+    try:
+        products = filter_created_between(Products.objects.all(), request)
+        fields = [
+            "id",
+            "name",
+            "description",
+            "price",
+            "stock",
+            "is_published",
+            "created_at",
+            "updated_at",
+        ]
+        # The stock column holds the stock of sharded products too
+        response = export_response(
+            products.with_stock()
+            .annotate(total_stock=F("stock") + F("sharded_stock"))
+            .order_by("created_at", "id"),
+            [field if field != "stock" else "total_stock" for field in fields],
+            request.query_params.get("output", "csv"),
+            "products",
+            columns=fields,
+        )
+        logger.info(f"Products export started by user: {request.user.id}")
+        return response
+    except Exception as e:
+        logger.error(str(e))
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def search_products(request):
+    """
+    A view that returns a paginated list of published products matching the
+    `q` query parameter, ordered by relevance.
+    """
+    try:
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            logger.error("Search query is required")
+            return Response(
+                {"error": "Search query is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        paginator = CustomPageNumberPagination()
+        result_page = paginator.paginate_queryset(search_catalog(query), request)
+        serializer = ProductSerializer(result_page, many=True)
+        logger.info("Product search results returned successfully")
+        return paginator.get_paginated_response(serializer.data)
     except Exception as e:
         logger.error(str(e))
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -45,12 +194,15 @@ def get_all_products(request):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@conditional_queryset(
+    single_product, modified_fields=("updated_at", "stock_shards__updated_at")
+)
 def get_product(request, product_id):
     """
     A view that returns a single product by ID.
     """
     try:
-        product = Products.objects.get(id=product_id)
+        product = Products.objects.with_stock().get(id=product_id)
         serializer = ProductSerializer(product)
         logger.info(f"Product {product_id} returned successfully")
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -74,6 +226,7 @@ def create_product(request):
         serializer = ProductSerializer(data=request.data)
         if serializer.is_valid():
             serializer.save()
+            bump_catalog_version()
             logger.info(f"Product created successfully by user: {request.user.id}")
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         logger.error("Unable to create product due to validation errors")
@@ -83,6 +236,44 @@ def create_product(request):
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def bulk_import_products(request):
+    """
+    A view that creates products in bulk from a streamed CSV or JSON Lines
+    body, or from a multipart upload in the `file` field.
+    """
+    try:
+        batch_size = request.query_params.get("batch_size")
+        batch_size = int(batch_size) if batch_size else None
+        if batch_size is not None and batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer.")
+
+        if request.content_type.startswith("multipart/form-data"):
+            upload = request.FILES.get("file")
+            if upload is None:
+                logger.error("No file was uploaded for the product import")
+                return Response(
+                    {"error": "A file must be uploaded in the 'file' field."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            file_format = detect_format(upload.content_type, upload.name)
+            lines = upload
+        else:
+            # Read the raw request body line by line as it arrives
+            file_format = detect_format(request.content_type)
+            lines = request.stream or []
+
+        result = import_products(lines, file_format, batch_size=batch_size)
+        logger.info(
+            f"{result.created} products imported successfully by user: {request.user.id}"
+        )
+        return Response(result.as_dict(), status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(str(e))
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def change_product_status(request, product_id):
@@ -93,6 +284,7 @@ def change_product_status(request, product_id):
         product = Products.objects.get(id=product_id)
         product.is_published = not product.is_published
         product.save()
+        bump_catalog_version()
 
         action = "published" if product.is_published else "unpublished"
 
@@ -122,6 +314,7 @@ def update_product(request, product_id):
         serializer = ProductSerializer(product, data=request.data)
         if serializer.is_valid():
             serializer.save()
+            bump_catalog_version()
             logger.info(
                 f"Product {product_id} updated successfully by user: {request.user.id}"
             )
@@ -169,6 +362,7 @@ def delete_product(request, product_id):
             )
 
         product.delete()
+        bump_catalog_version()
         logger.info(
             f"Product {product_id} deleted successfully by user: {request.user.id}"
         )
@@ -0,0 +1,111 @@
+"""
+Benchmark checkout for carts of different sizes, comparing the bulk
+`create_order` view with the previous one insert per cart line.
+
+Usage:
+    python scripts/benchmark_checkout.py --sizes 1 10 100 500
+"""
+
+import argparse
+import logging
+from benchmark_utils import (
+    benchmark_database,
+    measure,
+    print_row,
+    seed_products,
+    setup_django,
+)
+
+setup_django()
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from cart.models import Cart, CartItem
+from orders.models import Orders, OrderItem
+from orders.views import create_order
+from products.models import Products
+from users.models import Users
+
+
+def fill_cart(cart, products):
+    CartItem.objects.bulk_create(
+        [
+            CartItem(cart=cart, product=product, price=product.price, quantity=1)
+            for product in products
+        ]
+    )
+
+
+def per_line_checkout(user):
+    """
+    The checkout as it ran before, with one query per cart line.
+    """
+    cart = Cart.objects.get(user=user)
+    cart_items = CartItem.objects.filter(cart=cart).all()
+    with transaction.atomic():
+        order = Orders.objects.create(user=user, total=cart.get_total)
+        for cart_item in cart_items:
+            OrderItem.objects.create(
+                order=order,
+                product=cart_item.product,
+                quantity=cart_item.quantity,
+                price=cart_item.price,
+            )
+        cart_items.delete()
+
+
+def bulk_checkout(user):
+    request = APIRequestFactory().post("/api/orders/new", {}, format="json")
+    force_authenticate(request, user=user)
+    response = create_order(request)
+    assert response.status_code == 201, response.data
+
+
+def run_checkout(checkout, cart, products):
+    def run():
+        fill_cart(cart, products)
+        checkout()
+
+    return run
+
+
+def count_queries(checkout, cart, products):
+    fill_cart(cart, products)
+    with CaptureQueriesContext(connection) as context:
+        checkout()
+    return len(context.captured_queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # Keep the per request log lines out of the results
+    logging.getLogger("django").setLevel(logging.WARNING)
+
+    with benchmark_database():
+        seed_products(max(args.sizes))
+        products = list(Products.objects.all()[: max(args.sizes)])
+        user = Users.objects.create_user(
+            first_name="bench", email="bench@example.com", password="bench-password"
+        )
+        cart = Cart.objects.create(user=user)
+
+        for size in args.sizes:
+            lines = products[:size]
+            print(f"\n{size} cart lines")
+            for label, checkout in [
+                ("one insert per line", lambda: per_line_checkout(user)),
+                ("bulk create_order", lambda: bulk_checkout(user)),
+            ]:
+                queries = count_queries(checkout, cart, lines)
+                # Filling the cart is included in the timing for both variants
+                stats = measure(run_checkout(checkout, cart, lines), args.repeat)
+                print_row(f"{label} ({queries} queries)", stats)
+
+
+if __name__ == "__main__":
+    main()
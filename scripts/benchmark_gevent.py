@@ -0,0 +1,74 @@
+"""
+Benchmark concurrent slow queries from gevent greenlets, with psycopg2
+blocking the process and with it waiting cooperatively through the gevent
+hub, with and without a bounded connection pool.
+
+Usage:
+    python scripts/benchmark_gevent.py --greenlets 50 --delay 0.2 --pool-size 10
+"""
+
+from gevent import monkey
+
+monkey.patch_all()
+
+import argparse
+import time
+import gevent
+from benchmark_utils import benchmark_database, setup_django
+
+setup_django()
+
+from django.db import connection
+from psycopg2 import extensions
+from common.db.green import make_psycopg2_green
+from common.db.pool import close_pools
+
+
+def slow_query(delay):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_sleep(%s)", [delay])
+    finally:
+        connection.close()
+
+
+def run(label, greenlets, delay):
+    started = time.perf_counter()
+    gevent.joinall([gevent.spawn(slow_query, delay) for _ in range(greenlets)])
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<40} {elapsed:6.2f}s for {greenlets} queries of {delay}s "
+        f"({greenlets * delay / elapsed:.1f} queries overlapping)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--greenlets", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        connection.close()
+        settings_dict = connection.settings_dict
+
+        settings_dict["POOL_SIZE"] = 0
+        run("blocking psycopg2", args.greenlets, args.delay)
+
+        make_psycopg2_green()
+        run("gevent wait callback", args.greenlets, args.delay)
+
+        settings_dict["POOL_SIZE"] = args.pool_size
+        run(
+            f"gevent wait callback + pool of {args.pool_size}",
+            args.greenlets,
+            args.delay,
+        )
+        close_pools()
+        settings_dict["POOL_SIZE"] = 0
+        extensions.set_wait_callback(None)
+
+
+if __name__ == "__main__":
+    main()
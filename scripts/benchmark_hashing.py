@@ -0,0 +1,137 @@
+"""
+Benchmark logins under gevent with password hashing run inline, holding the
+event loop, and on the native thread pool. Reports login throughput and the
+latency of catalog reads served by the same worker while the logins run.
+
+Usage:
+    python scripts/benchmark_hashing.py --logins 40 --readers 4 --threads 4
+"""
+
+from gevent import monkey
+
+monkey.patch_all()
+
+import argparse
+import logging
+import time
+import gevent
+from gevent.event import Event
+from benchmark_utils import benchmark_database, print_row, seed_products, setup_django
+
+setup_django()
+
+from django.db import connection
+from django.test.utils import setup_test_environment
+from rest_framework.test import APIRequestFactory, force_authenticate
+from auth.views import login_user
+from common.db.green import make_psycopg2_green
+from common.db.pool import close_pools
+from products.views import get_products
+from users import hashing
+from users.hashing import HashingPool
+from users.models import Users
+
+PASSWORD = "bench-password"
+
+
+class InlinePool:
+    """
+    Hash on the calling greenlet, as the views did before the pool.
+    """
+
+    def run(self, func, *args):
+        return func(*args)
+
+
+def login(factory, email):
+    request = factory.post("/api/auth/login", {"email": email, "password": PASSWORD})
+    try:
+        response = login_user(request)
+        assert response.status_code == 200, response.data
+    finally:
+        connection.close()
+
+
+def read_catalog(factory, user, timings, done):
+    while not done.is_set():
+        request = factory.get("/api/products/active")
+        force_authenticate(request, user=user)
+        started = time.perf_counter()
+        try:
+            response = get_products(request)
+            assert response.status_code == 200, response.data
+        finally:
+            connection.close()
+        timings.append((time.perf_counter() - started) * 1000)
+        gevent.sleep(0)
+
+
+def run(label, pool, users, readers):
+    hashing.get_hashing_pool = lambda: pool
+    factory = APIRequestFactory()
+    timings = []
+    done = Event()
+    reading = [
+        gevent.spawn(read_catalog, factory, users[0], timings, done)
+        for _ in range(readers)
+    ]
+
+    started = time.perf_counter()
+    gevent.joinall([gevent.spawn(login, factory, user.email) for user in users])
+    elapsed = time.perf_counter() - started
+    done.set()
+    gevent.joinall(reading)
+
+    timings.sort()
+    print(f"\n{label}: {len(users) / elapsed:.1f} logins/s")
+    print_row(
+        f"catalog reads ({len(timings)})",
+        {
+            "mean": sum(timings) / len(timings),
+            "p50": timings[len(timings) // 2],
+            "p95": timings[int(len(timings) * 0.95)],
+        },
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    # Keep the per request log lines out of the results
+    logging.getLogger("django").setLevel(logging.WARNING)
+    setup_test_environment()
+
+    with benchmark_database():
+        seed_products(200)
+        users = [
+            Users.objects.create_user(
+                first_name="bench", email=f"bench{i}@example.com", password=PASSWORD
+            )
+            for i in range(args.logins)
+        ]
+
+        make_psycopg2_green()
+        connection.close()
+        connection.settings_dict["POOL_SIZE"] = 20
+
+        get_hashing_pool = hashing.get_hashing_pool
+        try:
+            run("inline hashing", InlinePool(), users, args.readers)
+            run(
+                f"hashing pool of {args.threads} threads",
+                HashingPool(args.threads, max_waiting=args.logins),
+                users,
+                args.readers,
+            )
+        finally:
+            hashing.get_hashing_pool = get_hashing_pool
+            close_pools()
+            connection.settings_dict["POOL_SIZE"] = 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark the overhead of the request metrics middleware, on its own and
+for a full request through the Django test client.
+
+Usage:
+    python scripts/benchmark_metrics.py --requests 20000
+    python scripts/benchmark_metrics.py --multiprocess
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+from benchmark_utils import measure, print_row, setup_django
+
+# The registry type is chosen when prometheus_client is imported
+if "--multiprocess" in sys.argv:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="metrics-")
+
+setup_django()
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import setup_test_environment
+from django.urls import resolve
+from common.metrics import uses_multiprocess_registry
+from common.middleware import MetricsMiddleware
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument(
+        "--multiprocess",
+        action="store_true",
+        help="Use the file-backed registry shared by gunicorn workers.",
+    )
+    args = parser.parse_args()
+
+    # Keep the per request log lines out of the results
+    logging.getLogger("django").setLevel(logging.WARNING)
+    setup_test_environment()
+
+    registry = "multiprocess" if uses_multiprocess_registry() else "in-memory"
+    print(f"{registry} registry, {args.requests} requests\n")
+
+    request = RequestFactory().get("/")
+    request.resolver_match = resolve("/")
+
+    def view(request):
+        return HttpResponse()
+
+    middleware = MetricsMiddleware(view)
+    print_row("view alone", measure(lambda: view(request), args.requests))
+    print_row("view + middleware", measure(lambda: middleware(request), args.requests))
+
+    client = Client()
+    without_metrics = [
+        name
+        for name in settings.MIDDLEWARE
+        if name != "common.middleware.MetricsMiddleware"
+    ]
+    with override_settings(MIDDLEWARE=without_metrics):
+        stats = measure(lambda: client.get("/"), args.requests)
+    print_row("GET / without metrics", stats)
+    print_row("GET / with metrics", measure(lambda: client.get("/"), args.requests))
+
+
+if __name__ == "__main__":
+    main()
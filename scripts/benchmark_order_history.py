@@ -0,0 +1,141 @@
+"""
+Benchmark reading order history with the product name joined from the
+products table, as it was read before, and from the name snapshotted on the
+order items.
+
+Usage:
+    python scripts/benchmark_order_history.py --items 1000000
+"""
+
+import argparse
+from benchmark_utils import benchmark_database, measure, print_row, setup_django
+
+setup_django()
+
+from django.db import connection
+from django.db.models import Prefetch
+from rest_framework import serializers
+from orders.models import Orders, OrderItem
+from orders.serializers import OrderItemSerializer, OrderSerializer
+from users.models import Users
+
+ITEMS_PER_ORDER = 5
+
+
+class LiveNameOrderItemSerializer(OrderItemSerializer):
+    """
+    The order item serializer as it was, reading the name from the product.
+    """
+
+    select_related_fields = ["product"]
+
+    product_name = serializers.CharField(source="product.name")
+
+
+class LiveNameOrderSerializer(OrderSerializer):
+    prefetch_related_fields = [
+        Prefetch(
+            "orderitem_set",
+            queryset=LiveNameOrderItemSerializer.setup_eager_loading(
+                OrderItem.objects.all()
+            ),
+        )
+    ]
+
+    order_items = LiveNameOrderItemSerializer(source="orderitem_set", many=True)
+
+
+def seed(items, products, users):
+    orders = items // ITEMS_PER_ORDER
+    Users.objects.bulk_create(
+        [
+            Users(first_name="bench", email=f"bench-{index}@example.com")
+            for index in range(users)
+        ]
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO products_products (id, name, description, price, stock,
+                is_published, shard_count, created_at, updated_at)
+            SELECT gen_random_uuid(), 'Product ' || i, '', 10, 100, true, 0,
+                now(), now()
+            FROM generate_series(1, %s) AS i
+            """,
+            [products],
+        )
+        cursor.execute(
+            """
+            INSERT INTO orders_orders (id, user_id, total, created_at, updated_at)
+            SELECT gen_random_uuid(), users.id, 50,
+                now() - make_interval(secs => i), now()
+            FROM generate_series(1, %s) AS i
+            JOIN (
+                SELECT id, row_number() OVER () - 1 AS position FROM users_users
+            ) users ON users.position = i %% %s
+            """,
+            [orders, users],
+        )
+        cursor.execute(
+            """
+            INSERT INTO orders_orderitem (id, order_id, product_id, product_name,
+                quantity, price, created_at, updated_at)
+            SELECT gen_random_uuid(), orders.id, products.id, products.name, 1, 10,
+                now(), now()
+            FROM (
+                SELECT id, row_number() OVER () AS position FROM orders_orders
+            ) orders
+            CROSS JOIN generate_series(0, %s) AS line
+            JOIN (
+                SELECT id, name, row_number() OVER () - 1 AS position
+                FROM products_products
+            ) products
+                ON products.position = (orders.position * %s + line) %% %s
+            """,
+            [ITEMS_PER_ORDER - 1, ITEMS_PER_ORDER, products],
+        )
+        cursor.execute("ANALYZE")
+
+
+def read_orders(serializer_class, queryset, page_size):
+    def run():
+        orders = serializer_class.setup_eager_loading(
+            queryset.order_by("-created_at", "-id")
+        )[:page_size]
+        serializer_class(orders, many=True).data
+
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        seed(args.items, args.products, args.users)
+        user = Users.objects.first()
+        print(f"{args.items:,} order items, {args.products:,} products\n")
+
+        for label, queryset, page_size in [
+            ("one user, 10 orders", Orders.objects.filter(user=user), 10),
+            ("all users, 100 orders", Orders.objects.all(), 100),
+        ]:
+            for variant, serializer_class in [
+                ("joined name", LiveNameOrderSerializer),
+                ("snapshot name", OrderSerializer),
+            ]:
+                print_row(
+                    f"{label}, {variant}",
+                    measure(
+                        read_orders(serializer_class, queryset, page_size),
+                        args.repeat,
+                    ),
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark the admin order listing with each pagination mode, on the first
+page and on a deep page, over a large orders table.
+
+Usage:
+    python scripts/benchmark_order_pagination.py --rows 10000000
+"""
+
+import argparse
+import logging
+from urllib.parse import parse_qs, urlparse
+from benchmark_utils import benchmark_database, measure, print_row, setup_django
+
+setup_django()
+
+from django.db import connection
+from django.test.utils import setup_test_environment
+from rest_framework.test import APIRequestFactory, force_authenticate
+from orders.models import Orders
+from orders.views import get_all_orders
+from users.models import Users
+
+
+def seed_orders(user, rows):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO orders_orders (id, user_id, total, created_at, updated_at)
+            SELECT gen_random_uuid(), %s, 10,
+                now() - make_interval(secs => i), now()
+            FROM generate_series(1, %s) AS i
+            """,
+            [user.id, rows],
+        )
+        cursor.execute("ANALYZE orders_orders")
+
+
+def list_orders(user, params):
+    def run():
+        request = APIRequestFactory().get("/api/orders/all", params)
+        force_authenticate(request, user=user)
+        response = get_all_orders(request)
+        assert response.status_code == 200, response.data
+
+    return run
+
+
+def deep_cursor(page):
+    """
+    The cursor of a deep page, as a client walking the listing would get it.
+    """
+    from common.utils.pagination import KeysetPagination
+
+    order = Orders.objects.order_by("-created_at", "-id")[page * 10]
+    paginator = KeysetPagination()
+    paginator.base_url = "/"
+    url = paginator.encode_cursor(order, reverse=False)
+    return parse_qs(urlparse(url).query)["cursor"][0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--deep-page", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # Keep the per request log lines out of the results
+    logging.getLogger("django").setLevel(logging.WARNING)
+    setup_test_environment()
+
+    with benchmark_database():
+        user = Users.objects.create_admin_user(
+            first_name="bench", email="bench@example.com", password="bench-password"
+        )
+        seed_orders(user, args.rows)
+        print(f"{args.rows:,} orders")
+
+        cursor = deep_cursor(args.deep_page)
+        for label, params in [
+            ("page, exact count", {"pagination": "page"}),
+            ("estimate", {"pagination": "estimate"}),
+            ("cached count", {"pagination": "cached"}),
+            ("nocount", {"pagination": "nocount"}),
+            ("cursor", {"pagination": "cursor"}),
+        ]:
+            print_row(
+                f"{label}, first page", measure(list_orders(user, params), args.repeat)
+            )
+            if label == "cursor":
+                params = {**params, "cursor": cursor}
+            else:
+                params = {**params, "page": args.deep_page}
+            print_row(
+                f"{label}, page {args.deep_page:,}",
+                measure(list_orders(user, params), args.repeat),
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark product search on PostgreSQL full-text search and on the
+in-process inverted index fallback.
+
+Usage:
+    python scripts/benchmark_search.py --sizes 100000 1000000
+"""
+
+import argparse
+import random
+from benchmark_utils import (
+    WORDS,
+    benchmark_database,
+    measure,
+    print_row,
+    seed_products,
+    setup_django,
+)
+
+setup_django()
+
+from django.conf import settings
+from products.models import Products
+from products.search import search_catalog, search_index
+
+
+def run_queries(queries, page_size):
+    def run():
+        for query in queries:
+            list(search_catalog(query)[:page_size])
+
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=10)
+    args = parser.parse_args()
+
+    random.seed(42)
+    queries = [
+        " ".join(random.sample(WORDS, random.randint(1, 2)))
+        for _ in range(args.queries)
+    ]
+
+    with benchmark_database():
+        seeded = 0
+        for size in sorted(args.sizes):
+            seed_products(size - seeded)
+            seeded = size
+            print(f"\n{Products.objects.count()} products")
+
+            settings.PRODUCT_SEARCH_BACKEND = "postgres"
+            stats = measure(run_queries(queries, args.page_size), repeat=3)
+            print_row("tsvector + GIN (per query batch)", stats)
+
+            settings.PRODUCT_SEARCH_BACKEND = "memory"
+            search_index.reset()
+            build = measure(search_index.build, repeat=1)
+            print_row("inverted index build", build)
+            stats = measure(run_queries(queries, args.page_size), repeat=3)
+            print_row("inverted index (per query batch)", stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark concurrent reservations of one product with its stock on a single
+row and spread over stock shards, reporting the reservations per second.
+
+Each reservation runs in its own transaction and holds its lock for
+`--hold-ms` before committing, standing in for the rest of the add to cart
+request.
+
+Usage:
+    python scripts/benchmark_stock_shards.py --threads 32 --shards 0 4 16
+"""
+
+import argparse
+import threading
+import time
+from benchmark_utils import benchmark_database, setup_django
+
+setup_django()
+
+from django.db import connection, transaction
+from products.inventory import reserve_stock, shard_stock
+from products.models import Products
+
+
+def run(product, shards, threads, seconds, hold):
+    shard_stock(product.id, shards, stock=10_000_000)
+    barrier = threading.Barrier(threads + 1)
+    deadline = []
+    counts = []
+
+    def reserve():
+        reserved = 0
+        try:
+            barrier.wait()
+            while time.perf_counter() < deadline[0]:
+                with transaction.atomic():
+                    assert reserve_stock(product.id, 1, shards=shards)
+                    time.sleep(hold)
+                reserved += 1
+        finally:
+            counts.append(reserved)
+            connection.close()
+
+    workers = [threading.Thread(target=reserve) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    deadline.append(time.perf_counter() + seconds)
+    barrier.wait()
+    for worker in workers:
+        worker.join()
+
+    total = sum(counts)
+    label = f"{shards} shards" if shards else "single row"
+    print(f"{label:<12} {total:>8,} reservations   {total / seconds:>9,.0f} per second")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--shards", type=int, nargs="+", default=[0, 4, 16])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--hold-ms", type=float, default=2)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        product = Products.objects.create(
+            name="Hot Product",
+            description="A product everyone wants",
+            price=10,
+            stock=0,
+            is_published=True,
+        )
+        print(f"{args.threads} threads, locks held {args.hold_ms} ms\n")
+        for shards in args.shards:
+            run(product, shards, args.threads, args.seconds, args.hold_ms / 1000)
+
+
+if __name__ == "__main__":
+    main()
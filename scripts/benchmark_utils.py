@@ -0,0 +1,115 @@
+import os
+import random
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+# Add the project directory to sys.path to allow for correct module resolution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+WORDS = [
+    "leather",
+    "cotton",
+    "denim",
+    "linen",
+    "wool",
+    "silk",
+    "jacket",
+    "shirt",
+    "dress",
+    "skirt",
+    "boots",
+    "sneakers",
+    "scarf",
+    "hat",
+    "belt",
+    "coat",
+    "black",
+    "white",
+    "navy",
+    "olive",
+    "red",
+    "slim",
+    "classic",
+    "summer",
+    "winter",
+    "vintage",
+    "casual",
+    "formal",
+]
+
+
+def setup_django():
+    """
+    Set up the Django environment for a standalone benchmark script.
+    """
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "fashionstore.settings")
+    django.setup()
+
+
+@contextmanager
+def benchmark_database():
+    """
+    Run the benchmark against a throwaway test database that is dropped
+    afterwards, so it never touches real data.
+    """
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def random_text(length):
+    return " ".join(random.choice(WORDS) for _ in range(length))
+
+
+def seed_products(count, batch_size=5000, **fields):
+    """
+    Insert `count` published products with random names and descriptions.
+    """
+    from products.models import Products
+
+    for start in range(0, count, batch_size):
+        Products.objects.bulk_create(
+            [
+                Products(
+                    name=random_text(3).title(),
+                    description=random_text(20),
+                    price=random.randint(100, 50000) / 100,
+                    stock=fields.get("stock", 100),
+                    is_published=fields.get("is_published", True),
+                )
+                for _ in range(min(batch_size, count - start))
+            ]
+        )
+
+
+def measure(func, repeat):
+    """
+    Call `func` `repeat` times and return its latency statistics in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "mean": statistics.mean(timings),
+        "p50": timings[len(timings) // 2],
+        "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+
+def print_row(label, stats):
+    print(
+        f"{label:<40} mean {stats['mean']:9.2f} ms"
+        f"   p50 {stats['p50']:9.2f} ms   p95 {stats['p95']:9.2f} ms"
+    )
@@ -0,0 +1,101 @@
+"""
+Benchmark inserting rows keyed by random uuid4 and by time-ordered uuid7
+primary keys, reporting throughput as the table grows, the size of the
+primary key index and the WAL written.
+
+Usage:
+    python scripts/benchmark_uuid_keys.py --rows 10000000
+"""
+
+import argparse
+import io
+import time
+import uuid
+from benchmark_utils import benchmark_database, setup_django
+
+setup_django()
+
+from django.db import connection
+from common.utils.uuids import uuid7
+
+GENERATORS = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+def create_table(cursor, table):
+    # Shaped like the line item tables, with the key the only index
+    cursor.execute(
+        f"""
+        CREATE TABLE {table} (
+            id uuid PRIMARY KEY,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            quantity integer NOT NULL
+        )
+        """
+    )
+
+
+def wal_position(cursor):
+    cursor.execute("SELECT pg_current_wal_lsn()")
+    return cursor.fetchone()[0]
+
+
+def run(name, generate, rows, batch_size, report_every):
+    table = f"benchmark_{name}_keys"
+    with connection.cursor() as cursor:
+        create_table(cursor, table)
+        cursor.execute("CHECKPOINT")
+        wal_start = wal_position(cursor)
+
+        print(f"\n{name}")
+        inserted = 0
+        elapsed = 0.0
+        interval_started = 0.0
+        while inserted < rows:
+            count = min(batch_size, rows - inserted)
+            # Keys are made before the clock starts, only the insert is timed
+            buffer = io.StringIO(
+                "".join(f"{generate()}\t{index % 10}\n" for index in range(count))
+            )
+            started = time.perf_counter()
+            cursor.copy_expert(f"COPY {table} (id, quantity) FROM STDIN", buffer)
+            elapsed += time.perf_counter() - started
+            inserted += count
+
+            if inserted % report_every == 0 or inserted == rows:
+                interval = elapsed - interval_started
+                interval_rows = (inserted - 1) % report_every + 1
+                print(
+                    f"  {inserted:>11,} rows   {interval_rows / interval:>9,.0f} rows/s"
+                )
+                interval_started = elapsed
+
+        cursor.execute(
+            "SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), %s), pg_relation_size(%s)",
+            [wal_start, f"{table}_pkey"],
+        )
+        wal_bytes, index_bytes = cursor.fetchone()
+        print(
+            f"  total {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s), "
+            f"primary key index {index_bytes / 2**20:,.0f} MB, "
+            f"WAL {wal_bytes / 2**20:,.0f} MB"
+        )
+        cursor.execute(f"DROP TABLE {table}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--report-every", type=int, default=1_000_000)
+    parser.add_argument(
+        "--generators", nargs="+", choices=list(GENERATORS), default=list(GENERATORS)
+    )
+    args = parser.parse_args()
+
+    with benchmark_database():
+        for name in args.generators:
+            run(name, GENERATORS[name], args.rows, args.batch_size, args.report_every)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import threading
+import time
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+    TokenError,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+from .blacklist import blacklisted_tokens
+from .models import Users
+
+# User flags carried by the tokens, enough for the permission checks
+USER_CLAIMS = ("is_active", "is_staff", "is_superuser")
+
+
+class UserRefreshToken(RefreshToken):
+    """
+    A refresh token that carries the user flags, which its access tokens
+    copy, so requests can be authorized without loading the user.
+
+    Blacklist checks use the in-process blacklist instead of a query.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+    def check_blacklist(self):
+        if self.payload[api_settings.JTI_CLAIM] in blacklisted_tokens:
+            raise TokenError("Token is blacklisted")
+
+    def blacklist(self):
+        blacklisted = super().blacklist()
+        blacklisted_tokens.add(
+            self.payload[api_settings.JTI_CLAIM],
+            datetime_from_epoch(self.payload["exp"]),
+        )
+        return blacklisted
+
+
+def update_user_claims(token):
+    """
+    Replace the user flags of `token` with the user's current ones, so a
+    refreshed access token does not keep flags for the refresh lifetime.
+    """
+    user_id = token[api_settings.USER_ID_CLAIM]
+    claims = Users.objects.filter(id=user_id).values(*USER_CLAIMS).first()
+    if claims is None or not claims["is_active"]:
+        raise AuthenticationFailed("User is inactive", code="user_inactive")
+    for claim, value in claims.items():
+        token[claim] = value
+
+
+class ActiveUserCache:
+    """
+    An in-process cache of whether users are active, kept for
+    USER_ACTIVE_CACHE_TIMEOUT seconds.
+
+    Deactivations made by this process take effect at once through the user
+    save signal, those made by other processes within the timeout.
+    """
+
+    max_entries = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def is_active(self, user_id):
+        """
+        Return whether the user is active, or None when it does not exist.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        is_active = (
+            Users.objects.filter(id=user_id).values_list("is_active", flat=True).first()
+        )
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._prune(now)
+            self._entries[user_id] = (
+                is_active,
+                now + settings.USER_ACTIVE_CACHE_TIMEOUT,
+            )
+        return is_active
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+
+    def _prune(self, now):
+        self._entries = {
+            user_id: entry for user_id, entry in self._entries.items() if entry[1] > now
+        }
+        if len(self._entries) >= self.max_entries:
+            self._entries = {}
+
+
+active_users = ActiveUserCache()
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds the user from the token claims instead of
+    loading it on every request.
+
+    The user is an unsaved Users instance with its id and flags set, enough
+    for the permission classes, ownership checks and foreign key filters.
+    Views that need any other field must load the user themselves. Tokens
+    issued without the flags fall back to loading the user.
+    """
+
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+
+        try:
+            user_id = Users._meta.pk.to_python(
+                validated_token[api_settings.USER_ID_CLAIM]
+            )
+        except Exception:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        is_active = active_users.is_active(user_id)
+        if is_active is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if not is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        user = Users(
+            id=user_id,
+            is_active=True,
+            is_staff=validated_token["is_staff"],
+            is_superuser=validated_token["is_superuser"],
+        )
+        # Behave as a row loaded from the database for related lookups
+        user._state.adding = False
+        user._state.db = Users.objects.db
+        return user
@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from common.utils.scheduling import run_periodically
+
+# Getting the logger
+logger = logging.getLogger("django")
+
+# Rows blacklisted this long before the last sync are read again, to catch
+# transactions that committed late and clock differences between hosts
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class TokenBlacklist:
+    """
+    An in-process copy of the unexpired blacklisted refresh token ids.
+
+    The full list is loaded on first use. After that only rows blacklisted
+    since the previous sync are read, at most once every
+    TOKEN_BLACKLIST_SYNC_INTERVAL seconds. Logouts in this process are added
+    at once, those in other processes are seen after the next sync.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._expires_at = {}
+        self._synced_at = None
+        self._checked_at = None
+
+    def __contains__(self, jti):
+        self.sync()
+        return jti in self._expires_at
+
+    def add(self, jti, expires_at):
+        with self._lock:
+            self._expires_at[jti] = expires_at
+
+    def clear(self):
+        with self._lock:
+            self._expires_at = {}
+            self._synced_at = None
+            self._checked_at = None
+
+    def sync(self, force=False):
+        """
+        Read the rows blacklisted since the last sync, when it is due.
+        """
+        interval = settings.TOKEN_BLACKLIST_SYNC_INTERVAL
+        checked_at = self._checked_at
+        if not force and checked_at is not None:
+            if time.monotonic() - checked_at < interval:
+                return
+
+        with self._lock:
+            if not force and self._checked_at != checked_at:
+                # Another thread synced while this one waited for the lock
+                return
+
+            now = timezone.now()
+            rows = BlacklistedToken.objects.filter(token__expires_at__gt=now)
+            if self._synced_at is not None:
+                rows = rows.filter(blacklisted_at__gte=self._synced_at - SYNC_OVERLAP)
+            for jti, expires_at in rows.values_list("token__jti", "token__expires_at"):
+                self._expires_at[jti] = expires_at
+
+            # Expired tokens fail verification before the blacklist is checked
+            self._expires_at = {
+                jti: expires_at
+                for jti, expires_at in self._expires_at.items()
+                if expires_at > now
+            }
+            self._synced_at = now
+            self._checked_at = time.monotonic()
+
+
+blacklisted_tokens = TokenBlacklist()
+
+
+def purge_expired_tokens(batch_size=None):
+    """
+    Delete expired outstanding tokens, and their blacklist entries, in
+    batches of `batch_size` rows. Each batch is its own transaction, so no
+    lock is held for longer than one batch. Returns the number deleted.
+    """
+    batch_size = batch_size or settings.TOKEN_PURGE_BATCH_SIZE
+    cutoff = timezone.now()
+    deleted = 0
+    while True:
+        # Tokens expire in the order they are issued, so the expired ones
+        # are found at the start of the primary key index
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=cutoff)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        with transaction.atomic():
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            OutstandingToken.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+
+    logger.info(f"Purged {deleted} expired tokens")
+    return deleted
+
+
+def schedule_token_purge():
+    """
+    Purge expired tokens every TOKEN_PURGE_INTERVAL seconds in the
+    background of this process, unless the interval is 0.
+    """
+    if settings.TOKEN_PURGE_INTERVAL:
+        return run_periodically(
+            "purge-expired-tokens",
+            settings.TOKEN_PURGE_INTERVAL,
+            purge_expired_tokens,
+        )
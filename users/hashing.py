@@ -0,0 +1,116 @@
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth import hashers
+
+# The pool of this process, recreated after a fork
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+class PasswordHashingBusy(Exception):
+    """
+    Raised when every password hashing thread is busy and the queue of
+    waiting requests is full.
+    """
+
+
+class HashingPool:
+    """
+    A bounded pool of native threads for password hashing.
+
+    PBKDF2 releases the GIL while it runs, so hashing in a native thread
+    leaves the calling thread, or the gevent hub, free to serve other
+    requests. At most `threads` hashes run at once and `max_waiting` more
+    may queue, anything beyond that is refused with PasswordHashingBusy.
+    """
+
+    def __init__(self, threads, max_waiting):
+        self.threads = threads
+        self.max_waiting = max_waiting
+        self._slots = threading.BoundedSemaphore(threads + max_waiting)
+        if uses_gevent_threads():
+            from gevent.threadpool import ThreadPool
+
+            # Waiting on the result yields to the hub instead of blocking it
+            self._executor = ThreadPool(threads)
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=threads, thread_name_prefix="password-hashing"
+            )
+
+    def run(self, func, *args):
+        """
+        Run `func(*args)` on a hashing thread and return its result.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashingBusy("Too many password checks in progress")
+        try:
+            if hasattr(self._executor, "spawn"):
+                return self._executor.spawn(func, *args).get()
+            return self._executor.submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+
+def uses_gevent_threads():
+    """
+    Whether gevent has patched `threading`, in which case its threads are
+    greenlets and only gevent's own pool runs work on native threads.
+    """
+    if "gevent" not in sys.modules:
+        return False
+    from gevent import monkey
+
+    return monkey.is_module_patched("threading")
+
+
+def get_hashing_pool():
+    """
+    Return the password hashing pool of this process, creating it on first use.
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = HashingPool(
+                settings.PASSWORD_HASHING_THREADS,
+                settings.PASSWORD_HASHING_MAX_WAITING,
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def make_password(raw_password):
+    """
+    Return the encoded hash of `raw_password`, computed on the hashing pool.
+    """
+    return get_hashing_pool().run(hashers.make_password, raw_password)
+
+
+def set_password(user, raw_password):
+    """
+    Pooled equivalent of `user.set_password`.
+    """
+    user.password = make_password(raw_password)
+    user._password = raw_password
+
+
+def check_password(user, raw_password):
+    """
+    Pooled equivalent of `user.check_password`, including the upgrade of
+    hashes made with an outdated hasher or work factor.
+    """
+    outdated = []
+    is_correct = get_hashing_pool().run(
+        hashers.check_password, raw_password, user.password, outdated.append
+    )
+    # The upgrade saves the user, which must happen on this thread's
+    # database connection rather than the hashing thread's
+    if outdated:
+        set_password(user, raw_password)
+        user._password = None
+        user.save(update_fields=["password"])
+    return is_correct
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from users.blacklist import purge_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete expired outstanding and blacklisted tokens in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TOKEN_PURGE_BATCH_SIZE,
+            help="The number of tokens deleted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_tokens(batch_size=options["batch_size"])
+        self.stdout.write(f"{deleted} expired tokens deleted")
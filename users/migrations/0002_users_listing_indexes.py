@@ -0,0 +1,50 @@
+# Generated by Django 4.2.19 on 2026-10-18 04:20
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="users",
+            index=models.Index(
+                fields=["created_at", "id"], name="users_created_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="users",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"),
+                    name="text_pattern_ops",
+                ),
+                name="users_email_upper_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="users",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("first_name"),
+                    name="text_pattern_ops",
+                ),
+                name="users_first_name_upper_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="users",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("last_name"),
+                    name="text_pattern_ops",
+                ),
+                name="users_last_name_upper_idx",
+            ),
+        ),
+    ]
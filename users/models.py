@@ -3,11 +3,53 @@ from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
 )
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models import Count, DecimalField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Upper
+from decimal import Decimal
 from common.models import UUIDModel
+from .hashing import set_password
 
 
-class CustomUserManager(BaseUserManager):
+class UsersQuerySet(models.QuerySet):
+    def search(self, query):
+        """
+        Users whose email, first name or last name starts with `query`,
+        ignoring case. The pattern indexes on the upper cased columns turn
+        each prefix into an index range scan.
+        """
+        return self.filter(
+            Q(email__istartswith=query)
+            | Q(first_name__istartswith=query)
+            | Q(last_name__istartswith=query)
+        )
+
+    def with_order_stats(self):
+        """
+        Annotate each user's order count and lifetime spend.
+
+        Correlated subqueries are evaluated for the returned rows only, so a
+        page of users costs one indexed lookup per row instead of grouping
+        the orders of every user.
+        """
+        from orders.models import Orders
+
+        orders = Orders.objects.filter(user=OuterRef("pk")).order_by().values("user")
+        return self.annotate(
+            order_count=Coalesce(
+                Subquery(orders.annotate(count=Count("id")).values("count")),
+                Value(0),
+            ),
+            lifetime_spend=Coalesce(
+                Subquery(orders.annotate(spend=Sum("total")).values("spend")),
+                Value(Decimal("0.00")),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            ),
+        )
+
+
+class CustomUserManager(BaseUserManager.from_queryset(UsersQuerySet)):
     def create_user(self, email, password, **extra_fields):
         if not email:
             raise ValueError("The Email field must be set")
@@ -16,7 +58,7 @@ class CustomUserManager(BaseUserManager):
 
         email = self.normalize_email(email)
         user = self.model(email=email, **extra_fields)
-        user.set_password(password)
+        set_password(user, password)
         user.save(using=self._db)
 
         return user
@@ -54,5 +96,25 @@ class Users(UUIDModel, AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["first_name"]
 
+    class Meta:
+        indexes = [
+            # Backs the keyset pagination of the admin user listing
+            models.Index(fields=["created_at", "id"], name="users_created_at_id_idx"),
+            # Case insensitive prefix search, text_pattern_ops lets LIKE use
+            # the index whatever the database collation
+            models.Index(
+                OpClass(Upper("email"), name="text_pattern_ops"),
+                name="users_email_upper_idx",
+            ),
+            models.Index(
+                OpClass(Upper("first_name"), name="text_pattern_ops"),
+                name="users_first_name_upper_idx",
+            ),
+            models.Index(
+                OpClass(Upper("last_name"), name="text_pattern_ops"),
+                name="users_last_name_upper_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"User: {self.first_name} {self.last_name}"
@@ -36,3 +36,15 @@ class UserSerializer(serializers.ModelSerializer):
         instance.save()
 
         return instance
+
+
+class UserListSerializer(UserSerializer):
+    """
+    A serializer class for the admin user listing, with the order statistics
+    annotated by `Users.objects.with_order_stats`.
+    """
+
+    order_count = serializers.IntegerField(read_only=True)
+    lifetime_spend = serializers.DecimalField(
+        max_digits=12, decimal_places=2, read_only=True
+    )
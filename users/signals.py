@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .authentication import active_users
+from .models import Users
+
+
+@receiver(post_save, sender=Users)
+def invalidate_active_user(sender, instance, **kwargs):
+    """
+    Drop a saved user from the active user cache of this process, so a
+    deactivation applies to the next request.
+    """
+    active_users.invalidate(instance.id)
+
+
+@receiver(post_delete, sender=Users)
+def remove_active_user(sender, instance, **kwargs):
+    """
+    Drop deleted users from the active user cache of this process.
+    """
+    active_users.invalidate(instance.id)
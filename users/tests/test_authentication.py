@@ -0,0 +1,97 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.authentication import (
+    StatelessJWTAuthentication,
+    UserRefreshToken,
+    active_users,
+)
+from users.models import Users
+
+
+@pytest.mark.django_db
+class TestStatelessJWTAuthentication:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.user = Users.objects.create_user(
+            first_name="some", email="some-email", password="some-password123"
+        )
+        self.another_user = Users.objects.create_user(
+            first_name="another", email="another-email", password="another-password123"
+        )
+        self.admin_user = Users.objects.create_admin_user(
+            first_name="some", email="some-admin-email", password="admin-password123"
+        )
+        active_users.clear()
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {token.access_token}"
+        )
+        return StatelessJWTAuthentication().authenticate(request)[0]
+
+    def use_token(self, user):
+        token = UserRefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+
+    def test_user_is_built_from_the_token_claims(self):
+        token = UserRefreshToken.for_user(self.admin_user)
+        user = self.authenticate(token)
+        assert user.id == self.admin_user.id
+        assert user.is_staff is True
+        assert user.is_superuser is False
+        assert user.is_authenticated
+
+    def test_active_flag_is_cached_between_requests(self):
+        token = UserRefreshToken.for_user(self.user)
+        with CaptureQueriesContext(connection) as first:
+            self.authenticate(token)
+        with CaptureQueriesContext(connection) as second:
+            self.authenticate(token)
+        assert len(first.captured_queries) == 1
+        assert len(second.captured_queries) == 0
+
+    def test_deactivated_user_is_rejected(self):
+        token = UserRefreshToken.for_user(self.user)
+        self.authenticate(token)
+        self.user.is_active = False
+        self.user.save()
+        with pytest.raises(AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_tokens_without_claims_load_the_user(self):
+        user = self.authenticate(RefreshToken.for_user(self.user))
+        assert user.email == "some-email"
+
+    def test_admin_permission_uses_the_claims(self):
+        url = reverse("users-list")
+        self.use_token(self.user)
+        assert self.client.get(url).status_code == status.HTTP_403_FORBIDDEN
+        self.use_token(self.admin_user)
+        assert self.client.get(url).status_code == status.HTTP_200_OK
+
+    def test_user_access_check_uses_the_token_id(self):
+        self.use_token(self.user)
+        response = self.client.get(reverse("user-detail", args=[self.user.id]))
+        assert response.status_code == status.HTTP_200_OK
+        response = self.client.get(reverse("user-detail", args=[self.another_user.id]))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_refreshed_access_token_has_current_flags(self):
+        token = UserRefreshToken.for_user(self.user)
+        Users.objects.filter(id=self.user.id).update(is_staff=True)
+        response = self.client.post(
+            reverse("auth-refresh-token"),
+            HTTP_REFRESH_AUTHORIZATION=f"Bearer {token}",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['access_token']}"
+        )
+        assert self.client.get(reverse("users-list")).status_code == status.HTTP_200_OK
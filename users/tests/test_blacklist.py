@@ -0,0 +1,94 @@
+import threading
+from datetime import timedelta
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from common.utils.scheduling import run_periodically
+from users.authentication import UserRefreshToken
+from users.blacklist import blacklisted_tokens, purge_expired_tokens
+from users.models import Users
+
+
+@pytest.mark.django_db
+class TestTokenBlacklist:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.user = Users.objects.create_user(
+            first_name="some", email="some-email", password="some-password123"
+        )
+
+    def test_check_runs_no_query_between_syncs(self):
+        token = UserRefreshToken.for_user(self.user)
+        blacklisted_tokens.sync(force=True)
+        with CaptureQueriesContext(connection) as context:
+            UserRefreshToken(str(token))
+        assert len(context.captured_queries) == 0
+
+    def test_logout_blacklists_the_token(self):
+        token = UserRefreshToken.for_user(self.user)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            reverse("auth-logout"), HTTP_REFRESH_AUTHORIZATION=f"Bearer {token}"
+        )
+        assert response.status_code == status.HTTP_205_RESET_CONTENT
+
+        response = self.client.post(
+            reverse("auth-refresh-token"), HTTP_REFRESH_AUTHORIZATION=f"Bearer {token}"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["error"] == "Token is blacklisted"
+
+    def test_tokens_blacklisted_elsewhere_are_synced(self):
+        token = UserRefreshToken.for_user(self.user)
+        blacklisted_tokens.sync(force=True)
+        BlacklistedToken.objects.create(
+            token=OutstandingToken.objects.get(jti=token["jti"])
+        )
+
+        blacklisted_tokens.sync(force=True)
+        with pytest.raises(TokenError):
+            UserRefreshToken(str(token))
+
+    def test_purge_deletes_only_expired_tokens(self):
+        for _ in range(5):
+            UserRefreshToken.for_user(self.user).blacklist()
+        live = UserRefreshToken.for_user(self.user)
+        OutstandingToken.objects.exclude(jti=live["jti"]).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        assert purge_expired_tokens(batch_size=2) == 5
+        assert list(OutstandingToken.objects.values_list("jti", flat=True)) == [
+            live["jti"]
+        ]
+        assert not BlacklistedToken.objects.exists()
+
+    def test_purge_command(self, capsys):
+        token = UserRefreshToken.for_user(self.user)
+        OutstandingToken.objects.filter(jti=token["jti"]).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        call_command("purge_expired_tokens")
+        assert "1 expired tokens deleted" in capsys.readouterr().out
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTokenPurgeSchedule:
+    def test_periodic_task_runs_until_stopped(self):
+        ran = threading.Event()
+        stop = run_periodically("test-task", 0.01, ran.set)
+        try:
+            assert ran.wait(5)
+        finally:
+            stop.set()
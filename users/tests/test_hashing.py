@@ -0,0 +1,87 @@
+import threading
+import pytest
+from django.contrib.auth.hashers import make_password as make_password_inline
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from users import hashing
+from users.hashing import HashingPool, PasswordHashingBusy, check_password
+from users.models import Users
+
+
+class BusyPool:
+    def run(self, func, *args):
+        raise PasswordHashingBusy("Too many password checks in progress")
+
+
+class TestHashingPool:
+    def test_work_runs_on_a_hashing_thread(self):
+        pool = HashingPool(threads=1, max_waiting=0)
+        assert pool.run(threading.get_ident) != threading.get_ident()
+
+    def test_saturated_pool_refuses_work(self):
+        pool = HashingPool(threads=1, max_waiting=0)
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        worker = threading.Thread(target=pool.run, args=(block,))
+        worker.start()
+        started.wait(5)
+        try:
+            with pytest.raises(PasswordHashingBusy):
+                pool.run(threading.get_ident)
+        finally:
+            release.set()
+            worker.join()
+        assert pool.run(threading.get_ident)
+
+
+@pytest.mark.django_db
+class TestPooledPasswords:
+    @pytest.fixture(autouse=True)
+    def setup(self, client):
+        self.client = client
+        self.user = Users.objects.create_user(
+            first_name="some", email="some-email", password="some-password123"
+        )
+
+    def test_users_are_created_with_a_usable_hash(self):
+        assert self.user.password.startswith("pbkdf2_sha256$")
+        assert self.user.check_password("some-password123")
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+            "django.contrib.auth.hashers.MD5PasswordHasher",
+        ]
+    )
+    def test_outdated_hash_is_upgraded(self):
+        self.user.password = make_password_inline("some-password123", hasher="md5")
+        self.user.save()
+
+        assert check_password(self.user, "some-password123")
+        self.user.refresh_from_db()
+        assert self.user.password.startswith("pbkdf2_sha256$")
+
+    def test_login_is_refused_when_pool_is_saturated(self, monkeypatch):
+        monkeypatch.setattr(hashing, "get_hashing_pool", BusyPool)
+        url = reverse("auth-login")
+        data = {"email": "some-email", "password": "some-password123"}
+        response = self.client.post(url, data, format="json")
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response["Retry-After"] == "1"
+
+    def test_signup_is_refused_when_pool_is_saturated(self, monkeypatch):
+        monkeypatch.setattr(hashing, "get_hashing_pool", BusyPool)
+        url = reverse("auth-create-user")
+        data = {
+            "first_name": "newuser",
+            "password": "newpassword123",
+            "email": "newuser@example.com",
+        }
+        response = self.client.post(url, data, format="json")
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert not Users.objects.filter(email="newuser@example.com").exists()
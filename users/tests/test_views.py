@@ -1,7 +1,10 @@
 import pytest
+from decimal import Decimal
+from django.db import connection
 from django.urls import reverse
 from rest_framework import status
 from users.models import Users
+from orders.models import Orders
 from rest_framework.test import APIClient
 
 
@@ -44,7 +47,7 @@ class TestUserViews:
         self.client.force_authenticate(user=self.admin_user)
         response = self.client.get(url)
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 3
+        assert len(response.data["results"]) == 3
 
     def test_non_authenticated_user_cannot_get_user_detail(self):
         url = reverse("user-detail", args=[self.user.id])
@@ -133,3 +136,82 @@ class TestUserViews:
         assert self.user.is_active is False
         assert self.user.first_name == "Deleted"
         assert self.user.last_name == "User"
+
+
+@pytest.mark.django_db
+class TestUserListing:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.admin_user = Users.objects.create_admin_user(
+            first_name="Admin", email="admin@example.com", password="admin-password123"
+        )
+        self.customers = [
+            Users.objects.create_user(
+                first_name=f"Customer{index}",
+                last_name="Okafor" if index % 2 else "Smith",
+                email=f"customer{index}@example.com",
+                password="some-password123",
+            )
+            for index in range(5)
+        ]
+        self.client.force_authenticate(user=self.admin_user)
+        self.url = reverse("users-list")
+
+    def emails(self, response):
+        return [user["email"] for user in response.data["results"]]
+
+    def test_users_are_paginated_newest_first(self):
+        response = self.client.get(self.url, {"page_size": 4})
+        assert response.status_code == status.HTTP_200_OK
+        assert self.emails(response) == [
+            "customer4@example.com",
+            "customer3@example.com",
+            "customer2@example.com",
+            "customer1@example.com",
+        ]
+
+        response = self.client.get(response.data["next"])
+        assert self.emails(response) == ["customer0@example.com", "admin@example.com"]
+        assert response.data["next"] is None
+
+    def test_search_matches_email_and_name_prefixes(self):
+        response = self.client.get(self.url, {"q": "okaf"})
+        assert self.emails(response) == [
+            "customer3@example.com",
+            "customer1@example.com",
+        ]
+        response = self.client.get(self.url, {"q": "ADMIN@"})
+        assert self.emails(response) == ["admin@example.com"]
+
+    def test_filters_by_flags(self):
+        Users.objects.filter(id=self.customers[0].id).update(is_active=False)
+        response = self.client.get(self.url, {"is_active": "false"})
+        assert self.emails(response) == ["customer0@example.com"]
+        response = self.client.get(self.url, {"is_staff": "true"})
+        assert self.emails(response) == ["admin@example.com"]
+
+    def test_invalid_flag_is_rejected(self):
+        response = self.client.get(self.url, {"is_staff": "maybe"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["error"] == "Invalid value for is_staff. Use true or false"
+
+    def test_users_include_order_stats(self):
+        Orders.objects.create(user=self.customers[0], total=Decimal("10.50"))
+        Orders.objects.create(user=self.customers[0], total=Decimal("4.25"))
+        response = self.client.get(self.url, {"q": "customer0"})
+        user = response.data["results"][0]
+        assert user["order_count"] == 2
+        assert user["lifetime_spend"] == "14.75"
+
+        response = self.client.get(self.url, {"q": "customer1"})
+        user = response.data["results"][0]
+        assert user["order_count"] == 0
+        assert user["lifetime_spend"] == "0.00"
+
+    def test_search_uses_prefix_indexes(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = Users.objects.search("okafor").explain()
+        assert "users_email_upper_idx" in plan
+        assert "users_last_name_upper_idx" in plan
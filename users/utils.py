@@ -1,4 +1,5 @@
 import logging
+from django.conf import settings
 from rest_framework.response import Response
 from rest_framework import status
 
@@ -19,3 +20,48 @@ def check_user_access(request, user_id, message):
         )
 
     return None
+
+
+def hashing_busy_response():
+    """
+    A helper function for requests turned away because the password hashing
+    pool is saturated.
+    """
+
+    logger.warning("Password hashing pool is saturated")
+    return Response(
+        {"error": "Too many requests in progress, please try again shortly"},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(settings.PASSWORD_HASHING_RETRY_AFTER)},
+    )
+
+
+def parse_flag(request, name):
+    """
+    A helper function to read an optional true/false query parameter.
+    """
+
+    value = request.query_params.get(name)
+    if value is None or value == "":
+        return None
+    if value.lower() in ("true", "1"):
+        return True
+    if value.lower() in ("false", "0"):
+        return False
+    raise ValueError(f"Invalid value for {name}. Use true or false")
+
+
+def filter_users(queryset, request):
+    """
+    A helper function to apply the `q`, `is_active` and `is_staff` query
+    parameters of the user listing.
+    """
+
+    query = request.query_params.get("q", "").strip()
+    if query:
+        queryset = queryset.search(query)
+    for flag in ("is_active", "is_staff"):
+        value = parse_flag(request, flag)
+        if value is not None:
+            queryset = queryset.filter(**{flag: value})
+    return queryset
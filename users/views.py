@@ -5,8 +5,9 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from .models import Users
-from .serializers import UserSerializer
-from .utils import check_user_access
+from .serializers import UserListSerializer, UserSerializer
+from .utils import check_user_access, filter_users
+from common.utils.pagination import get_paginator
 
 # Getting the logger
 logger = logging.getLogger("django")
@@ -16,13 +17,17 @@ logger = logging.getLogger("django")
 @permission_classes([IsAuthenticated, IsAdminUser])
 def get_users(request):
     """
-    A view that returns a list of all users.
+    A view that returns a paginated list of users, newest first, with their
+    order count and lifetime spend. Users can be searched by email or name
+    with `q` and filtered by `is_active` and `is_staff`.
     """
     try:
-        users = Users.objects.all()
-        serializer = UserSerializer(users, many=True)
-        logger.info(f"Admin user {request.user.id} successfully retrieved all users")
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = get_paginator(request)
+        users = filter_users(Users.objects.all(), request).with_order_stats()
+        result_page = paginator.paginate_queryset(users, request)
+        serializer = UserListSerializer(result_page, many=True)
+        logger.info(f"Admin user {request.user.id} successfully retrieved users")
+        return paginator.get_paginated_response(serializer.data)
     except Exception as e:
         logger.error(str(e))
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)